@@ -0,0 +1,83 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+
+@dataclass
+class Backoff:
+    """
+    jittered exponential backoff for probing e.g. the readiness of a container
+
+    starts with short delays so that fast services are detected quickly and
+    randomizes the delays so that many probes do not run in lockstep
+    """
+
+    # the first delay in seconds
+    initial: float = 0.1
+    # the maximum delay in seconds
+    maximum: float = 2.0
+    # the growth factor of the delay
+    factor: float = 1.5
+    # the fraction of each delay that is randomized
+    jitter: float = 0.5
+
+    def delays(self) -> Iterator[float]:
+        """
+        get the endless sequence of jittered delays
+        """
+        delay = self.initial
+        while True:
+            yield delay * (1.0 - self.jitter * random.random())
+            delay = min(delay * self.factor, self.maximum)
+
+    def getTries(self, duration: float) -> int:
+        """
+        get the number of delays needed to wait at least the given duration
+        when each delay takes its full unjittered length
+
+        Args:
+            duration(float): the number of seconds to cover
+
+        Returns:
+            int: the number of tries
+        """
+        tries = 0
+        total = 0.0
+        delay = self.initial
+        while total < duration:
+            total += delay
+            tries += 1
+            delay = min(delay * self.factor, self.maximum)
+        return tries
+
+    def wait(self, check: Callable[[], bool], timeout: float) -> float:
+        """
+        wait until the given check succeeds
+
+        Args:
+            check(Callable): the probe returning True when done
+            timeout(float): the maximum number of seconds to wait
+
+        Returns:
+            float: the number of seconds it took
+
+        Raises:
+            TimeoutError: if the check did not succeed within the timeout
+        """
+        start_time = time.monotonic()
+        deadline = start_time + timeout
+        for delay in self.delays():
+            if check():
+                return time.monotonic() - start_time
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+        raise TimeoutError(f"check did not succeed within {timeout} seconds")
@@ -10,6 +10,7 @@ import os
 import re
 import secrets
 import socket
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Optional
@@ -25,16 +26,63 @@ from mwdocker.mw import ExtensionList
 class Host:
     """
     Host name getter
+
+    the default host is only looked up when needed and then cached
+    since socket.getfqdn() may block for seconds with a broken reverse DNS
     """
 
+    # maximum number of seconds to wait for the fully qualified domain name
+    timeout = 1.0
+    _default_host = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_fqdn(cls, timeout: float = None) -> str:
+        """
+        get the fully qualified domain name falling back to the plain
+        hostname if the lookup does not finish within the given timeout
+
+        Args:
+            timeout(float): the timeout in seconds - the class default if None
+
+        Returns:
+            str: the fully qualified domain name or the hostname
+        """
+        if timeout is None:
+            timeout = cls.timeout
+        result = {}
+
+        def lookup():
+            result["fqdn"] = socket.getfqdn()
+
+        # a daemon thread does not keep the process alive if the lookup hangs
+        thread = threading.Thread(target=lookup, name="getfqdn", daemon=True)
+        thread.start()
+        thread.join(timeout)
+        fqdn = result.get("fqdn") or socket.gethostname()
+        return fqdn
+
     @classmethod
     def get_default_host(cls) -> str:
         """
         Get the default host as a usable hostname or IP,
         never returning reverse-DNS PTRs and avoiding localhost which
         might cause to try socket access instead of proper host access
+
+        the result is cached for the lifetime of the process
         """
-        host = socket.getfqdn()
+        with cls._lock:
+            if cls._default_host is None:
+                cls._default_host = cls.lookup_default_host()
+            host = cls._default_host
+        return host
+
+    @classmethod
+    def lookup_default_host(cls) -> str:
+        """
+        look up the default host
+        """
+        host = cls.get_fqdn()
 
         # work around https://github.com/python/cpython/issues/79345
         if host == (
@@ -78,7 +126,8 @@ class MwConfig:
     url = None
     full_url = None
     prot: str = "http"
-    host: str = Host.get_default_host()
+    # None means the default host of this machine - see Host.get_default_host
+    host: Optional[str] = None
     article_path: Optional[str] = None  # "/index.php/$1"
     script_path: str = ""
     wikiId: Optional[str] = None
@@ -144,6 +193,8 @@ class MwConfig:
             self.article_path = ""
         if not self.base_port:
             self.base_port = self.port
+        if not self.host:
+            self.host = Host.get_default_host()
         self.reset_url(self.url)
 
     @property
@@ -239,7 +290,7 @@ class MwConfig:
             print(json_str, file=f)
         return path
 
-    def load(self, path: str = None) -> "MwConfig":
+    def load(self, path: str = None, withExtensions: bool = True) -> "MwConfig":
         """
         load the the MwConfig from the given path of if path is None (default)
         use the config_path for the current configuration
@@ -248,6 +299,7 @@ class MwConfig:
 
         Args:
             path(str): the path to load from
+            withExtensions(bool): if False do not restore the ExtensionMap e.g. for read only commands
 
         Returns:
             MwConfig: a MediaWiki Configuration
@@ -257,8 +309,13 @@ class MwConfig:
         with open(path, "r") as json_file:
             json_str = json_file.read()
             config = self.__class__.from_json(json_str)
-            # restore extension map
-            config.getExtensionMap(config.extensionNameList, config.extensionJsonFile)
+            if withExtensions:
+                # restore extension map
+                config.getExtensionMap(
+                    config.extensionNameList, config.extensionJsonFile
+                )
+            else:
+                config.extensionMap = {}
             return config
 
     def getShortVersion(self, separator=""):
@@ -339,12 +396,13 @@ class MwConfig:
             else:
                 print(f"warning: extension {extensionName} not known")
 
-    def fromArgs(self, args):
+    def fromArgs(self, args, withExtensions: bool = True):
         """
         initialize me from the given commmand line arguments
 
         Args:
             args(Namespace): the command line arguments
+            withExtensions(bool): if False do not load the extension definitions e.g. for read only commands
         """
         self.prefix = args.prefix
         self.article_path = args.article_path
@@ -357,7 +415,7 @@ class MwConfig:
         self.uid = args.uid
         self.gid = args.gid
         self.forceRebuild = args.forceRebuild or getattr(args, "force", False)
-        self.host = args.host
+        self.host = args.host or Host.get_default_host()
         self.sql_host = args.sql_host
         self.logo = args.logo
         self.mariaDBVersion = args.mariaDBVersion
@@ -390,7 +448,10 @@ class MwConfig:
         self.smw_version = args.smw_version
         self.verbose = not args.quiet
         self.debug = args.debug
-        self.getExtensionMap(self.extensionNameList, self.extensionJsonFile)
+        if withExtensions:
+            self.getExtensionMap(self.extensionNameList, self.extensionJsonFile)
+        else:
+            self.extensionMap = {}
         self.reset_url(args.url)
 
     def addArgs(self, parser):
@@ -450,8 +511,8 @@ class MwConfig:
         )
         parser.add_argument(
             "--host",
-            default=Host.get_default_host(),
-            help="the host to serve / listen from [default: %(default)s]",
+            default=None,
+            help="the host to serve / listen from [default: the fully qualified domain name of this machine]",
         )
         parser.add_argument(
             "-dp",
@@ -575,12 +636,28 @@ class MwClusterConfig(MwConfig):
         default_factory=lambda: ["1.35.13", "1.39.17", "1.43.9", "1.44.6", "1.45.4"]
     )
     base_port: int = 9080
+    # number of docker applications to handle concurrently
+    parallel: int = 1
+    # use a single docker compose project for all wikis
+    single_compose: bool = False
 
     def addArgs(self, parser):
         """
         add my arguments to the given parser
         """
         super().addArgs(parser)
+        parser.add_argument(
+            "--parallel",
+            type=int,
+            default=self.parallel,
+            help="number of docker applications to build, start or stop concurrently [default: %(default)s]",
+        )
+        parser.add_argument(
+            "--single_compose",
+            action="store_true",
+            default=self.single_compose,
+            help="use a single docker compose project with a shared network for all wikis [default: %(default)s]",
+        )
         parser.add_argument(
             "-bp",
             "--base_port",
@@ -598,16 +675,19 @@ class MwClusterConfig(MwConfig):
             help="mediawiki versions to create docker applications for [default: %(default)s] ",
         )
 
-    def fromArgs(self, args):
+    def fromArgs(self, args, withExtensions: bool = True):
         """
         initialize me from the given commmand line arguments
 
         Args:
             args(Namespace): the command line arguments
+            withExtensions(bool): if False do not load the extension definitions e.g. for read only commands
         """
         dbc_name = args.db_container_name
         if dbc_name:
             env = DockerMap.getEnv(dbc_name)
             self.mySQLRootPassword = env["MYSQL_ROOT_PASSWORD"]
             pass
-        super().fromArgs(args)
+        super().fromArgs(args, withExtensions=withExtensions)
+        self.parallel = args.parallel
+        self.single_compose = args.single_compose
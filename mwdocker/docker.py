@@ -4,34 +4,47 @@ Created on 2021-08-06
 @author: wf
 """
 
+import codecs
 import datetime
 import os
 import platform
 import pprint
+import re
 import secrets
+import shutil
 import stat
 import sys
+import threading
 import time
 import traceback
 import typing
 from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, Dict, Iterator, List, Tuple
 
-import mysql.connector
-from jinja2 import Environment, FileSystemLoader
-from jinja2.exceptions import TemplateNotFound
 from lodstorage.lod import LOD
-from mysql.connector import Error
-from python_on_whales import docker
-from python_on_whales.exceptions import DockerException
-from wikibot3rd.wikiuser import WikiUser
 
+from mwdocker.backoff import Backoff
 from mwdocker.config import MwClusterConfig
+from mwdocker.docker_backend import DockerBackend
+from mwdocker.docker_events import DockerEventWaiter
+from mwdocker.docker_images import DockerImageBuilder, ImageBuild
 from mwdocker.docker_map import DockerMap
+from mwdocker.exec_log import ExecError, ExecLog, LogLine
 from mwdocker.html_table import HtmlTables
 from mwdocker.logger import Logger
+from mwdocker.manifest import GenerationManifest
 from mwdocker.mariadb import MariaDB
+from mwdocker.metrics import PhaseTiming, RunMetrics
+from mwdocker.reconcile import ChangeClass
+from mwdocker.setup_steps import SetupStepReport
 from mwdocker.version import Version
 
+if typing.TYPE_CHECKING:
+    from jinja2 import Environment
+    from python_on_whales import DockerClient
+    from wikibot3rd.wikiuser import WikiUser
+
 
 class DockerContainer:
     """
@@ -46,6 +59,22 @@ class DockerContainer:
         self.kind = kind
         self.container = container
 
+    @property
+    def backend(self) -> DockerBackend:
+        """
+        the docker backend to use
+        """
+        return DockerBackend.getBackend()
+
+    def reload(self):
+        """
+        get the current state of my container - the state
+        of a container from a snapshot may be stale
+        """
+        reload = getattr(self.container, "reload", None)
+        if reload is not None:
+            reload()
+
     def check(self):
         """
         check the given docker container
@@ -62,30 +91,108 @@ class DockerContainer:
         msg = f"mediawiki {self.kind} container {self.name}"
         return Logger.check_and_log(msg, ok)
 
-    def detect_crash(self) -> str:
+    def detect_crash(self, since: float = None, tail: int = 100) -> str:
         """
         check that we are still running and get crash details if not
 
+        only the end of the log is read so that containers with huge logs
+        do not need to be loaded into memory
+
+        Args:
+            since(float): only report the log lines since the given unix timestamp
+            tail(int): the maximum number of log lines to report
+
         Returns:
             str: None if running, log if crashed
         """
         logs = None
         try:
+            self.reload()
             if not self.container.state.running:
-                logs = docker.container.logs(self.name)
+                logs = self.backend.logs(self.name, tail=tail, since=since)
         except Exception as ex:
             logs = str(ex)
         return logs
 
+    def getHealth(self) -> typing.Optional[str]:
+        """
+        get the health status of the container
+
+        Returns:
+            str: starting, healthy or unhealthy - None if there is no healthcheck
+        """
+        health = getattr(self.container.state, "health", None)
+        status = getattr(health, "status", None) if health is not None else None
+        return status
+
+    def isHealthy(self) -> bool:
+        """
+        check whether the container is healthy - a running container
+        without a healthcheck counts as healthy
+        """
+        status = self.getHealth()
+        if status is None:
+            healthy = bool(self.container.state.running)
+        else:
+            healthy = status == "healthy"
+        return healthy
+
+    def wait_for(
+        self,
+        state: str,
+        check: Callable[[], bool],
+        timeout: float,
+        interval: float = 0.1,
+    ) -> float:
+        """
+        Wait until the given check succeeds using the events of the active
+        DockerEventWaiter and jittered polling as fallback
+
+        Args:
+            state: the state signaled by the events - running, stopped or healthy
+            check: the probe for the state
+            timeout: max time to wait
+            interval: the initial polling interval in seconds
+
+        Returns:
+            float: Time in seconds it took to reach the desired state
+
+        Raises:
+            TimeoutError: if the desired state is not reached within timeout
+        """
+        start_time = time.time()
+        waiter = DockerEventWaiter.getActive()
+        if waiter is not None and waiter.covers(self.container):
+            # register before checking so that no event can be missed
+            future = waiter.expect(self.name, state)
+            try:
+                if check():
+                    return time.time() - start_time
+                future.result(timeout=timeout)
+                return time.time() - start_time
+            except Exception:
+                # timeout or broken events stream - fall back to polling
+                pass
+            finally:
+                waiter.discard(self.name, state, future)
+        remaining = max(0.0, start_time + timeout - time.time())
+        try:
+            Backoff(initial=interval).wait(check, remaining)
+        except TimeoutError:
+            raise TimeoutError(
+                f"Container '{self.name}' did not reach state '{state}' within {timeout} seconds"
+            )
+        return time.time() - start_time
+
     def wait_for_state(
-        self, running: bool, interval: float = 0.2, timeout: float = 60.0
+        self, running: bool, interval: float = 0.1, timeout: float = 60.0
     ) -> float:
         """
         Wait until the container reaches the desired running state
 
         Args:
             running: desired running state (True = wait until started, False = wait until stopped)
-            interval: polling interval in seconds
+            interval: initial polling interval in seconds
             timeout: max time to wait
 
         Returns:
@@ -94,16 +201,33 @@ class DockerContainer:
         Raises:
             TimeoutError: if the desired state is not reached within timeout
         """
-        start_time = time.time()
-        deadline = start_time + timeout
-        while time.time() < deadline:
-            if self.container.state.running == running:
-                return time.time() - start_time
-            time.sleep(interval)
         state = "running" if running else "stopped"
-        raise TimeoutError(
-            f"Container '{self.name}' did not reach state '{state}' within {timeout} seconds"
-        )
+
+        def check() -> bool:
+            self.reload()
+            return self.container.state.running == running
+
+        return self.wait_for(state, check, timeout, interval)
+
+    def wait_for_healthy(self, timeout: float = 120.0) -> float:
+        """
+        Wait until the healthcheck of the container reports healthy
+
+        Args:
+            timeout: max time to wait
+
+        Returns:
+            float: Time in seconds it took to become healthy
+
+        Raises:
+            TimeoutError: if the container does not become healthy within timeout
+        """
+
+        def check() -> bool:
+            self.reload()
+            return self.isHealthy()
+
+        return self.wait_for("healthy", check, timeout)
 
     def getHostPort(self, local_port: int = 80) -> int:
         """
@@ -123,35 +247,70 @@ class DockerContainer:
             host_port = pb.host_port
         return host_port
 
-    def execute(self, *commands: str, verbose: bool = False):
+    def stream(self, *commands: str, exec_log: ExecLog) -> Iterator[LogLine]:
         """
-        Execute the given variable list of command strings inside the MediaWiki container.
+        Execute the given variable list of command strings inside the container
+        and stream the output line by line
 
         Args:
             commands: str - command parts to be executed
+            exec_log: the log capturing the output
+
+        Returns:
+            Iterator[LogLine]: the line records of the output
         """
         command_list = list(commands)
+        exec_log.start(" ".join(command_list))
+        # multibyte characters may be split between chunks
+        decoders = {}
+        for stream_type, stream_content in self.backend.execute(
+            self.name, command_list
+        ):
+            if stream_type not in decoders:
+                decoders[stream_type] = codecs.getincrementaldecoder("utf-8")(
+                    errors="replace"
+                )
+            chunk = decoders[stream_type].decode(stream_content)
+            yield from exec_log.feed(stream_type, chunk)
+        yield from exec_log.flush()
+
+    def execute(
+        self, *commands: str, verbose: bool = False, exec_log: ExecLog = None
+    ) -> ExecLog:
+        """
+        Execute the given variable list of command strings inside the container.
 
+        Args:
+            commands: str - command parts to be executed
+            verbose: if True show the command line
+            exec_log: the log capturing the output - a console only log if None
+
+        Returns:
+            ExecLog: the log with the tail of the output
+
+        Raises:
+            ExecError: if the command fails - with the tail of the output
+        """
+        if exec_log is None:
+            exec_log = ExecLog(self.name)
+        start_time = time.time()
         if verbose:
-            command_line = " ".join(command_list)
+            command_line = " ".join(commands)
             print(f"Executing docker command: {command_line}")
-
         try:
-            # see https://gabrieldemarmiesse.github.io/python-on-whales/user_guide/docker_run/#stream-the-output
-            for stream_type, stream_content in docker.execute(
-                container=self.container, command=command_list, stream=True
-            ):
-                decoded_line = stream_content.decode("utf-8", errors="replace")
-                target_stream = sys.stderr if stream_type == "stderr" else sys.stdout
-                print(decoded_line, end="", file=target_stream)
-
+            for _log_line in self.stream(*commands, exec_log=exec_log):
+                pass
         except Exception as ex:
-            logs = self.detect_crash()
+            logs = self.detect_crash(since=start_time)
             if logs is not None:
                 print(f"{self.name} crashed with log: {logs}")
-                raise Exception(f"Container {self.name} crashed during execute: {ex}")
+                msg = f"Container {self.name} crashed during execute: {ex}"
             else:
-                raise ex
+                msg = f"{commands[0]} failed in container {self.name}: {ex}"
+            if exec_log.log_path:
+                msg += f" - full output in {exec_log.log_path}"
+            raise ExecError(msg, tail=exec_log.tail(20)) from ex
+        return exec_log
 
 
 @dataclass
@@ -167,11 +326,35 @@ class DBStatus:
     ex: typing.Optional[Exception] = None
 
 
+@dataclass
+class WikiCheck:
+    """
+    the result of a single check of a wiki
+    """
+
+    name: str
+    ok: bool
+    latency: float = 0.0
+    msg: str = ""
+
+
 class DockerApplication(object):
     """
     MediaWiki Docker image
     """
 
+    # process wide Jinja2 environments by template and bytecode cache directory
+    jinja_envs: Dict[Tuple[str, str], "Environment"] = {}
+    jinja_lock = threading.Lock()
+    # the WikiUser ini files are shared by all apps e.g. for a cluster wide wikiId
+    wiki_user_lock = threading.Lock()
+    # rendered in place of the generation timestamp so that a template
+    # is rendered once and the timestamp is filled in afterwards
+    timestamp_marker = "\x00timestamp\x00"
+    # the seconds the db healthcheck of the compose templates allows
+    # for the database to come up: start_period 120s + 30 retries every 1s
+    db_health_timeout = 150.0
+
     def __init__(self, config: MwClusterConfig):
         """
         Constructor
@@ -186,15 +369,12 @@ class DockerApplication(object):
         self.composerVersion = 1
         if self.config.shortVersion >= "139":
             self.composerVersion = 2
-        # jinja and docker prerequisites
-        self.env = self.getJinjaEnv()
         # docker file location
+        # the jinja environment, the manifest and the containers
+        # are only looked up when needed so that read only commands stay cheap
         self.docker_path = (
             f"{self.config.docker_path}/{self.config.container_base_name}"
         )
-        os.makedirs(self.docker_path, exist_ok=True)
-
-        self.getContainers()
         self.dbConn = None
         self.wiki_id = self.config.getWikiId()
         self.database = f"{self.wiki_id}_wiki"
@@ -203,6 +383,66 @@ class DockerApplication(object):
         # Hook to allow modifying results
         # e.g. docker-compose.yaml after generation is finished
         self.postgen_hook = None
+        # may be shared between the apps of a cluster to build each image once
+        self.image_builder = None
+        # optional background puller of the base images
+        self.image_prefetcher = None
+        # the per phase timings - shared by all apps of a cluster
+        self.metrics = RunMetrics()
+
+    def timed(self, phase: str, detail: str = ""):
+        """
+        time the given phase of this app
+
+        Args:
+            phase(str): the name of the phase e.g. compose_up
+            detail(str): e.g. the template name or the command
+
+        Returns:
+            a context manager yielding the PhaseTiming
+        """
+        timed = self.metrics.timed(
+            phase,
+            app=self.config.container_base_name,
+            version=self.config.version,
+            detail=detail,
+        )
+        return timed
+
+    @cached_property
+    def env(self) -> "Environment":
+        """
+        the jinja environment
+        """
+        return self.getJinjaEnv()
+
+    @property
+    def backend(self) -> DockerBackend:
+        """
+        the docker backend to use
+        """
+        return DockerBackend.getBackend()
+
+    @cached_property
+    def manifest(self) -> GenerationManifest:
+        """
+        the input and output hashes of the generated files and generated secrets
+        """
+        return GenerationManifest(f"{self.docker_path}/manifest.json")
+
+    @cached_property
+    def mwContainer(self) -> typing.Optional["DockerContainer"]:
+        """
+        the mediawiki container - looked up on first access
+        """
+        return self.getContainers()[0]
+
+    @cached_property
+    def dbContainer(self) -> typing.Optional["DockerContainer"]:
+        """
+        the database container - looked up on first access
+        """
+        return self.getContainers()[1]
 
     @staticmethod
     def checkDockerEnvironment(debug: bool = False) -> str:
@@ -215,6 +455,8 @@ class DockerApplication(object):
         Returns:
             str: an error message or None
         """
+        from python_on_whales import docker
+
         errMsg = None
         os_path = os.environ["PATH"]
         paths = ["/usr/local/bin"]
@@ -242,71 +484,142 @@ class DockerApplication(object):
         version_url = f"{url}/index.php?title=Special:Version"
         return version_url
 
-    def check(self) -> int:
+    def check(self, timeout: float = None) -> int:
         """
         check me
 
+        Args:
+            timeout(float): the timeout in seconds for accessing the wiki - None for no timeout
+
         Returns:
             int: exitCode: 0 if ok, 1 if not ok
         """
         DockerApplication.checkDockerEnvironment(self.config.debug)
         exitCode = 0
-        mw, db = self.getContainers()
-        if not mw:
-            print("mediawiki container missing")
-            exitCode = 1
-        if not db:
-            print("database container missing")
-            exitCode = 1
-        if mw and db and mw.check() and db.check():
-            host_port = mw.getHostPort(80)
-            if host_port:
-                Logger.check_and_log_equal(
-                    f"port binding", host_port, "expected  port", str(self.config.port)
-                )
-                version_url = self.get_version_url(host_port)
-                ok = self.checkWiki(version_url)
-                if not ok:
-                    exitCode = 1
-            else:
-                self.log(f"port binding for port 80 missing", False)
+        for wiki_check in self.getChecks(timeout=timeout):
+            msg = f"{wiki_check.name} {wiki_check.msg}".strip()
+            if not Logger.check_and_log(msg, wiki_check.ok):
                 exitCode = 1
-            pass
         return exitCode
 
-    def checkWiki(self, version_url: str) -> bool:
+    def timedCheck(
+        self, checks: List[WikiCheck], name: str, check_func: Callable
+    ) -> bool:
         """
-        check this wiki against the content of the given version_url
+        run the given check function, time it and add the result to the given checks
+
+        Args:
+            checks(list): the list of checks to add the result to
+            name(str): the name of the check
+            check_func(Callable): a function returning an ok, msg tuple
+
+        Returns:
+            bool: True if the check was ok
         """
-        print(f"Checking {version_url} ...")
-        ok = True
+        start_time = time.monotonic()
         try:
-            html_tables = HtmlTables(version_url)
+            ok, msg = check_func()
+        except Exception as ex:
+            ok, msg = False, str(ex)
+        latency = time.monotonic() - start_time
+        checks.append(WikiCheck(name=name, ok=ok, latency=latency, msg=msg))
+        return ok
+
+    def getChecks(self, timeout: float = None) -> List[WikiCheck]:
+        """
+        check my containers, port binding and Special:Version page
+        without printing the results
+
+        Args:
+            timeout(float): the timeout in seconds for accessing the wiki - None for no timeout
+
+        Returns:
+            list: the WikiChecks
+        """
+        checks = []
+        mw, db = self.getContainers()
+        containers_ok = True
+        for kind, dc in [("mediawiki", mw), ("database", db)]:
+
+            def check_container(dc=dc):
+                if dc is None:
+                    return False, "missing"
+                return dc.container.state.running, dc.name
+
+            ok = self.timedCheck(checks, f"{kind} container", check_container)
+            containers_ok = containers_ok and ok
+        if containers_ok:
+            host_ports = []
+
+            def check_port():
+                host_port = mw.getHostPort(80)
+                host_ports.append(host_port)
+                if not host_port:
+                    return False, "port binding for port 80 missing"
+                ok = str(host_port) == str(self.config.port)
+                return ok, f"{host_port} expected {self.config.port}"
+
+            if self.timedCheck(checks, "port binding", check_port):
+                version_url = self.get_version_url(str(host_ports[0]))
+                checks.extend(self.getVersionChecks(version_url, timeout=timeout))
+        return checks
+
+    def getVersionChecks(
+        self, version_url: str, timeout: float = None
+    ) -> List[WikiCheck]:
+        """
+        check this wiki against the content of the given version_url
+        without printing the results
+
+        Args:
+            version_url(str): the url of the Special:Version page
+            timeout(float): the timeout in seconds for reading the url - None for no timeout
+
+        Returns:
+            list: the WikiChecks
+        """
+        checks = []
+        software_map = {}
+
+        def check_special_version():
+            html_tables = HtmlTables(version_url, timeout=timeout)
             tables = html_tables.get_tables("h2")
             if self.config.debug:
                 p = pprint.PrettyPrinter(indent=2)
                 p.pprint(tables)
-            ok = ok and Logger.check_and_log(
-                "Special Version accessible ...", "Installed software" in tables
-            )
+            ok = "Installed software" in tables
             if ok:
                 software = tables["Installed software"]
-                software_map, _dup = LOD.getLookup(
-                    software, "Product", withDuplicates=False
-                )
+                lookup, _dup = LOD.getLookup(software, "Product", withDuplicates=False)
+                software_map.update(lookup)
+            return ok, version_url
+
+        if self.timedCheck(checks, "Special:Version", check_special_version):
+
+            def check_mw_version():
                 mw_version = software_map["MediaWiki"]["Version"]
-                ok = ok and Logger.check_and_log_equal(
-                    "Mediawiki Version", mw_version, "expected ", self.config.version
-                )
+                ok = mw_version == self.config.version
+                return ok, f"{mw_version} expected {self.config.version}"
+
+            def check_db_version():
                 db_version_str = software_map["MariaDB"]["Version"]
                 db_version = MariaDB.getVersion(db_version_str)
-                ok = ok and Logger.check_and_log(
-                    f"Maria DB Version {db_version} fitting expected {self.config.mariaDBVersion}?",
-                    self.config.mariaDBVersion.startswith(db_version),
-                )
-                pass
-        except Exception as ex:
-            ok = Logger.check_and_log(str(ex), False)
+                ok = self.config.mariaDBVersion.startswith(db_version)
+                return ok, f"{db_version} expected {self.config.mariaDBVersion}"
+
+            self.timedCheck(checks, "MediaWiki version", check_mw_version)
+            self.timedCheck(checks, "MariaDB version", check_db_version)
+        return checks
+
+    def checkWiki(self, version_url: str, timeout: float = None) -> bool:
+        """
+        check this wiki against the content of the given version_url
+        """
+        print(f"Checking {version_url} ...")
+        ok = True
+        for wiki_check in self.getVersionChecks(version_url, timeout=timeout):
+            msg = f"{wiki_check.name} {wiki_check.msg}"
+            ok = Logger.check_and_log(msg, wiki_check.ok) and ok
         return ok
 
     def getContainerName(self, kind: str, separator: str):
@@ -325,29 +638,97 @@ class DockerApplication(object):
         """
         self.dbContainer = None
         self.mwContainer = None
-        containerMap = DockerMap.getContainerMap()
         for separator in ["-", "_"]:
             dbContainerName = self.getContainerName("db", separator)
             mwContainerName = self.getContainerName("mw", separator)
-            if dbContainerName in containerMap:
-                self.dbContainer = DockerContainer(
-                    dbContainerName, "database", containerMap[dbContainerName]
-                )
-            if mwContainerName in containerMap:
-                self.mwContainer = DockerContainer(
-                    mwContainerName, "webserver", containerMap[mwContainerName]
-                )
+            if self.dbContainer is None:
+                container = DockerMap.findRunningContainer(dbContainerName)
+                if container is not None:
+                    self.dbContainer = DockerContainer(
+                        dbContainerName, "database", container
+                    )
+            if self.mwContainer is None:
+                container = DockerMap.findRunningContainer(mwContainerName)
+                if container is not None:
+                    self.mwContainer = DockerContainer(
+                        mwContainerName, "webserver", container
+                    )
         return self.mwContainer, self.dbContainer
 
+    @classmethod
+    def getResourcePath(cls, *parts: str) -> str:
+        """
+        get the path of the given packaged resource
+
+        Args:
+            parts: the path components relative to the resources directory
+
+        Returns:
+            str: the path of the resource
+        """
+        scriptdir = os.path.dirname(os.path.realpath(__file__))
+        resource_path = os.path.join(scriptdir, "resources", *parts)
+        return resource_path
+
+    @classmethod
+    def getTemplateDir(cls) -> str:
+        """
+        get the directory of the packaged templates
+        """
+        template_dir = os.path.realpath(cls.getResourcePath("templates"))
+        return template_dir
+
+    @classmethod
+    def getSharedJinjaEnv(cls, docker_path: str) -> "Environment":
+        """
+        get the process wide Jinja2 environment for the given docker path
+        compiled templates are kept in memory and in a bytecode cache
+        under the docker path so that they are only compiled once
+
+        Args:
+            docker_path(str): the base directory for the bytecode cache
+
+        Returns:
+            Environment: the shared Jinja2 environment
+        """
+        from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+        template_dir = cls.getTemplateDir()
+        cache_dir = os.path.join(docker_path, ".jinja-cache")
+        key = (template_dir, cache_dir)
+        with cls.jinja_lock:
+            env = cls.jinja_envs.get(key)
+            if env is None:
+                os.makedirs(cache_dir, exist_ok=True)
+                env = Environment(
+                    loader=FileSystemLoader(template_dir),
+                    bytecode_cache=FileSystemBytecodeCache(cache_dir),
+                )
+                cls.jinja_envs[key] = env
+        return env
+
+    @classmethod
+    def precompileTemplates(cls, docker_path: str) -> int:
+        """
+        compile all packaged templates into the bytecode cache
+
+        Args:
+            docker_path(str): the base directory for the bytecode cache
+
+        Returns:
+            int: the number of compiled templates
+        """
+        env = cls.getSharedJinjaEnv(docker_path)
+        template_names = env.list_templates()
+        for template_name in template_names:
+            env.get_template(template_name)
+        return len(template_names)
+
     def getJinjaEnv(self):
         """
         get a Jinja2 environment
         """
-        scriptdir = os.path.dirname(os.path.realpath(__file__))
-        resourcePath = os.path.realpath(f"{scriptdir}/resources")
-        template_dir = os.path.realpath(f"{resourcePath}/templates")
-        # print(f"jinja template directory is {template_dir}")
-        env = Environment(loader=FileSystemLoader(template_dir))
+        env = DockerApplication.getSharedJinjaEnv(self.config.docker_path)
         return env
 
     def createWikiUser(self, wikiId: str = None, store: bool = False):
@@ -368,6 +749,8 @@ class DockerApplication(object):
             "version": f"{self.config.fullVersion}",
             "password": f"{self.config.password}",
         }
+        from wikibot3rd.wikiuser import WikiUser
+
         wikiUser = WikiUser.ofDict(userDict, encrypted=False)
         if store:
             wikiUser.save()
@@ -375,7 +758,7 @@ class DockerApplication(object):
 
     def createOrModifyWikiUser(
         self, wikiId, force_overwrite: bool = False, lenient: bool = False
-    ) -> WikiUser:
+    ) -> "WikiUser":
         """
         create or modify the WikiUser for this DockerApplication
 
@@ -384,18 +767,21 @@ class DockerApplication(object):
             force_overwrite (bool): if True overwrite the wikiuser info
             lenient(bool): do not throw Exception if wikiuser exists
         """
-        wikiUsers = WikiUser.getWikiUsers(lenient=True)
-        if wikiId in wikiUsers and not force_overwrite:
-            wikiUser = wikiUsers[wikiId]
-            if self.config.password != wikiUser.getPassword():
-                msg = f"wikiUser for wiki {wikiId} already exists but with different password"
-                if lenient:
-                    print(msg, file=sys.stderr)
-                else:
-                    raise Exception(msg)
-            pass
-        else:
-            wikiUser = self.createWikiUser(wikiId, store=True)
+        from wikibot3rd.wikiuser import WikiUser
+
+        # apps are generated concurrently - check and save atomically
+        with DockerApplication.wiki_user_lock:
+            wikiUsers = WikiUser.getWikiUsers(lenient=True)
+            if wikiId in wikiUsers and not force_overwrite:
+                wikiUser = wikiUsers[wikiId]
+                if self.config.password != wikiUser.getPassword():
+                    msg = f"wikiUser for wiki {wikiId} already exists but with different password"
+                    if lenient:
+                        print(msg, file=sys.stderr)
+                    else:
+                        raise Exception(msg)
+            else:
+                wikiUser = self.createWikiUser(wikiId, store=True)
         return wikiUser
 
     def execute(self, *commands: str):
@@ -413,13 +799,37 @@ class DockerApplication(object):
                 f"activated by docker compose\n- you might want to check the separator character used "
                 f"for container names for your platform {platform.system()}"
             )
-        self.mwContainer.execute(*commands, verbose=self.config.verbose)
+        with self.timed("execute", detail=" ".join(commands)):
+            self.mwContainer.execute(
+                *commands, verbose=self.config.verbose, exec_log=self.exec_log
+            )
+
+    @cached_property
+    def exec_log(self) -> ExecLog:
+        """
+        the log of the commands executed in my containers - the full output
+        goes to logs/exec.log in my docker path
+        """
+        if self.config.debug:
+            console_interval = 0.0
+        elif self.config.verbose:
+            console_interval = 2.0
+        else:
+            console_interval = None
+        exec_log = ExecLog(
+            self.config.container_base_name,
+            log_path=f"{self.docker_path}/logs/exec.log",
+            console_interval=console_interval,
+        )
+        return exec_log
 
     def close(self):
         """
-        close the database
+        close the database and the exec log
         """
         self.dbClose()
+        if "exec_log" in self.__dict__:
+            self.exec_log.close()
 
     def sqlQuery(self, query):
         """
@@ -455,6 +865,9 @@ class DockerApplication(object):
         Returns:
             the connection
         """
+        import mysql.connector
+        from mysql.connector import Error
+
         if self.dbConn is None:
             try:
                 self.dbConn = mysql.connector.connect(
@@ -496,9 +909,9 @@ class DockerApplication(object):
     def checkDBConnection(
         self,
         timeout: float = 10,
-        initialSleep: float = 4.0,
+        initialSleep: float = 0.0,
         factor=1.5,
-        maxTries: int = 9,
+        maxTries: int = None,
     ) -> DBStatus:
         """
         check database connection with retries
@@ -506,31 +919,40 @@ class DockerApplication(object):
         Args:
             timeout (float): number of seconds for timeout
             initialSleep (float): number of seconds to initially wait/sleep
+            factor (float): the growth factor of the jittered sleep between retries
             maxTries (int): maximum number of retries before giving up between each try a sleep is done that starts
-            with 0.5 secs and multiplies on every retry
+            with 0.1 secs and grows by factor up to 2 secs - if None the retries cover the db_health_timeout
 
         Returns:
             dbStatus: the status
         """
+        backoff = Backoff(factor=factor)
+        if maxTries is None:
+            maxTries = backoff.getTries(self.db_health_timeout)
         conn_msg = f"SQL-Connection to {self.database} on {self.config.host} port {self.config.sql_port} with user {self.dbUser}"
         dbStatus = DBStatus(attempts=0, ok=False, msg=conn_msg, max_tries=maxTries)
         if self.config.verbose:
             print(
                 f"Trying {dbStatus.msg} with max {maxTries} tries and {timeout}s timeout per try - initial sleep {initialSleep}s"
             )
-        time.sleep(initialSleep)
-        sleep = 2.0
+        if initialSleep > 0:
+            time.sleep(initialSleep)
+        delays = backoff.delays()
         while not dbStatus.ok and dbStatus.attempts <= maxTries:
             try:
-                self.doCheckDBConnection(dbStatus, timeout=timeout)
+                with self.timed(
+                    "db_connect", detail=f"attempt {dbStatus.attempts + 1}"
+                ) as timing:
+                    self.doCheckDBConnection(dbStatus, timeout=timeout)
+                    timing.ok = dbStatus.ok
                 if not dbStatus.ok:
+                    sleep = next(delays)
                     if self.config.verbose:
                         print(
                             f"Connection attempt #{dbStatus.attempts}/{dbStatus.max_tries} failed will retry in {sleep:4.1f} secs"
                         )
                     # wait before trying
                     time.sleep(sleep)
-                    sleep = sleep * factor
             except Exception as ex:
                 dbStatus.ex = ex
                 if self.config.verbose:
@@ -551,10 +973,15 @@ class DockerApplication(object):
             content (str): the content to write
             overwrite (bool): if True overwrite the existing content
         """
-        if not overwrite and os.path.isfile(targetPath):
-            if self.config.verbose:
-                print(f"{targetPath} already exists!")
-            return
+        if os.path.isfile(targetPath):
+            if not overwrite:
+                if self.config.verbose:
+                    print(f"{targetPath} already exists!")
+                return
+            # do not touch unchanged files
+            with open(targetPath, "r", newline="") as targetFile:
+                if targetFile.read() == content:
+                    return
         with open(targetPath, "w", newline="") as targetFile:
             targetFile.write(content)
 
@@ -563,6 +990,26 @@ class DockerApplication(object):
     ):
         """
         generate file at targetPath using the given templateName
+        and record the timing of the generation
+
+        Args:
+            templateName (str): the Jinja2 template to use
+            targetPath (str): the path to the target file
+            overwrite (bool): if True overwrite existing files
+            kwArgs(): generic keyword arguments to pass on to template rendering
+        """
+        with self.timed("generate", detail=templateName):
+            self.doGenerate(templateName, targetPath, overwrite=overwrite, **kwArgs)
+
+    def doGenerate(
+        self, templateName: str, targetPath: str, overwrite: bool = False, **kwArgs
+    ):
+        """
+        generate file at targetPath using the given templateName
+
+        templates whose inputs did not change since the last generation
+        are not rendered again and unchanged content is not rewritten
+        so that timestamps and the docker build cache stay valid
 
         Args:
             templateName (str): the Jinja2 template to use
@@ -570,25 +1017,71 @@ class DockerApplication(object):
             overwrite (bool): if True overwrite existing files
             kwArgs(): generic keyword arguments to pass on to template rendering
         """
+        from jinja2.exceptions import TemplateNotFound
+
+        if not overwrite and os.path.isfile(targetPath):
+            if self.config.verbose:
+                print(f"{targetPath} already exists!")
+            return
         try:
-            template = self.env.get_template(templateName)
-            timestamp = datetime.datetime.now().isoformat()
-            content = template.render(
+            params = dict(
                 mwVersion=self.config.version,
                 mariaDBVersion=self.config.mariaDBVersion,
                 port=self.config.port,
                 sql_port=self.config.sql_port,
                 smw_version=self.config.smw_version,
-                timestamp=timestamp,
                 pmwdVersion=Version.version,
                 config=self.config,
                 **kwArgs,
             )
-            self.optionalWrite(targetPath, content, overwrite)
+            target_name = os.path.relpath(targetPath, self.docker_path)
+            input_hash = GenerationManifest.getInputHash(self.env, templateName, params)
+            if self.manifest.isUpToDate(target_name, input_hash, targetPath):
+                return
+            template = self.env.get_template(templateName)
+            rendered = template.render(timestamp=self.timestamp_marker, **params)
+            # keep the timestamp of the last change if the content is the same
+            timestamp = self.manifest.getTimestamp(target_name)
+            content = None
+            if timestamp is not None and os.path.isfile(targetPath):
+                content = rendered.replace(self.timestamp_marker, timestamp)
+                with open(targetPath, "r", newline="") as targetFile:
+                    if targetFile.read() != content:
+                        content = None
+            if content is None:
+                timestamp = datetime.datetime.now().isoformat()
+                content = rendered.replace(self.timestamp_marker, timestamp)
+                self.optionalWrite(targetPath, content, overwrite=True)
+            output_hash = GenerationManifest.hash(content)
+            self.manifest.update(target_name, input_hash, output_hash, timestamp)
 
         except TemplateNotFound:
             print(f"no template {templateName} for {self.config.version}")
 
+    def copyResource(self, resourcePath: str, targetPath: str, overwrite: bool = False):
+        """
+        copy the given static resource to the given targetPath without
+        template rendering - unchanged resources are not copied again
+
+        Args:
+            resourcePath (str): the path of the packaged resource
+            targetPath (str): the path to the target file
+            overwrite (bool): if True overwrite an existing file
+        """
+        if not overwrite and os.path.isfile(targetPath):
+            if self.config.verbose:
+                print(f"{targetPath} already exists!")
+            return
+        target_name = os.path.relpath(targetPath, self.docker_path)
+        resource_hash = GenerationManifest.hashFile(resourcePath)
+        if self.manifest.isUpToDate(target_name, resource_hash, targetPath):
+            return
+        if not os.path.isfile(targetPath) or (
+            GenerationManifest.hashFile(targetPath) != resource_hash
+        ):
+            shutil.copyfile(resourcePath, targetPath)
+        self.manifest.update(target_name, resource_hash, resource_hash)
+
     def getComposerRequire(self):
         """
         get the json string for the composer require e.g. composer.local.json
@@ -623,15 +1116,24 @@ class DockerApplication(object):
         requireJson = self.getComposerRequire()
         self.optionalWrite(composerFilePath, requireJson, overwrite)
 
-    def generateAll(self, overwrite: bool = False):
+    def getComposeProjectName(self) -> str:
         """
-        generate all files needed for the docker handling
+        get the name docker compose derives for my project from my docker path
 
-        Args:
-            overwrite (bool): if True overwrite the existing files
+        Returns:
+            str: the normalized compose project name
+        """
+        project_name = os.path.basename(self.docker_path).lower()
+        project_name = re.sub(r"[^a-z0-9_-]", "", project_name)
+        return project_name
+
+    def getComposeParams(self) -> dict:
+        """
+        get the parameters for rendering my docker compose services
+
+        Returns:
+            dict: the template parameters
         """
-        # make sure we have the wiki_id ready
-        wiki_id = self.config.getWikiId()
         # we have to configure whether
         # bind mounts or volumes are to be used
         if self.config.bind_mount:
@@ -642,6 +1144,76 @@ class DockerApplication(object):
             volume_type = "volume"
             mysql_data = "mysql-data"
             wiki_sites = "wiki-sites"
+        compose_params = {
+            # might be None for ExternalDB case
+            "mySQLRootPassword": self.config.mySQLRootPassword,
+            "mySQLPassword": self.config.mySQLPassword,
+            "container_base_name": self.config.container_base_name,
+            "db_container_name": self.config.db_container_name,
+            "wiki_id": self.config.getWikiId(),
+            "volume_type": volume_type,
+            "mysql_data": mysql_data,
+            "wiki_sites": wiki_sites,
+            "scripts_dir": self.docker_path,
+            "uid": self.config.uid,
+            "gid": self.config.gid,
+            "image": self.getImageTag(),
+            "labels": DockerMap.getLabels(
+                cluster=self.config.prefix,
+                app=self.config.container_base_name,
+                version=self.config.version,
+            ),
+        }
+        return compose_params
+
+    def getImageTag(self) -> typing.Optional[str]:
+        """
+        get the tag of my mediawiki image based on the content hash
+        of my generated Dockerfile and build inputs so that apps
+        with identical build inputs share the same image
+
+        Returns:
+            str: the image tag or None if there is no Dockerfile yet
+        """
+        image_tag = None
+        if os.path.isfile(f"{self.docker_path}/Dockerfile"):
+            image_hash = DockerImageBuilder.getImageHash(self.docker_path)
+            image_tag = (
+                f"pymediawikidocker/mediawiki:{self.config.version}-{image_hash[:12]}"
+            )
+        return image_tag
+
+    def buildImage(self, force: bool = False) -> ImageBuild:
+        """
+        build my mediawiki image unless an image with the same
+        content hash has already been built
+
+        Args:
+            force(bool): if True build even if the image already exists
+
+        Returns:
+            ImageBuild: the build result
+        """
+        if self.image_builder is None:
+            self.image_builder = DockerImageBuilder(
+                verbose=self.config.verbose, debug=self.config.debug
+            )
+        tag = self.getImageTag()
+        with self.timed("build", detail=tag):
+            image_build = self.image_builder.build(tag, self.docker_path, force=force)
+        return image_build
+
+    def generateAll(self, overwrite: bool = False):
+        """
+        generate all files needed for the docker handling
+
+        Args:
+            overwrite (bool): if True overwrite the existing files
+        """
+        os.makedirs(self.docker_path, exist_ok=True)
+        # make sure we have the wiki_id ready
+        wiki_id = self.config.getWikiId()
+        compose_params = self.getComposeParams()
         # first generate Dockerfile
         # the goal is to get an empty MediaWiki (no LocalSettings/extensions)
         # with composer ready
@@ -649,9 +1221,11 @@ class DockerApplication(object):
             "mwDockerfile",
             f"{self.docker_path}/Dockerfile",
             composerVersion=self.composerVersion,
-            volume_type=volume_type,
+            volume_type=compose_params["volume_type"],
             overwrite=overwrite,
         )
+        # the image tag depends on the Dockerfile content
+        compose_params["image"] = self.getImageTag()
         # the master setup script
         # this used to be part of Dockerfile but
         # needs to be scripted when we use bind mounts due
@@ -675,19 +1249,8 @@ class DockerApplication(object):
         self.generate(
             template_name,
             f"{self.docker_path}/docker-compose.yml",
-            # might be None for ExternalDB case
-            mySQLRootPassword=self.config.mySQLRootPassword,
-            mySQLPassword=self.config.mySQLPassword,
-            container_base_name=self.config.container_base_name,
-            db_container_name=self.config.db_container_name,
-            wiki_id=wiki_id,
-            volume_type=volume_type,
-            mysql_data=mysql_data,
-            wiki_sites=wiki_sites,
-            scripts_dir=self.docker_path,
-            uid=self.config.uid,
-            gid=self.config.gid,
             overwrite=overwrite,
+            **compose_params,
         )
         # now generate the parts we will use later to
         # create the fully configured wiki
@@ -695,11 +1258,12 @@ class DockerApplication(object):
         # secretKey
         # https://www.mediawiki.org/wiki/Manual:$wgSecretKey
         # 64 char random hex
-        secretKey = secrets.token_hex(32)
+        # the keys are kept in the manifest so that they are stable across runs
+        secretKey = self.manifest.getSecret("secretKey", lambda: secrets.token_hex(32))
         # upgradeKey
         # https://www.mediawiki.org/wiki/Manual:$wgUpgradeKey
         # 16 char random
-        upgradeKey = secrets.token_hex(8)
+        upgradeKey = self.manifest.getSecret("upgradeKey", lambda: secrets.token_hex(8))
         self.generate(
             f"mwLocalSettings{self.config.shortVersion}.php",
             f"{self.docker_path}/LocalSettings.php",
@@ -714,16 +1278,24 @@ class DockerApplication(object):
             overwrite=overwrite,
         )
         # the SQL file for initial content
-        self.generate(
-            f"mwWiki{self.config.shortVersion}.sql",
-            f"{self.docker_path}/wiki.sql",
-            overwrite=overwrite,
+        # is a static resource that is piped to the database compressed
+        sql_path = self.getResourcePath(
+            "sql", f"mwWiki{self.config.shortVersion}.sql.gz"
         )
+        if os.path.isfile(sql_path):
+            self.copyResource(
+                sql_path, f"{self.docker_path}/wiki.sql.gz", overwrite=overwrite
+            )
+        else:
+            print(f"no initial SQL content for {self.config.version}")
         # a WikiUser for automated access via
         # py-3rdparty mediawiki
         if self.config.random_password:
-            self.config.password = self.config.create_random_password(
-                length=self.config.password_length
+            self.config.password = self.manifest.getSecret(
+                "password",
+                lambda: self.config.create_random_password(
+                    length=self.config.password_length
+                ),
             )
             if self.config.wikiId:
                 self.createOrModifyWikiUser(
@@ -748,16 +1320,21 @@ class DockerApplication(object):
         self.genComposerRequire(
             f"{self.docker_path}/composer.local.json", overwrite=overwrite
         )
+        self.generate(
+            "phpinfo.php", f"{self.docker_path}/phpinfo.php", overwrite=overwrite
+        )
+        # static files without template syntax are copied as is
         for file_name in [
-            "phpinfo.php",
             "disable_sudo.sh",
             "install_djvu.sh",
             "plantuml.sh",
             "upload.ini",
-            "my.cnf"
+            "my.cnf",
         ]:
-            self.generate(
-                f"{file_name}", f"{self.docker_path}/{file_name}", overwrite=overwrite
+            self.copyResource(
+                self.getResourcePath("templates", file_name),
+                f"{self.docker_path}/{file_name}",
+                overwrite=overwrite,
             )
 
         # chmod generated scripts that need to be bash callable
@@ -785,33 +1362,152 @@ class DockerApplication(object):
         self.config.forceRebuild = False
         self.config.save()
         self.config.forceRebuild = forceRebuild
+        self.manifest.save()
+
+    def getComposeClient(self) -> "DockerClient":
+        """
+        get a docker client for my docker compose project that
+        does not depend on the current working directory
 
-    def down(self, forceRebuild: bool = False):
+        Returns:
+            DockerClient: the docker client for my docker-compose.yml
+        """
+        from python_on_whales import DockerClient
+
+        compose_client = DockerClient(
+            compose_files=[f"{self.docker_path}/docker-compose.yml"],
+            compose_project_directory=self.docker_path,
+        )
+        return compose_client
+
+    def down(self, forceRebuild: bool = False) -> int:
         """
         run docker compose down
 
         see https://docs.docker.com/engine/reference/commandline/compose_down/
         and https://gabrieldemarmiesse.github.io/python-on-whales/sub-commands/compose/#down
 
+        Args:
+            forceRebuild (bool): if True also remove the volumes
+
+        Returns:
+            int: exitCode - 0 if ok 1 if docker compose down failed
         """
+        from python_on_whales.exceptions import DockerException
+
         DockerApplication.checkDockerEnvironment(self.config.debug)
-        # change directory so that docker CLI will find the relevant dockerfile and docker-compose.yml
+        exitCode = 0
         if self.config.verbose:
             print(
                 f"running docker compose down for {self.config.container_base_name} {self.config.version} docker application ..."
             )
-        # remember current directory
-        cwd = os.getcwd()
-        os.chdir(self.docker_path)
+        # the compose client is bound to my docker path so that
+        # several applications may be taken down in parallel
+        compose_client = self.getComposeClient()
         try:
-            docker.compose.down(volumes=forceRebuild)
+            compose_client.compose.down(volumes=forceRebuild)
         except DockerException as dex:
             print(
                 f"warning: docker compose down failed in {self.docker_path}:{str(dex)}"
             )
-            pass
-        # switch back to previous current directory
-        os.chdir(cwd)
+            exitCode = 1
+        DockerMap.invalidate()
+        return exitCode
+
+    def removeContainers(self):
+        """
+        stop and remove my existing containers
+        """
+        for docker_container in [self.dbContainer, self.mwContainer]:
+            if docker_container is not None:
+                container = docker_container.container
+                try:
+                    container_name = container.name
+                    if self.config.verbose:
+                        print(f"stopping and removing container {container_name}")
+                except Exception as container_ex:
+                    container = None
+                if container:
+                    try:
+                        container.stop()
+                    except Exception as stop_ex:
+                        if self.config.verbose:
+                            print(f"stop failed with {str(stop_ex)}")
+                        pass
+                    try:
+                        container.remove()
+                    except Exception as remove_ex:
+                        if self.config.verbose:
+                            print(f"removed failed with {str(remove_ex)}")
+                        pass
+                pass
+        DockerMap.invalidate()
+
+    def removeVolumes(self, volume_names: List[str]):
+        """
+        remove the given volumes of my compose project
+
+        Args:
+            volume_names(list): the volume names without the project prefix
+        """
+        project_name = self.getComposeProjectName()
+        for volume_name in volume_names:
+            volume = f"{project_name}_{volume_name}"
+            if self.backend.volumeExists(volume):
+                if self.config.verbose:
+                    print(f"removing volume {volume}")
+                self.backend.removeVolume(volume)
+
+    def prepareApply(self, change: ChangeClass):
+        """
+        prepare applying the given class of change - stop the affected containers,
+        remove the volumes that need to be recreated and regenerate my files
+
+        Args:
+            change(ChangeClass): the class of change to apply
+        """
+        if change == ChangeClass.NONE:
+            return
+        if change >= ChangeClass.IMAGE:
+            self.getContainers()
+            self.removeContainers()
+            # the MediaWiki code and /etc are copied from the image
+            # on volume creation
+            volume_names = ["wiki-etc", "wiki-html"]
+            if change == ChangeClass.DATA_RESET:
+                if self.config.bind_mount:
+                    print(
+                        f"warning: the bind mounted data of {self.config.container_base_name} is not reset"
+                    )
+                else:
+                    volume_names.extend(["mysql-data", "wiki-sites"])
+            self.removeVolumes(volume_names)
+        self.generateAll(overwrite=True)
+        if change >= ChangeClass.IMAGE and self.getImageTag():
+            self.buildImage(force=False)
+
+    def finishApply(self, change: ChangeClass, withUp: bool = True) -> int:
+        """
+        finish applying the given class of change after prepareApply
+
+        Args:
+            change(ChangeClass): the class of change to apply
+            withUp (bool): if False my containers have already been brought up e.g. by a cluster compose project
+
+        Returns:
+            int: exitCode - 0 if ok
+        """
+        exitCode = 0
+        if change >= ChangeClass.IMAGE:
+            exitCode = self.start(withUp=withUp)
+        elif change >= ChangeClass.LOCAL_SETTINGS:
+            if change == ChangeClass.COMPOSE and withUp:
+                # compose recreates the containers whose configuration changed
+                self.up()
+            else:
+                self.waitForContainers()
+            self.updateMediaWiki()
+        return exitCode
 
     def up(self, forceRebuild: bool = False):
         """
@@ -826,57 +1522,56 @@ class DockerApplication(object):
                 f"starting {self.config.container_base_name} {self.config.version} docker application ..."
             )
         if forceRebuild:
-            for docker_container in [self.dbContainer, self.mwContainer]:
-                if docker_container is not None:
-                    container = docker_container.container
-                    try:
-                        container_name = container.name
-                        if self.config.verbose:
-                            print(f"stopping and removing container {container_name}")
-                    except Exception as container_ex:
-                        container = None
-                    if container:
-                        try:
-                            container.stop()
-                        except Exception as stop_ex:
-                            if self.config.verbose:
-                                print(f"stop failed with {str(stop_ex)}")
-                            pass
-                        try:
-                            container.remove()
-                        except Exception as remove_ex:
-                            if self.config.verbose:
-                                print(f"removed failed with {str(remove_ex)}")
-                            pass
-                    pass
-
-        # remember current directory
-        cwd = os.getcwd()
-
-        # change directory so that docker CLI will find the relevant dockerfile and docker-compose.yml
-        os.chdir(self.docker_path)
-        # project_config = docker.compose.config()
-        if forceRebuild:
-            docker.compose.build()
+            self.removeContainers()
+
+        # use a compose client bound to my docker path instead of changing
+        # the process wide working directory so that several applications
+        # may be started in parallel
+        compose_client = self.getComposeClient()
+        if self.getImageTag():
+            # build the content hash tagged image only if needed
+            self.buildImage(force=forceRebuild)
+        elif forceRebuild:
+            with self.timed("build", detail="compose build"):
+                compose_client.compose.build()
+        if self.image_prefetcher is not None and not self.config.has_external_db:
+            mariadb_image = f"mariadb:{self.config.mariaDBVersion}"
+            with self.timed("pull", detail=mariadb_image):
+                self.image_prefetcher.wait([mariadb_image])
         # run docker compose up
         # this might take a while e.g. downloading
-        # run docker compose up
         try:
-            docker.compose.up(detach=True, force_recreate=forceRebuild)
+            with self.timed("compose_up"):
+                compose_client.compose.up(detach=True, force_recreate=forceRebuild)
         except Exception as de:
             print(f"docker compose up failed in {self.docker_path}")
             raise de
-            pass
-        # switch back to previous current directory
-        os.chdir(cwd)
+        finally:
+            DockerMap.invalidate()
+        mw, db = self.waitForContainers()
+        return mw, db
+
+    def waitForContainers(self):
+        """
+        wait for my containers to be running
 
+        Returns:
+            Tuple(DockerContainer,DockerContainer): the mediawiki and database container
+        """
         # check the startup of both containers
         mw, db = self.getContainers()
         for dc in [mw, db]:
             if dc:
-                start_secs = dc.wait_for_state(running=True)
+                with self.timed("container_wait", detail=dc.name):
+                    start_secs = dc.wait_for_state(running=True)
                 if self.config.verbose:
                     print(f"{dc.name} 🟢 started in {start_secs:.2f}s")
+        # the database is ready as soon as its healthcheck reports healthy
+        if db and db.getHealth() is not None:
+            with self.timed("container_wait", detail=f"{db.name} healthy"):
+                healthy_secs = db.wait_for_healthy()
+            if self.config.verbose:
+                print(f"{db.name} 🟢 healthy in {healthy_secs:.2f}s")
         return mw, db
 
     def prepare_external_db_access(
@@ -886,16 +1581,13 @@ class DockerApplication(object):
         make sure the external database container can be reached
         """
         # ensure network exists
-        nets = {n.name for n in docker.network.list()}
-        if network_name not in nets:
-            docker.network.create(network_name)
+        if network_name not in self.backend.listNetworks():
+            self.backend.createNetwork(network_name)
 
         # connect external DB container with alias
         try:
-            docker.network.connect(
-                network=network_name,
-                container=self.config.db_container_name,
-                alias=db_alias,
+            self.backend.connectNetwork(
+                network_name, self.config.db_container_name, alias=db_alias
             )
         except Exception as ex:
             # already connected or harmless -> ignore
@@ -903,15 +1595,25 @@ class DockerApplication(object):
                 if self.config.debug:
                     print(f"network connect hint: {ex}", file=sys.stderr)
 
-    def start(self, forceRebuild: bool = False, withInitDB=True):
+    def start(
+        self, forceRebuild: bool = False, withInitDB=True, withUp: bool = True
+    ) -> int:
         """
         start my containers
 
         Args:
             forceRebuild (bool): if True force rebuilding
             withInitDB (bool): if True intialize my database
+            withUp (bool): if False my containers have already been brought up e.g. by a cluster compose project
+
+        Returns:
+            int: exitCode - 0 if ok 1 if the database was not accessible
         """
-        self.up(forceRebuild=forceRebuild)
+        exitCode = 0
+        if withUp:
+            self.up(forceRebuild=forceRebuild)
+        else:
+            self.waitForContainers()
         if self.config.has_external_db:
             self.prepare_external_db_access()
         if withInitDB:
@@ -933,21 +1635,80 @@ class DockerApplication(object):
             if dbStatus.ok:
                 # run the mediawiki setup including composer based extensions
                 self.setupMediaWiki()
-        if self.config.verbose:
+            else:
+                exitCode = 1
+        if self.config.verbose and exitCode == 0:
             print(
                 f"MediaWiki {self.config.container_base_name} is ready at {self.config.full_url}"
             )
+        return exitCode
+
+    def runSetupScript(self, *options: str) -> SetupStepReport:
+        """
+        run the generated setup-mediawiki.sh with the given step options
+        and collect the durations of its steps from the step markers
+
+        Args:
+            options: the step options e.g. --all
+
+        Returns:
+            SetupStepReport: the per step duration report
+        """
+        report = SetupStepReport(app=self.config.container_base_name)
+        self.exec_log.addListener(report.onLogLine)
+        try:
+            self.execute(
+                "bash",
+                "/scripts/setup-mediawiki.sh",
+                "--script-dir",
+                "/scripts",
+                "--web-dir",
+                "/var/www/html",
+                *options,
+            )
+        finally:
+            self.exec_log.removeListener(report.onLogLine)
+            for setup_step in report.steps:
+                if setup_step.duration is not None:
+                    self.metrics.add(
+                        PhaseTiming(
+                            phase="setup_step",
+                            app=self.config.container_base_name,
+                            version=self.config.version,
+                            start=setup_step.start,
+                            duration=setup_step.duration,
+                            ok=setup_step.ok,
+                            detail=setup_step.name,
+                        )
+                    )
+        if self.config.verbose:
+            report.show()
+        return report
 
-    def setupMediaWiki(self):
+    def setupMediaWiki(self) -> SetupStepReport:
         """
         setup MediaWiki via the generated script with explicit args
+
+        Returns:
+            SetupStepReport: the per step duration report
+        """
+        report = self.runSetupScript("--all")
+        return report
+
+    def updateMediaWiki(self) -> SetupStepReport:
         """
-        self.execute(
-            "bash",
-            "/scripts/setup-mediawiki.sh",
-            "--script-dir",
-            "/scripts",
-            "--web-dir",
-            "/var/www/html",
-            "--all",
+        update the settings, extensions and database schema of
+        an already installed MediaWiki
+
+        Returns:
+            SetupStepReport: the per step duration report
+        """
+        report = self.runSetupScript(
+            "--update-files",
+            "--extensions",
+            "--permissions",
+            "--composer",
+            "--update",
+            "--sysop",
         )
+        return report
@@ -0,0 +1,948 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import datetime
+import http.client
+import json
+import os
+import queue
+import socket
+import struct
+import subprocess
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class ContainerHealth:
+    """
+    the healthcheck status of a container
+    """
+
+    status: Optional[str] = None
+    failing_streak: int = 0
+
+
+@dataclass
+class ContainerState:
+    """
+    the state of a container as reported by the Engine API
+    """
+
+    running: bool = False
+    status: Optional[str] = None
+    exit_code: Optional[int] = None
+    # None if the container has no healthcheck
+    health: Optional[ContainerHealth] = None
+
+
+@dataclass
+class PortBinding:
+    """
+    a host port binding of a container port
+    """
+
+    host_ip: Optional[str] = None
+    host_port: Optional[str] = None
+
+
+@dataclass
+class HostConfig:
+    """
+    the host configuration of a container
+    """
+
+    port_bindings: Dict[str, List[PortBinding]] = field(default_factory=dict)
+
+
+@dataclass
+class ContainerConfig:
+    """
+    the configuration of a container
+    """
+
+    env: List[str] = field(default_factory=list)
+    labels: Dict[str, str] = field(default_factory=dict)
+
+
+class EventStream:
+    """
+    a stream of docker events as Engine API style dicts
+    """
+
+    def __init__(self, events: Iterator[dict]):
+        """
+        constructor
+
+        Args:
+            events(Iterator): the events
+        """
+        self.events = events
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.events)
+
+    def close(self):
+        """
+        stop the stream
+        """
+        pass
+
+
+class LogStream:
+    """
+    a followed stream of container log chunks as (stream type, bytes) tuples
+    """
+
+    def __init__(self, chunks: Iterator[Tuple[str, bytes]]):
+        """
+        constructor
+
+        Args:
+            chunks(Iterator): the chunks of the stdout and stderr streams
+        """
+        self.chunks = chunks
+
+    def __iter__(self) -> Iterator[Tuple[str, bytes]]:
+        return iter(self.chunks)
+
+    def close(self):
+        """
+        stop the stream
+        """
+        pass
+
+
+def terminateProcess(process: subprocess.Popen, timeout: float = 5.0):
+    """
+    terminate the given process and wait for it - kill it if it does not terminate
+
+    Args:
+        process(Popen): the process
+        timeout(float): the number of seconds to wait for the termination
+    """
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    for pipe in [process.stdout, process.stderr]:
+        if pipe is not None:
+            pipe.close()
+
+
+class ProcessEventStream(EventStream):
+    """
+    the JSON lines events stream of a docker events command line process
+    """
+
+    def __init__(self, command: List[str]):
+        """
+        constructor
+
+        Args:
+            command(list): the command line e.g. docker events --format {{json .}}
+        """
+        self.process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        super().__init__(self.readEvents())
+
+    def readEvents(self) -> Iterator[dict]:
+        try:
+            for line in self.process.stdout:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except (OSError, ValueError):
+            # the stream has been closed
+            pass
+
+    def close(self):
+        terminateProcess(self.process)
+
+
+class ProcessLogStream(LogStream):
+    """
+    the log stream of a docker logs --follow command line process
+    """
+
+    def __init__(self, command: List[str]):
+        """
+        constructor
+
+        Args:
+            command(list): the command line e.g. docker logs --follow
+        """
+        self.process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        self.queue = queue.Queue()
+        self.readers = []
+        for stream_type, pipe in [
+            ("stdout", self.process.stdout),
+            ("stderr", self.process.stderr),
+        ]:
+            reader = threading.Thread(
+                target=self.readPipe, args=(stream_type, pipe), daemon=True
+            )
+            self.readers.append(reader)
+            reader.start()
+        super().__init__(self.readChunks())
+
+    def readPipe(self, stream_type: str, pipe):
+        """
+        read the chunks of the given pipe into my queue until it ends
+        """
+        try:
+            for chunk in iter(lambda: pipe.read1(65536), b""):
+                self.queue.put((stream_type, chunk))
+        except (OSError, ValueError):
+            # the pipe has been closed
+            pass
+        finally:
+            self.queue.put((stream_type, None))
+
+    def readChunks(self) -> Iterator[Tuple[str, bytes]]:
+        open_pipes = len(self.readers)
+        while open_pipes > 0:
+            stream_type, chunk = self.queue.get()
+            if chunk is None:
+                open_pipes -= 1
+            else:
+                yield stream_type, chunk
+
+    def close(self):
+        terminateProcess(self.process)
+        for reader in self.readers:
+            reader.join(timeout=5.0)
+
+
+class DockerBackend:
+    """
+    the docker operations needed for the container handling
+
+    this default backend uses the docker command line via python_on_whales
+    """
+
+    name = "cli"
+
+    # the process wide backend
+    _backend = None
+    _backend_lock = threading.Lock()
+
+    @classmethod
+    def getSocketPath(cls) -> Optional[str]:
+        """
+        get the path of the docker socket from DOCKER_HOST
+
+        Returns:
+            str: the socket path or None if DOCKER_HOST is not a unix socket
+        """
+        docker_host = os.environ.get("DOCKER_HOST", "unix:///var/run/docker.sock")
+        socket_path = None
+        if docker_host.startswith("unix://"):
+            socket_path = docker_host[len("unix://") :]
+        return socket_path
+
+    @classmethod
+    def getBackend(cls) -> "DockerBackend":
+        """
+        get the process wide docker backend
+
+        MWDOCKER_BACKEND=api|cli selects the backend explicitly - by default the
+        Engine API is used if the docker socket answers and the CLI otherwise
+
+        Returns:
+            DockerBackend: the docker backend
+        """
+        with DockerBackend._backend_lock:
+            if DockerBackend._backend is None:
+                backend_name = os.environ.get("MWDOCKER_BACKEND", "auto")
+                socket_path = cls.getSocketPath()
+                backend = DockerBackend()
+                if backend_name != "cli" and socket_path is not None:
+                    api_backend = ApiDockerBackend(socket_path)
+                    if backend_name == "api" or api_backend.ping():
+                        backend = api_backend
+                DockerBackend._backend = backend
+            backend = DockerBackend._backend
+        return backend
+
+    @classmethod
+    def setBackend(cls, backend: Optional["DockerBackend"]):
+        """
+        set the process wide docker backend - None to select it again on next use
+        """
+        with DockerBackend._backend_lock:
+            DockerBackend._backend = backend
+
+    def listContainers(self, labels: Dict[str, str] = None) -> list:
+        """
+        list the running containers
+
+        Args:
+            labels(dict): optional labels the containers need to have - a value of None only checks the presence of the label
+
+        Returns:
+            list: containers with name, state, host_config, config, stop() and remove()
+        """
+        from python_on_whales import docker
+
+        filters = [("label", label) for label in self.getLabelFilters(labels)]
+        containers = docker.container.list(filters=filters)
+        return containers
+
+    @classmethod
+    def getLabelFilters(cls, labels: Dict[str, str] = None) -> List[str]:
+        """
+        get the docker label filters for the given labels
+        """
+        label_filters = []
+        for key, value in (labels or {}).items():
+            label_filters.append(key if value is None else f"{key}={value}")
+        return label_filters
+
+    def inspectContainer(self, container_name: str):
+        """
+        inspect the given container
+
+        Args:
+            container_name(str): the name of the container
+
+        Returns:
+            the container or None if it does not exist
+        """
+        from python_on_whales import docker
+        from python_on_whales.exceptions import NoSuchContainer
+
+        try:
+            container = docker.container.inspect(container_name)
+        except NoSuchContainer:
+            container = None
+        return container
+
+    def logs(self, container_name: str, tail: int = None, since: float = None) -> str:
+        """
+        get the logs of the given container
+
+        Args:
+            container_name(str): the name of the container
+            tail(int): only get the given number of lines from the end - all lines if None
+            since(float): only get the lines since the given unix timestamp
+
+        Returns:
+            str: the log text
+        """
+        from python_on_whales import docker
+
+        logs = docker.container.logs(
+            container_name,
+            tail=tail,
+            since=datetime.datetime.fromtimestamp(since) if since else None,
+        )
+        return logs
+
+    def followLogs(self, container_name: str, since: float = None) -> LogStream:
+        """
+        follow the logs of the given container
+
+        Args:
+            container_name(str): the name of the container
+            since(float): start with the lines since the given unix timestamp - only new lines if None
+
+        Returns:
+            LogStream: the stream of log chunks
+        """
+        if since is None:
+            since = time.time()
+        command = ["docker", "logs", "--follow", "--since", f"{since:.3f}"]
+        log_stream = ProcessLogStream(command + [container_name])
+        return log_stream
+
+    def volumeExists(self, volume_name: str) -> bool:
+        """
+        check whether the given volume exists
+        """
+        from python_on_whales import docker
+
+        exists = docker.volume.exists(volume_name)
+        return exists
+
+    def openEvents(self, filters: Dict[str, List[str]]) -> EventStream:
+        """
+        subscribe to the docker events stream
+
+        Args:
+            filters(dict): the event filters e.g. {"type": ["container"]}
+
+        Returns:
+            EventStream: the stream of events of a docker events process
+                that is terminated when the stream is closed
+        """
+        command = ["docker", "events", "--format", "{{json .}}"]
+        for key, values in filters.items():
+            for value in values:
+                command += ["--filter", f"{key}={value}"]
+        event_stream = ProcessEventStream(command)
+        return event_stream
+
+    def removeVolume(self, volume_name: str):
+        """
+        remove the given volume
+        """
+        from python_on_whales import docker
+
+        docker.volume.remove(volume_name)
+
+    def execute(
+        self, container_name: str, command: List[str]
+    ) -> Iterator[Tuple[str, bytes]]:
+        """
+        execute the given command in the given container and stream its output
+
+        Args:
+            container_name(str): the name of the container
+            command(list): the command and its arguments
+
+        Returns:
+            Iterator: the (stream type, bytes) chunks of stdout and stderr
+
+        Raises:
+            Exception: when the stream ends if the command failed
+        """
+        from python_on_whales import docker
+
+        # see https://gabrieldemarmiesse.github.io/python-on-whales/user_guide/docker_run/#stream-the-output
+        yield from docker.execute(
+            container=container_name, command=command, stream=True
+        )
+
+    def listNetworks(self) -> List[str]:
+        """
+        get the names of the docker networks
+        """
+        from python_on_whales import docker
+
+        network_names = [network.name for network in docker.network.list()]
+        return network_names
+
+    def createNetwork(self, network_name: str):
+        """
+        create the given docker network
+        """
+        from python_on_whales import docker
+
+        docker.network.create(network_name)
+
+    def connectNetwork(self, network_name: str, container_name: str, alias: str = None):
+        """
+        connect the given container to the given network
+
+        Args:
+            network_name(str): the name of the network
+            container_name(str): the name of the container
+            alias(str): an optional alias of the container in the network
+        """
+        from python_on_whales import docker
+
+        docker.network.connect(network_name, container_name, alias=alias)
+
+
+class ApiContainer:
+    """
+    a container of the Engine API backend with the attributes
+    of a python_on_whales container used by mwdocker
+
+    the container is inspected once and the state, host config and config
+    are all taken from that response - reload() gets the current state
+    """
+
+    def __init__(
+        self,
+        backend: "ApiDockerBackend",
+        name: str,
+        container_id: str,
+        info: dict = None,
+    ):
+        """
+        constructor
+
+        Args:
+            backend(ApiDockerBackend): the backend to use
+            name(str): the name of the container
+            container_id(str): the id of the container
+            info(dict): the inspect response if already known
+        """
+        self.backend = backend
+        self.name = name
+        self.id = container_id
+        self._info = info
+
+    def inspect(self) -> dict:
+        """
+        inspect me
+        """
+        info = self.backend.getJson(f"/containers/{self.id}/json")
+        self._info = info
+        return info
+
+    def reload(self):
+        """
+        inspect me again to get my current state
+        """
+        self.inspect()
+
+    @property
+    def info(self) -> dict:
+        """
+        the inspect response - inspected on first access
+        """
+        if self._info is None:
+            self.inspect()
+        return self._info
+
+    @property
+    def state(self) -> ContainerState:
+        state = self.info.get("State", {})
+        health = state.get("Health")
+        container_state = ContainerState(
+            running=state.get("Running", False),
+            status=state.get("Status"),
+            exit_code=state.get("ExitCode"),
+            health=(
+                ContainerHealth(
+                    status=health.get("Status"),
+                    failing_streak=health.get("FailingStreak", 0),
+                )
+                if health
+                else None
+            ),
+        )
+        return container_state
+
+    @property
+    def host_config(self) -> HostConfig:
+        port_bindings = {}
+        bindings = self.info.get("HostConfig", {}).get("PortBindings") or {}
+        for port, port_binding_list in bindings.items():
+            port_bindings[port] = [
+                PortBinding(
+                    host_ip=port_binding.get("HostIp"),
+                    host_port=port_binding.get("HostPort"),
+                )
+                for port_binding in port_binding_list or []
+            ]
+        host_config = HostConfig(port_bindings=port_bindings)
+        return host_config
+
+    @property
+    def config(self) -> ContainerConfig:
+        config = self.info.get("Config", {})
+        container_config = ContainerConfig(
+            env=config.get("Env") or [], labels=config.get("Labels") or {}
+        )
+        return container_config
+
+    def stop(self):
+        """
+        stop me
+        """
+        self.backend.request("POST", f"/containers/{self.id}/stop")
+
+    def remove(self):
+        """
+        remove me
+        """
+        self.backend.request("DELETE", f"/containers/{self.id}")
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    a HTTP connection over a unix domain socket
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 60.0):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class ApiEventStream(EventStream):
+    """
+    the JSON lines events stream of the Engine API
+    """
+
+    def __init__(
+        self, connection: UnixHTTPConnection, response: http.client.HTTPResponse
+    ):
+        self.connection = connection
+        self.response = response
+        super().__init__(self.readEvents())
+
+    def readEvents(self) -> Iterator[dict]:
+        try:
+            while True:
+                line = self.response.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        except (OSError, ValueError, http.client.HTTPException):
+            # the stream has been closed
+            pass
+        finally:
+            self.connection.close()
+
+    def close(self):
+        sock = self.connection.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class ApiLogStream(LogStream):
+    """
+    the multiplexed log stream of the Engine API
+    """
+
+    stream_types = {0: "stdin", 1: "stdout", 2: "stderr"}
+
+    def __init__(
+        self, connection: UnixHTTPConnection, response: http.client.HTTPResponse
+    ):
+        self.connection = connection
+        self.response = response
+        super().__init__(self.readChunks())
+
+    def readChunks(self) -> Iterator[Tuple[str, bytes]]:
+        try:
+            header = self.response.read(8)
+            # containers with a tty do not multiplex their output
+            multiplexed = len(header) == 8 and header[0] in (0, 1, 2)
+            multiplexed = multiplexed and header[1:4] == b"\0\0\0"
+            if not multiplexed:
+                data = header
+                while data:
+                    yield "stdout", data
+                    data = self.response.read1(65536)
+                return
+            while len(header) == 8:
+                stream_type, size = struct.unpack(">BxxxL", header)
+                data = self.response.read(size)
+                yield self.stream_types.get(stream_type, "stdout"), data
+                header = self.response.read(8)
+        except (OSError, http.client.HTTPException):
+            # the stream has been closed
+            pass
+        finally:
+            self.connection.close()
+
+    def close(self):
+        sock = self.connection.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class DockerApiError(Exception):
+    """
+    an error response of the Engine API
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"docker API error {status}: {message}")
+        self.status = status
+
+
+class DockerExecError(Exception):
+    """
+    a command executed in a container of the Engine API backend failed
+    """
+
+    def __init__(self, container_name: str, command: List[str], exit_code: int):
+        super().__init__(
+            f"{' '.join(command)} in {container_name} failed with exit code {exit_code}"
+        )
+        self.exit_code = exit_code
+
+
+class ApiDockerBackend(DockerBackend):
+    """
+    talks to the Docker Engine API directly over the unix socket
+    each thread keeps a persistent HTTP connection
+    """
+
+    name = "api"
+
+    def __init__(
+        self, socket_path: str = "/var/run/docker.sock", timeout: float = 60.0
+    ):
+        """
+        constructor
+
+        Args:
+            socket_path(str): the path of the docker socket
+            timeout(float): the timeout for socket operations
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def getConnection(self) -> UnixHTTPConnection:
+        """
+        get the persistent connection of the current thread
+        """
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+            self.local.connection = connection
+        return connection
+
+    def request(
+        self, method: str, path: str, params: dict = None, body: dict = None
+    ) -> bytes:
+        """
+        send a request to the Engine API
+
+        Args:
+            method(str): the HTTP method
+            path(str): the API path e.g. /containers/json
+            params(dict): optional query parameters
+            body(dict): optional JSON body
+
+        Returns:
+            bytes: the response body
+
+        Raises:
+            DockerApiError: for error responses
+        """
+        if params:
+            path = f"{path}?{urllib.parse.urlencode(params)}"
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        # retry once if the daemon closed the kept alive connection
+        for attempt in range(2):
+            connection = self.getConnection()
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (
+                http.client.RemoteDisconnected,
+                BrokenPipeError,
+                ConnectionResetError,
+            ):
+                connection.close()
+                if attempt > 0:
+                    raise
+        if response.status >= 400:
+            try:
+                message = json.loads(data).get("message", "")
+            except ValueError:
+                message = data.decode("utf-8", errors="replace")
+            raise DockerApiError(response.status, message)
+        return data
+
+    def getJson(self, path: str, params: dict = None):
+        """
+        get the JSON response of the given API path
+        """
+        data = self.request("GET", path, params=params)
+        json_data = json.loads(data)
+        return json_data
+
+    def ping(self) -> bool:
+        """
+        check that the Engine API is reachable
+        """
+        try:
+            ok = self.request("GET", "/_ping") == b"OK"
+        except (OSError, http.client.HTTPException, DockerApiError):
+            ok = False
+        return ok
+
+    def listContainers(self, labels: Dict[str, str] = None) -> List[ApiContainer]:
+        params = None
+        label_filters = self.getLabelFilters(labels)
+        if label_filters:
+            params = {"filters": json.dumps({"label": label_filters})}
+        containers = []
+        for container_info in self.getJson("/containers/json", params=params):
+            names = container_info.get("Names") or [container_info["Id"]]
+            name = names[0].lstrip("/")
+            containers.append(ApiContainer(self, name, container_info["Id"]))
+        return containers
+
+    def inspectContainer(self, container_name: str) -> Optional[ApiContainer]:
+        try:
+            info = self.getJson(f"/containers/{container_name}/json")
+            name = info.get("Name", container_name).lstrip("/")
+            container = ApiContainer(self, name, info["Id"], info=info)
+        except DockerApiError as api_error:
+            if api_error.status != 404:
+                raise
+            container = None
+        return container
+
+    @classmethod
+    def demux(cls, data: bytes) -> str:
+        """
+        convert the multiplexed stdout/stderr stream of a non tty container
+
+        Args:
+            data(bytes): the raw log stream
+
+        Returns:
+            str: the decoded log text
+        """
+        text_parts = []
+        offset = 0
+        multiplexed = len(data) >= 8 and data[0] in (0, 1, 2) and data[1:4] == b"\0\0\0"
+        if not multiplexed:
+            return data.decode("utf-8", errors="replace")
+        while offset + 8 <= len(data):
+            _stream_type, size = struct.unpack(">BxxxL", data[offset : offset + 8])
+            offset += 8
+            text_parts.append(data[offset : offset + size])
+            offset += size
+        text = b"".join(text_parts).decode("utf-8", errors="replace")
+        return text
+
+    def logs(self, container_name: str, tail: int = None, since: float = None) -> str:
+        params = {"stdout": 1, "stderr": 1}
+        if tail is not None:
+            params["tail"] = tail
+        if since:
+            params["since"] = int(since)
+        data = self.request(
+            "GET",
+            f"/containers/{container_name}/logs",
+            params=params,
+        )
+        logs = self.demux(data)
+        return logs
+
+    def openStream(
+        self, path: str, params: dict = None, method: str = "GET", body: dict = None
+    ):
+        """
+        open a streamed response on a connection of its own
+
+        Args:
+            path(str): the API path
+            params(dict): the query parameters
+            method(str): the HTTP method
+            body(dict): optional JSON body
+
+        Returns:
+            Tuple(UnixHTTPConnection,HTTPResponse): the connection and the response
+        """
+        if params:
+            path = f"{path}?{urllib.parse.urlencode(params)}"
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        connection = UnixHTTPConnection(self.socket_path, timeout=None)
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        if response.status >= 400:
+            data = response.read()
+            connection.close()
+            raise DockerApiError(response.status, data.decode("utf-8", "replace"))
+        return connection, response
+
+    def followLogs(self, container_name: str, since: float = None) -> LogStream:
+        if since is None:
+            since = time.time()
+        params = {"stdout": 1, "stderr": 1, "follow": 1, "since": int(since)}
+        connection, response = self.openStream(
+            f"/containers/{container_name}/logs", params
+        )
+        log_stream = ApiLogStream(connection, response)
+        return log_stream
+
+    def volumeExists(self, volume_name: str) -> bool:
+        try:
+            self.getJson(f"/volumes/{volume_name}")
+            exists = True
+        except DockerApiError as api_error:
+            if api_error.status != 404:
+                raise
+            exists = False
+        return exists
+
+    def removeVolume(self, volume_name: str):
+        self.request("DELETE", f"/volumes/{volume_name}")
+
+    def openEvents(self, filters: Dict[str, List[str]]) -> EventStream:
+        # the stream needs a connection of its own
+        connection, response = self.openStream(
+            "/events", {"filters": json.dumps(filters)}
+        )
+        event_stream = ApiEventStream(connection, response)
+        return event_stream
+
+    def execute(
+        self, container_name: str, command: List[str]
+    ) -> Iterator[Tuple[str, bytes]]:
+        exec_info = json.loads(
+            self.request(
+                "POST",
+                f"/containers/{container_name}/exec",
+                body={"AttachStdout": True, "AttachStderr": True, "Cmd": command},
+            )
+        )
+        exec_id = exec_info["Id"]
+        # the output is streamed on a connection of its own
+        connection, response = self.openStream(
+            f"/exec/{exec_id}/start",
+            method="POST",
+            body={"Detach": False, "Tty": False},
+        )
+        yield from ApiLogStream(connection, response)
+        exit_code = self.getJson(f"/exec/{exec_id}/json").get("ExitCode")
+        if exit_code:
+            raise DockerExecError(container_name, command, exit_code)
+
+    def listNetworks(self) -> List[str]:
+        network_names = [network["Name"] for network in self.getJson("/networks")]
+        return network_names
+
+    def createNetwork(self, network_name: str):
+        self.request("POST", "/networks/create", body={"Name": network_name})
+
+    def connectNetwork(self, network_name: str, container_name: str, alias: str = None):
+        endpoint_config = {"Aliases": [alias]} if alias else {}
+        self.request(
+            "POST",
+            f"/networks/{network_name}/connect",
+            body={"Container": container_name, "EndpointConfig": endpoint_config},
+        )
@@ -0,0 +1,218 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from mwdocker.docker_backend import DockerBackend, EventStream
+
+
+class DockerEventWaiter:
+    """
+    waits for container state changes by subscribing once to the
+    docker events stream instead of polling each container
+
+    waiters expect a state by container name and get their future
+    resolved by the start, die and health_status events
+    """
+
+    # the events of interest and the state they signal
+    actions = {
+        "start": "running",
+        "die": "stopped",
+        "stop": "stopped",
+        "health_status: healthy": "healthy",
+    }
+
+    # the process wide active waiter
+    _active = None
+    _active_lock = threading.Lock()
+
+    def __init__(self, backend: DockerBackend = None, labels: Dict[str, str] = None):
+        """
+        constructor
+
+        Args:
+            backend(DockerBackend): the backend to use - the process wide one if None
+            labels(dict): the labels of the containers to watch e.g. of a cluster
+        """
+        self.backend = backend or DockerBackend.getBackend()
+        self.labels = labels or {}
+        self.lock = threading.Lock()
+        self.futures: Dict[Tuple[str, str], List[Future]] = {}
+        self.event_stream: Optional[EventStream] = None
+        self.thread = None
+        self.alive = False
+
+    def getFilters(self) -> Dict[str, List[str]]:
+        """
+        get the filters for the events stream
+        """
+        filters = {
+            "type": ["container"],
+            "event": ["start", "die", "stop", "health_status"],
+        }
+        label_filters = DockerBackend.getLabelFilters(self.labels)
+        if label_filters:
+            filters["label"] = label_filters
+        return filters
+
+    def start(self) -> "DockerEventWaiter":
+        """
+        subscribe to the events stream and dispatch the events in the background
+        """
+        self.event_stream = self.backend.openEvents(self.getFilters())
+        self.alive = True
+        self.thread = threading.Thread(
+            target=self.run, name="docker-events", daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def run(self):
+        """
+        dispatch the events of the stream until it ends
+        """
+        try:
+            for event in self.event_stream:
+                self.dispatch(event)
+        finally:
+            self.alive = False
+            self.failPending("docker events stream ended")
+
+    def dispatch(self, event: dict):
+        """
+        resolve the futures waiting for the given event
+
+        Args:
+            event(dict): the Engine API style event
+        """
+        state = self.actions.get(event.get("Action"))
+        if state is None:
+            return
+        attributes = event.get("Actor", {}).get("Attributes", {})
+        name = attributes.get("name")
+        with self.lock:
+            futures = self.futures.pop((name, state), [])
+        for future in futures:
+            if not future.done():
+                future.set_result(event)
+
+    def failPending(self, reason: str):
+        """
+        fail all pending futures so that their waiters fall back to polling
+        """
+        with self.lock:
+            futures = [future for fl in self.futures.values() for future in fl]
+            self.futures = {}
+        for future in futures:
+            if not future.done():
+                future.set_exception(RuntimeError(reason))
+
+    def covers(self, container) -> bool:
+        """
+        check whether the events of the given container are received
+
+        Args:
+            container: the container to check
+
+        Returns:
+            bool: True if the stream is alive and the container has my labels
+        """
+        if not self.alive:
+            return False
+        container_labels = container.config.labels or {}
+        for key, value in self.labels.items():
+            if key not in container_labels:
+                return False
+            if value is not None and container_labels[key] != value:
+                return False
+        return True
+
+    def expect(self, name: str, state: str) -> Future:
+        """
+        expect the given state of the given container
+
+        Args:
+            name(str): the name of the container
+            state(str): running, stopped or healthy
+
+        Returns:
+            Future: resolved with the event signaling the state
+        """
+        future = Future()
+        with self.lock:
+            self.futures.setdefault((name, state), []).append(future)
+        return future
+
+    def discard(self, name: str, state: str, future: Future):
+        """
+        discard the given future that is no longer needed
+        """
+        with self.lock:
+            futures = self.futures.get((name, state), [])
+            if future in futures:
+                futures.remove(future)
+            if not futures:
+                self.futures.pop((name, state), None)
+
+    def close(self):
+        """
+        stop listening to the events stream
+        """
+        self.alive = False
+        if self.event_stream is not None:
+            self.event_stream.close()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5.0)
+        self.failPending("docker event waiter closed")
+
+    @classmethod
+    def getActive(cls) -> Optional["DockerEventWaiter"]:
+        """
+        get the active process wide waiter
+
+        Returns:
+            DockerEventWaiter: the waiter or None if waits need to poll
+        """
+        with cls._active_lock:
+            waiter = cls._active
+        return waiter
+
+    @classmethod
+    def activate(
+        cls, labels: Dict[str, str] = None, backend: DockerBackend = None
+    ) -> Optional["DockerEventWaiter"]:
+        """
+        start and activate a process wide waiter for the given labels
+
+        Args:
+            labels(dict): the labels of the containers to watch
+            backend(DockerBackend): the backend to use - the process wide one if None
+
+        Returns:
+            DockerEventWaiter: the waiter or None if the events stream is not available
+        """
+        cls.deactivate()
+        try:
+            waiter = cls(backend=backend, labels=labels).start()
+        except Exception:
+            waiter = None
+        with cls._active_lock:
+            cls._active = waiter
+        return waiter
+
+    @classmethod
+    def deactivate(cls):
+        """
+        stop the active process wide waiter
+        """
+        with cls._active_lock:
+            waiter = cls._active
+            cls._active = None
+        if waiter is not None:
+            waiter.close()
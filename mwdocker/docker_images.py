@@ -0,0 +1,311 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import glob
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+
+@dataclass
+class ImageBuild:
+    """
+    the result of building a docker image
+    """
+
+    tag: str
+    docker_path: str
+    built: bool = False
+    duration: float = 0.0
+
+
+@dataclass
+class ImagePull:
+    """
+    the result of prefetching a docker image
+    """
+
+    image: str
+    pulled: bool = False
+    duration: float = 0.0
+    error: Optional[Exception] = None
+
+
+class DockerImagePrefetcher:
+    """
+    pulls docker images in the background so that later
+    phases only need to wait for the images they use
+    """
+
+    def __init__(self, max_workers: int = 4, verbose: bool = True):
+        """
+        constructor
+
+        Args:
+            max_workers(int): the maximum number of concurrent pulls
+            verbose(bool): if True show progress messages
+        """
+        self.verbose = verbose
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefetch"
+        )
+        self.lock = threading.Lock()
+        self.pulls: Dict[str, Future] = {}
+
+    def prefetch(self, images: Iterable[str]) -> Dict[str, Future]:
+        """
+        start pulling the given images in the background
+        images that are already being pulled are not pulled again
+
+        Args:
+            images: the names of the images to pull
+
+        Returns:
+            dict: the futures of the pulls by image name
+        """
+        futures = {}
+        with self.lock:
+            for image in images:
+                if image not in self.pulls:
+                    self.pulls[image] = self.executor.submit(self.pull, image)
+                futures[image] = self.pulls[image]
+        return futures
+
+    def pull(self, image: str) -> ImagePull:
+        """
+        pull the given image if it is not available locally
+
+        Args:
+            image(str): the name of the image
+
+        Returns:
+            ImagePull: the pull result - failures are recorded and not raised
+        """
+        from python_on_whales import docker
+
+        image_pull = ImagePull(image=image)
+        start_time = time.monotonic()
+        try:
+            if not docker.image.exists(image):
+                docker.image.pull(image, quiet=True)
+                image_pull.pulled = True
+        except Exception as ex:
+            image_pull.error = ex
+        image_pull.duration = time.monotonic() - start_time
+        if self.verbose and image_pull.pulled:
+            print(f"image {image} pulled in {image_pull.duration:.1f}s")
+        return image_pull
+
+    def wait(self, images: Iterable[str], timeout: float = None) -> List[ImagePull]:
+        """
+        wait for the prefetching of the given images
+        images that have not been prefetched are not waited for
+
+        Args:
+            images: the names of the images to wait for
+            timeout(float): the maximum time to wait for each image
+
+        Returns:
+            list: the pull results of the prefetched images
+        """
+        image_pulls = []
+        for image in images:
+            with self.lock:
+                future = self.pulls.get(image)
+            if future is not None:
+                image_pull = future.result(timeout=timeout)
+                if image_pull.error is not None and self.verbose:
+                    print(f"warning: prefetching {image} failed: {image_pull.error}")
+                image_pulls.append(image_pull)
+        return image_pulls
+
+    def close(self):
+        """
+        stop prefetching - pulls that have not been started are cancelled
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class DockerImageBuilder:
+    """
+    builds the docker images of docker applications
+    only once per content hash of the build inputs
+    """
+
+    def __init__(self, verbose: bool = True, debug: bool = False):
+        """
+        constructor
+
+        Args:
+            verbose(bool): if True show progress messages
+            debug(bool): if True show debug information
+        """
+        self.verbose = verbose
+        self.debug = debug
+        self.lock = threading.Lock()
+        self.builds: Dict[str, Future] = {}
+        # the tags whose cached build was forced
+        self.forced: Set[str] = set()
+        # optional prefetcher for the base images
+        self.prefetcher: Optional[DockerImagePrefetcher] = None
+
+    @classmethod
+    def getBaseImages(cls, dockerfile_content: str) -> List[str]:
+        """
+        get the base images of the FROM instructions of the given Dockerfile
+
+        Args:
+            dockerfile_content(str): the content of the Dockerfile
+
+        Returns:
+            list: the names of the base images
+        """
+        base_images = []
+        for line in dockerfile_content.splitlines():
+            parts = line.strip().split()
+            if len(parts) > 1 and parts[0].upper() == "FROM":
+                args = [part for part in parts[1:] if not part.startswith("--")]
+                base_images.append(args[0])
+        return base_images
+
+    @classmethod
+    def getBuildInputs(cls, dockerfile_content: str) -> List[str]:
+        """
+        get the sources of the COPY and ADD instructions of the given Dockerfile
+
+        Args:
+            dockerfile_content(str): the content of the Dockerfile
+
+        Returns:
+            list: the source paths relative to the build context
+        """
+        sources = []
+        for line in dockerfile_content.splitlines():
+            parts = line.strip().split()
+            if len(parts) > 2 and parts[0].upper() in ["COPY", "ADD"]:
+                args = [part for part in parts[1:] if not part.startswith("--")]
+                # the last argument is the destination
+                sources.extend(args[:-1])
+        return sources
+
+    @classmethod
+    def getImageHash(cls, docker_path: str, dockerfile: str = "Dockerfile") -> str:
+        """
+        get the content hash of the build inputs in the given docker path
+        comments and blank lines of the Dockerfile are ignored since they
+        e.g. contain the generation timestamp but do not change the image
+
+        Args:
+            docker_path(str): the build context directory
+            dockerfile(str): the name of the Dockerfile
+
+        Returns:
+            str: the sha256 hex digest of the build inputs
+        """
+        sha = hashlib.sha256()
+        with open(os.path.join(docker_path, dockerfile), "r") as dockerfile_file:
+            dockerfile_content = dockerfile_file.read()
+        for line in dockerfile_content.splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                sha.update(line.encode("utf-8"))
+                sha.update(b"\n")
+        for source in cls.getBuildInputs(dockerfile_content):
+            paths = sorted(glob.glob(os.path.join(docker_path, source)))
+            for path in paths:
+                file_paths = [path]
+                if os.path.isdir(path):
+                    file_paths = sorted(
+                        os.path.join(root, file_name)
+                        for root, _dirs, file_names in os.walk(path)
+                        for file_name in file_names
+                    )
+                for file_path in file_paths:
+                    sha.update(os.path.relpath(file_path, docker_path).encode("utf-8"))
+                    with open(file_path, "rb") as input_file:
+                        sha.update(input_file.read())
+        image_hash = sha.hexdigest()
+        return image_hash
+
+    def build(self, tag: str, docker_path: str, force: bool = False) -> ImageBuild:
+        """
+        build the image with the given tag from the given docker path
+        unless it has already been built by this builder or
+        exists and force is not set
+
+        concurrent calls for the same tag wait for a single build -
+        a failed build is not cached so that a later call may retry it
+        and a forced call replaces a cached build that was not forced
+
+        Args:
+            tag(str): the tag of the image
+            docker_path(str): the build context directory
+            force(bool): if True build even if the image already exists
+
+        Returns:
+            ImageBuild: the build result - built is False if an existing image was reused
+        """
+        with self.lock:
+            future = self.builds.get(tag)
+            is_builder = future is None or (force and tag not in self.forced)
+            if is_builder:
+                future = Future()
+                self.builds[tag] = future
+                if force:
+                    self.forced.add(tag)
+                else:
+                    self.forced.discard(tag)
+        if is_builder:
+            try:
+                image_build = self.doBuild(tag, docker_path, force)
+                future.set_result(image_build)
+            except Exception as ex:
+                with self.lock:
+                    if self.builds.get(tag) is future:
+                        del self.builds[tag]
+                        self.forced.discard(tag)
+                future.set_exception(ex)
+        image_build = future.result()
+        if not is_builder:
+            image_build = ImageBuild(tag=tag, docker_path=docker_path)
+        return image_build
+
+    def doBuild(self, tag: str, docker_path: str, force: bool) -> ImageBuild:
+        """
+        build the image with the given tag
+
+        Args:
+            tag(str): the tag of the image
+            docker_path(str): the build context directory
+            force(bool): if True build even if the image already exists
+
+        Returns:
+            ImageBuild: the build result
+        """
+        from python_on_whales import docker
+
+        image_build = ImageBuild(tag=tag, docker_path=docker_path)
+        if not force and docker.image.exists(tag):
+            if self.verbose:
+                print(f"reusing image {tag}")
+            return image_build
+        if self.prefetcher is not None:
+            with open(os.path.join(docker_path, "Dockerfile"), "r") as dockerfile:
+                base_images = self.getBaseImages(dockerfile.read())
+            self.prefetcher.wait(base_images)
+        if self.verbose:
+            print(f"building image {tag} from {docker_path} ...")
+        start_time = time.monotonic()
+        docker.build(docker_path, tags=[tag])
+        image_build.built = True
+        image_build.duration = time.monotonic() - start_time
+        if self.verbose:
+            print(f"image {tag} built in {image_build.duration:.1f}s")
+        return image_build
@@ -4,28 +4,96 @@ Created on 2025-08-21
 @author: wf
 """
 
-from typing import Dict
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
 
-from python_on_whales import docker
-from python_on_whales.components.container.cli_wrapper import Container
+from mwdocker.docker_backend import DockerBackend
+
+if TYPE_CHECKING:
+    from python_on_whales.components.container.cli_wrapper import Container
 
 
 class DockerMap:
     """
     helper class to convert lists of docker elements to maps for improved
     lookup functionality
+
+    keeps a thread safe snapshot of the running containers labeled by
+    pymediawikidocker that is refreshed at most every ttl seconds
     """
 
+    # the prefix of the labels of the generated containers
+    label_prefix = "pymediawikidocker"
+    # the maximum age of the container snapshot in seconds
+    ttl = 5.0
+
     _container_map = None
+    _labels = None
+    _timestamp = 0.0
+    _lock = threading.RLock()
+
+    @classmethod
+    def getLabels(
+        cls, cluster: str = None, app: str = None, version: str = None
+    ) -> Dict[str, str]:
+        """
+        get the labels identifying the containers of the given cluster and app
+
+        Args:
+            cluster(str): the name of the cluster e.g. the container prefix
+            app(str): the name of the app e.g. the container base name
+            version(str): the MediaWiki version
+
+        Returns:
+            dict: the labels by key
+        """
+        labels = {}
+        for key, value in [("cluster", cluster), ("app", app), ("version", version)]:
+            if value is not None:
+                labels[f"{cls.label_prefix}.{key}"] = value
+        return labels
 
     @classmethod
     def getContainer(cls, container_name: str):
-        containerMap = DockerMap.getContainerMap()
-        if not container_name in containerMap:
+        """
+        get the container with the given name
+
+        Args:
+            container_name(str): the name of the container
+
+        Returns:
+            the container from the snapshot or by a targeted inspect
+
+        Raises:
+            ValueError: if there is no such container
+        """
+        container = cls.getContainerMap().get(container_name)
+        if container is None:
+            container = DockerBackend.getBackend().inspectContainer(container_name)
+        if container is None:
             raise ValueError(
                 f"container {container_name} is not a valid docker container"
             )
-        container = containerMap.get(container_name)
+        return container
+
+    @classmethod
+    def findRunningContainer(cls, container_name: str):
+        """
+        find the running container with the given name - containers
+        that are not in the labeled snapshot are inspected directly
+
+        Args:
+            container_name(str): the name of the container
+
+        Returns:
+            the container or None if it is not running
+        """
+        container = cls.getContainerMap().get(container_name)
+        if container is None:
+            container = DockerBackend.getBackend().inspectContainer(container_name)
+            if container is not None and not container.state.running:
+                container = None
         return container
 
     @classmethod
@@ -39,16 +107,48 @@ class DockerMap:
                 env_dict[key] = value
         return env_dict
 
+    @classmethod
+    def refresh(cls, labels: Optional[Dict[str, str]] = None) -> Dict[str, "Container"]:
+        """
+        refresh the snapshot e.g. once at the start of a cluster operation
+
+        Args:
+            labels(dict): the labels to filter by - by default all containers
+                with a pymediawikidocker app label
+
+        Returns:
+            dict: the containers by name
+        """
+        if labels is None:
+            labels = {f"{cls.label_prefix}.app": None}
+        container_map = {}
+        for container in DockerBackend.getBackend().listContainers(labels=labels):
+            container_map[container.name] = container
+        with cls._lock:
+            DockerMap._container_map = container_map
+            DockerMap._labels = labels
+            DockerMap._timestamp = time.monotonic()
+        return container_map
+
+    @classmethod
+    def invalidate(cls):
+        """
+        invalidate the snapshot e.g. after containers have been created or removed
+        """
+        with cls._lock:
+            DockerMap._container_map = None
+
     @staticmethod
-    def getContainerMap(force_refresh: bool = True) -> Dict[str, Container]:
+    def getContainerMap(force_refresh: bool = False) -> Dict[str, "Container"]:
         """
-        get a cached map/dict of containers by container name
+        get a cached map/dict of the labeled running containers by container name
 
         Args:
             force_refresh: if True, refresh from docker instead of using cache
         """
-        if DockerMap._container_map is None or force_refresh:
-            DockerMap._container_map = {}
-            for container in docker.container.list():
-                DockerMap._container_map[container.name] = container
-        return DockerMap._container_map
+        with DockerMap._lock:
+            age = time.monotonic() - DockerMap._timestamp
+            if DockerMap._container_map is None or force_refresh or age > DockerMap.ttl:
+                DockerMap.refresh(DockerMap._labels)
+            container_map = DockerMap._container_map
+        return container_map
@@ -0,0 +1,212 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import datetime
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class LogLine:
+    """
+    a line of output of a command executed in a container
+    """
+
+    app: str
+    stream: str
+    timestamp: float
+    text: str
+
+    def as_text(self) -> str:
+        """
+        get the line as written to the log file
+        """
+        isodate = datetime.datetime.fromtimestamp(self.timestamp).isoformat(
+            timespec="milliseconds"
+        )
+        return f"{isodate} {self.stream} {self.text}"
+
+
+class ExecError(Exception):
+    """
+    a command executed in a container failed
+    """
+
+    def __init__(self, message: str, tail: List[str] = None):
+        """
+        constructor
+
+        Args:
+            message(str): the error message
+            tail(list): the last lines of the output of the command
+        """
+        self.tail = tail or []
+        if self.tail:
+            tail_text = "\n".join(self.tail)
+            message = f"{message}\nlast {len(self.tail)} lines of output:\n{tail_text}"
+        super().__init__(message)
+
+
+class ExecLog:
+    """
+    bounded capture of the output of the commands executed for an app
+
+    all lines are appended to the log file of the app, only the last
+    lines are kept in memory and the console only shows a progress line
+    every console_interval seconds
+    """
+
+    def __init__(
+        self,
+        app: str,
+        log_path: str = None,
+        max_lines: int = 200,
+        console_interval: Optional[float] = 2.0,
+        listener: Callable[[LogLine], None] = None,
+    ):
+        """
+        constructor
+
+        Args:
+            app(str): the name of the app e.g. the container base name
+            log_path(str): the path of the log file - no file if None
+            max_lines(int): the number of lines to keep in memory
+            console_interval(float): the minimum number of seconds between
+                progress lines on the console - 0 for all lines, None for no console output
+            listener(Callable): optional callback for each line record - see addListener
+        """
+        self.app = app
+        self.log_path = log_path
+        self.lines = deque(maxlen=max_lines)
+        self.console_interval = console_interval
+        self.listeners: List[Callable[[LogLine], None]] = []
+        if listener is not None:
+            self.listeners.append(listener)
+        self.line_count = 0
+        self.lock = threading.Lock()
+        # partial lines by stream
+        self.partial: Dict[str, str] = {}
+        self.last_console = 0.0
+        self.log_file = None
+        if log_path:
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            self.log_file = open(log_path, "a", encoding="utf-8")
+
+    def start(self, command_line: str):
+        """
+        mark the start of the given command in the log file
+        """
+        self.flush()
+        if self.log_file is not None:
+            isodate = datetime.datetime.now().isoformat(timespec="milliseconds")
+            self.log_file.write(f"# {isodate} {self.app}: {command_line}\n")
+            self.log_file.flush()
+
+    def feed(self, stream: str, chunk: str) -> List[LogLine]:
+        """
+        feed the given chunk of streamed output
+
+        Args:
+            stream(str): stdout or stderr
+            chunk(str): the decoded chunk - may contain partial lines
+
+        Returns:
+            list: the complete line records of the chunk
+        """
+        text = self.partial.pop(stream, "") + chunk
+        parts = text.split("\n")
+        if parts[-1]:
+            self.partial[stream] = parts[-1]
+        log_lines = [self.add(stream, part.rstrip("\r")) for part in parts[:-1]]
+        return log_lines
+
+    def flush(self) -> List[LogLine]:
+        """
+        add the pending partial lines
+        """
+        partial = self.partial
+        self.partial = {}
+        log_lines = [self.add(stream, text) for stream, text in partial.items()]
+        return log_lines
+
+    def add(self, stream: str, text: str) -> LogLine:
+        """
+        add a line of output
+
+        Args:
+            stream(str): stdout or stderr
+            text(str): the text of the line
+
+        Returns:
+            LogLine: the line record
+        """
+        log_line = LogLine(
+            app=self.app, stream=stream, timestamp=time.time(), text=text
+        )
+        with self.lock:
+            self.lines.append(log_line)
+            self.line_count += 1
+            if self.log_file is not None:
+                self.log_file.write(f"{log_line.as_text()}\n")
+        self.showProgress(log_line)
+        for listener in list(self.listeners):
+            listener(log_line)
+        return log_line
+
+    def addListener(self, listener: Callable[[LogLine], None]):
+        """
+        add a callback for each line record
+        """
+        self.listeners.append(listener)
+
+    def removeListener(self, listener: Callable[[LogLine], None]):
+        """
+        remove the given callback
+        """
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def showProgress(self, log_line: LogLine):
+        """
+        show the given line on the console unless a line has been shown recently
+        """
+        if self.console_interval is None or not log_line.text.strip():
+            return
+        now = log_line.timestamp
+        if now - self.last_console >= self.console_interval:
+            self.last_console = now
+            target_stream = sys.stderr if log_line.stream == "stderr" else sys.stdout
+            print(f"{self.app}: {log_line.text}", file=target_stream)
+
+    def tail(self, count: int = None) -> List[str]:
+        """
+        get the last lines of output
+
+        Args:
+            count(int): the number of lines - all kept lines if None
+
+        Returns:
+            list: the text of the lines
+        """
+        with self.lock:
+            lines = list(self.lines)
+        if count is not None:
+            lines = lines[-count:] if count > 0 else []
+        return [log_line.text for log_line in lines]
+
+    def close(self):
+        """
+        close the log file
+        """
+        self.flush()
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
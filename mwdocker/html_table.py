@@ -12,16 +12,17 @@ class HtmlTables(WebScrape):
     HtmlTables extractor
     """
 
-    def __init__(self, url: str, debug=False, showHtml=False):
+    def __init__(self, url: str, debug=False, showHtml=False, timeout: float = None):
         """
         Constructor
 
         url(str): the url to read the tables from
         debug(bool): if True switch on debugging
         showHtml(bool): if True show the HTML retrieved
+        timeout(float): the timeout in seconds for reading the url - None for no timeout
         """
         super().__init__(debug, showHtml)
-        self.soup = super().getSoup(url, showHtml)
+        self.soup = super().getSoup(url, showHtml, timeout=timeout)
 
     def get_tables(self, header_tag: str = None) -> dict:
         """
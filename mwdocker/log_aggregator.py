@@ -0,0 +1,238 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import codecs
+import gzip
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from logging.handlers import RotatingFileHandler
+from typing import Callable, Dict, List, Optional
+
+from mwdocker.docker_backend import DockerBackend, LogStream
+
+
+@dataclass
+class LogSource:
+    """
+    a container whose log is followed
+    """
+
+    app: str
+    kind: str
+    container_name: str
+    log_path: str
+
+
+class LogAggregator:
+    """
+    follows the logs of the mw and db containers of all apps concurrently
+    into rotating, gzip compressed log files per app
+
+    only new lines are read so that long running containers with
+    huge logs are never loaded as a whole
+    """
+
+    def __init__(
+        self,
+        backend: DockerBackend = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        listener: Callable[[LogSource, str, str], None] = None,
+    ):
+        """
+        constructor
+
+        Args:
+            backend(DockerBackend): the backend to use - the process wide one if None
+            max_bytes(int): the size at which a log file is rotated
+            backup_count(int): the number of compressed rotated files to keep
+            listener(Callable): optional callback with source, stream type and line
+        """
+        self.backend = backend or DockerBackend.getBackend()
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.listener = listener
+        self.sources: List[LogSource] = []
+        self.handlers: Dict[str, RotatingFileHandler] = {}
+        self.streams: List[LogStream] = []
+        self.threads: List[threading.Thread] = []
+        self.lock = threading.Lock()
+        self.stopped = False
+
+    @staticmethod
+    def namer(name: str) -> str:
+        """
+        name the rotated files e.g. containers.log.1.gz
+        """
+        return f"{name}.gz"
+
+    @staticmethod
+    def rotator(source: str, dest: str):
+        """
+        compress the rotated log file
+        """
+        with open(source, "rb") as source_file, gzip.open(dest, "wb") as dest_file:
+            shutil.copyfileobj(source_file, dest_file)
+        os.remove(source)
+
+    def getHandler(self, log_path: str) -> RotatingFileHandler:
+        """
+        get the shared rotating handler of the given log file
+        """
+        with self.lock:
+            handler = self.handlers.get(log_path)
+            if handler is None:
+                os.makedirs(os.path.dirname(log_path), exist_ok=True)
+                handler = RotatingFileHandler(
+                    log_path,
+                    maxBytes=self.max_bytes,
+                    backupCount=self.backup_count,
+                    encoding="utf-8",
+                )
+                handler.namer = self.namer
+                handler.rotator = self.rotator
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                self.handlers[log_path] = handler
+        return handler
+
+    def add(self, app: str, kind: str, container_name: str, log_path: str):
+        """
+        add a container to follow
+
+        Args:
+            app(str): the name of the app e.g. the container base name
+            kind(str): the kind of container e.g. mw or db
+            container_name(str): the name of the container
+            log_path(str): the path of the log file of the app
+        """
+        self.sources.append(LogSource(app, kind, container_name, log_path))
+
+    def addApps(self, apps) -> "LogAggregator":
+        """
+        add the mw and db containers of the given DockerApplications
+
+        Args:
+            apps: the DockerApplications
+
+        Returns:
+            LogAggregator: self for fluid syntax
+        """
+        for mwApp in apps:
+            log_path = f"{mwApp.docker_path}/logs/containers.log"
+            name = mwApp.config.container_base_name
+            self.add(name, "mw", mwApp.getContainerName("mw", "-"), log_path)
+            if not mwApp.config.has_external_db:
+                self.add(name, "db", mwApp.getContainerName("db", "-"), log_path)
+        return self
+
+    def follow(self, source: LogSource, since: Optional[float]):
+        """
+        follow the log of the given source until the stream ends
+        """
+        handler = self.getHandler(source.log_path)
+        try:
+            log_stream = self.backend.followLogs(source.container_name, since=since)
+        except Exception as ex:
+            self.write(handler, source, "stderr", f"can not follow log: {ex}")
+            return
+        with self.lock:
+            self.streams.append(log_stream)
+            stopped = self.stopped
+        if stopped:
+            # stop has been called while the stream was opened
+            log_stream.close()
+            return
+        decoders = {}
+        partial = {}
+        for stream_type, chunk in log_stream:
+            if stream_type not in decoders:
+                decoders[stream_type] = codecs.getincrementaldecoder("utf-8")(
+                    errors="replace"
+                )
+            text = partial.pop(stream_type, "") + decoders[stream_type].decode(chunk)
+            lines = text.split("\n")
+            if lines[-1]:
+                partial[stream_type] = lines[-1]
+            for line in lines[:-1]:
+                self.write(handler, source, stream_type, line.rstrip("\r"))
+        for stream_type, line in partial.items():
+            self.write(handler, source, stream_type, line)
+
+    def write(
+        self,
+        handler: RotatingFileHandler,
+        source: LogSource,
+        stream_type: str,
+        line: str,
+    ):
+        """
+        write a line of the given source to the log file of its app
+        """
+        if self.stopped:
+            return
+        msg = f"{source.kind} {stream_type} {line}"
+        record = logging.LogRecord(
+            source.app, logging.INFO, source.log_path, 0, msg, None, None
+        )
+        handler.handle(record)
+        if self.listener is not None:
+            self.listener(source, stream_type, line)
+
+    def start(self, since: float = None) -> "LogAggregator":
+        """
+        start following all sources concurrently
+
+        Args:
+            since(float): start with the lines since the given unix timestamp - only new lines if None
+
+        Returns:
+            LogAggregator: self for fluid syntax
+        """
+        if since is None:
+            since = time.time()
+        for source in self.sources:
+            thread = threading.Thread(
+                target=self.follow,
+                args=(source, since),
+                name=f"logs-{source.container_name}",
+                daemon=True,
+            )
+            self.threads.append(thread)
+            thread.start()
+        return self
+
+    def wait(self, timeout: float = None):
+        """
+        wait until all followed streams have ended e.g. since the containers stopped
+
+        Args:
+            timeout(float): the maximum number of seconds to wait - forever if None
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self.threads:
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+
+    def stop(self):
+        """
+        stop following and close the log files
+        """
+        with self.lock:
+            self.stopped = True
+            streams = list(self.streams)
+        for log_stream in streams:
+            log_stream.close()
+        self.wait(timeout=2.0)
+        with self.lock:
+            for handler in self.handlers.values():
+                handler.close()
+            self.handlers = {}
@@ -0,0 +1,243 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+
+class GenerationManifest:
+    """
+    the input and output hashes of the files generated for a docker application
+    together with the secrets generated for it
+
+    allows to skip rendering templates whose inputs did not change
+    and to keep secrets and timestamps stable across runs
+    """
+
+    # configuration fields that do not influence the generated files
+    volatile_fields = ["forceRebuild", "verbose", "debug"]
+    # process wide cache of the templates referenced by a template source
+    references: Dict[Tuple[str, str], List[str]] = {}
+    references_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        """
+        constructor
+
+        Args:
+            path(str): the path of the manifest json file
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.files: Dict[str, dict] = {}
+        self.secrets: Dict[str, str] = {}
+        self.load()
+
+    def load(self):
+        """
+        load the manifest if it exists
+        """
+        if os.path.isfile(self.path):
+            with open(self.path, "r") as json_file:
+                manifest = json.load(json_file)
+            self.files = manifest.get("files", {})
+            self.secrets = manifest.get("secrets", {})
+
+    def save(self):
+        """
+        save the manifest - readable by the owner only since it contains the secrets
+        """
+        with self.lock:
+            manifest = {"files": self.files, "secrets": self.secrets}
+            json_str = json.dumps(manifest, indent=2, sort_keys=True)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        # the mode of os.open only applies to new files
+        os.chmod(self.path, 0o600)
+        with os.fdopen(fd, "w") as json_file:
+            json_file.write(json_str)
+
+    @classmethod
+    def hash(cls, content: Union[str, bytes]) -> str:
+        """
+        get the sha256 hex digest of the given content
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        content_hash = hashlib.sha256(content).hexdigest()
+        return content_hash
+
+    @classmethod
+    def hashFile(cls, path: str) -> str:
+        """
+        get the sha256 hex digest of the content of the given file
+        """
+        with open(path, "rb") as hash_file:
+            file_hash = cls.hash(hash_file.read())
+        return file_hash
+
+    @classmethod
+    def getTemplateSources(
+        cls, env: "Environment", template_name: str
+    ) -> Dict[str, str]:
+        """
+        get the sources of the given template and all templates it references
+
+        Args:
+            env(Environment): the Jinja2 environment
+            template_name(str): the name of the template
+
+        Returns:
+            dict: the template sources by template name
+        """
+        sources = {}
+        todo = [template_name]
+        while todo:
+            name = todo.pop()
+            if name in sources:
+                continue
+            source, _filename, _uptodate = env.loader.get_source(env, name)
+            sources[name] = source
+            todo.extend(cls.getReferencedTemplates(env, name, source))
+        return sources
+
+    @classmethod
+    def getReferencedTemplates(
+        cls, env: "Environment", template_name: str, source: str
+    ) -> List[str]:
+        """
+        get the names of the templates referenced by the given template source
+        the result is cached since parsing e.g. the large SQL templates is expensive
+
+        Args:
+            env(Environment): the Jinja2 environment
+            template_name(str): the name of the template
+            source(str): the source of the template
+
+        Returns:
+            list: the names of the referenced templates
+        """
+        from jinja2 import meta
+
+        key = (template_name, cls.hash(source))
+        with cls.references_lock:
+            referenced = cls.references.get(key)
+        if referenced is None:
+            referenced = [
+                name
+                for name in meta.find_referenced_templates(env.parse(source))
+                if name is not None
+            ]
+            with cls.references_lock:
+                cls.references[key] = referenced
+        return referenced
+
+    @classmethod
+    def getInputHash(cls, env: "Environment", template_name: str, params: dict) -> str:
+        """
+        get the hash of the inputs for rendering the given template
+
+        Args:
+            env(Environment): the Jinja2 environment
+            template_name(str): the name of the template
+            params(dict): the template parameters
+
+        Returns:
+            str: the sha256 hex digest of the template sources and parameters
+        """
+        sources = cls.getTemplateSources(env, template_name)
+        stable_params = {}
+        for key, value in params.items():
+            if key == "config":
+                value = {
+                    field_name: field_value
+                    for field_name, field_value in value.as_dict().items()
+                    if field_name not in cls.volatile_fields
+                }
+            stable_params[key] = value
+        inputs = json.dumps(
+            {"sources": sources, "params": stable_params}, sort_keys=True, default=repr
+        )
+        input_hash = cls.hash(inputs)
+        return input_hash
+
+    def getSecret(self, name: str, create: Callable[[], str]) -> str:
+        """
+        get the secret with the given name - creating it on first use
+
+        Args:
+            name(str): the name of the secret
+            create(Callable): the function to create a new secret
+
+        Returns:
+            str: the secret
+        """
+        with self.lock:
+            if name not in self.secrets:
+                self.secrets[name] = create()
+            secret = self.secrets[name]
+        return secret
+
+    def isUpToDate(self, target_name: str, input_hash: str, target_path: str) -> bool:
+        """
+        check whether the given target has been generated from the given inputs
+        and has not been modified since
+
+        Args:
+            target_name(str): the name of the target in the manifest
+            input_hash(str): the hash of the current inputs
+            target_path(str): the path of the generated file
+
+        Returns:
+            bool: True if the target does not need to be rendered again
+        """
+        with self.lock:
+            entry = self.files.get(target_name)
+        if entry is None or entry.get("input_hash") != input_hash:
+            return False
+        if not os.path.isfile(target_path):
+            return False
+        output_hash = self.hashFile(target_path)
+        up_to_date = output_hash == entry.get("output_hash")
+        return up_to_date
+
+    def getTimestamp(self, target_name: str) -> Optional[str]:
+        """
+        get the timestamp of the last change of the given target
+        """
+        with self.lock:
+            entry = self.files.get(target_name, {})
+        timestamp = entry.get("timestamp")
+        return timestamp
+
+    def update(
+        self, target_name: str, input_hash: str, output_hash: str, timestamp: str = None
+    ):
+        """
+        record the generation of the given target
+
+        Args:
+            target_name(str): the name of the target in the manifest
+            input_hash(str): the hash of the inputs
+            output_hash(str): the hash of the generated content
+            timestamp(str): the timestamp of the generation - now if None
+        """
+        if timestamp is None:
+            timestamp = datetime.datetime.now().isoformat()
+        entry = {
+            "input_hash": input_hash,
+            "output_hash": output_hash,
+            "timestamp": timestamp,
+        }
+        with self.lock:
+            self.files[target_name] = entry
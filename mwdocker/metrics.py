@@ -0,0 +1,195 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Tuple
+
+
+@dataclass
+class PhaseTiming:
+    """
+    the timing of a single phase of a run e.g. a generate call of an app
+    """
+
+    phase: str
+    app: str
+    version: str
+    # wall clock unix timestamp of the start
+    start: float
+    # monotonic duration in seconds
+    duration: float
+    ok: bool = True
+    detail: str = ""
+
+
+class RunMetrics:
+    """
+    thread safe collection of the per phase timings of a run
+    tagged by app and version
+    """
+
+    # the name of the OpenMetrics metric family
+    metric_name = "mwdocker_phase_seconds"
+
+    def __init__(self):
+        """
+        constructor
+        """
+        self.timings: List[PhaseTiming] = []
+        self.lock = threading.Lock()
+
+    def add(self, timing: PhaseTiming):
+        """
+        add the given timing
+        """
+        with self.lock:
+            self.timings.append(timing)
+
+    @contextmanager
+    def timed(
+        self, phase: str, app: str = "", version: str = "", detail: str = ""
+    ) -> Iterator[PhaseTiming]:
+        """
+        time the phase of the with block with a monotonic timer
+
+        Args:
+            phase(str): the name of the phase e.g. generate
+            app(str): the name of the app e.g. the container base name
+            version(str): the MediaWiki version of the app
+            detail(str): e.g. the template name or the command
+
+        Returns:
+            PhaseTiming: the timing - ok is False if the block raised an exception
+        """
+        timing = PhaseTiming(
+            phase=phase,
+            app=app,
+            version=version,
+            start=time.time(),
+            duration=0.0,
+            detail=detail,
+        )
+        start_time = time.monotonic()
+        try:
+            yield timing
+        except BaseException:
+            timing.ok = False
+            raise
+        finally:
+            timing.duration = time.monotonic() - start_time
+            self.add(timing)
+
+    def getTimings(self) -> List[PhaseTiming]:
+        """
+        get a copy of the timings
+        """
+        with self.lock:
+            timings = list(self.timings)
+        return timings
+
+    def summarize(self) -> Dict[Tuple[str, str, str], Dict[str, float]]:
+        """
+        summarize the timings by phase, app and version
+
+        Returns:
+            dict: count, sum, max and failures by (phase, app, version)
+        """
+        summary = {}
+        for timing in self.getTimings():
+            key = (timing.phase, timing.app, timing.version)
+            stats = summary.setdefault(
+                key, {"count": 0, "sum": 0.0, "max": 0.0, "failed": 0}
+            )
+            stats["count"] += 1
+            stats["sum"] += timing.duration
+            stats["max"] = max(stats["max"], timing.duration)
+            if not timing.ok:
+                stats["failed"] += 1
+        return summary
+
+    def as_json(self) -> str:
+        """
+        get all timings as JSON
+        """
+        records = [asdict(timing) for timing in self.getTimings()]
+        json_str = json.dumps({"timings": records}, indent=2)
+        return json_str
+
+    @classmethod
+    def escape(cls, value: str) -> str:
+        """
+        escape the given OpenMetrics label value
+        """
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def as_openmetrics(self) -> str:
+        """
+        get the timings as OpenMetrics text with a summary per phase, app and version
+        """
+        name = self.metric_name
+        lines = [
+            f"# TYPE {name} summary",
+            f"# UNIT {name} seconds",
+            f"# HELP {name} duration of the phases of a mwcluster run",
+        ]
+        for (phase, app, version), stats in sorted(self.summarize().items()):
+            labels = ",".join(
+                f'{key}="{self.escape(value)}"'
+                for key, value in [("phase", phase), ("app", app), ("version", version)]
+            )
+            lines.append(f"{name}_count{{{labels}}} {stats['count']}")
+            lines.append(f"{name}_sum{{{labels}}} {stats['sum']:.6f}")
+        lines.append("# EOF")
+        text = "\n".join(lines) + "\n"
+        return text
+
+    def save(self, path: str) -> str:
+        """
+        save the timings as JSON if the path ends with .json else as OpenMetrics text
+
+        Args:
+            path(str): the path of the file
+
+        Returns:
+            str: the path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.endswith(".json"):
+            text = self.as_json()
+        else:
+            text = self.as_openmetrics()
+        with open(path, "w") as metrics_file:
+            metrics_file.write(text)
+        return path
+
+    def showSummary(self):
+        """
+        show a summary table of the timings
+        """
+        from tabulate import tabulate
+
+        rows = []
+        for (phase, app, version), stats in self.summarize().items():
+            rows.append(
+                {
+                    "phase": phase,
+                    "app": app,
+                    "version": version,
+                    "count": stats["count"],
+                    "seconds": round(stats["sum"], 2),
+                    "max": round(stats["max"], 2),
+                    "failed": stats["failed"],
+                }
+            )
+        if rows:
+            print(tabulate(rows, headers="keys"))
@@ -4,12 +4,50 @@ Created on 2021-08-06
 """
 
 import dataclasses
+import json
+import os
+import re
 import sys
+import time
 from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set
 
 from mwdocker.config import MwClusterConfig
-from mwdocker.docker import DockerApplication
+from mwdocker.docker import DockerApplication, WikiCheck
+from mwdocker.docker_backend import DockerBackend
+from mwdocker.docker_images import DockerImageBuilder, DockerImagePrefetcher
+from mwdocker.docker_events import DockerEventWaiter
+from mwdocker.docker_map import DockerMap
+from mwdocker.log_aggregator import LogAggregator, LogSource
 from mwdocker.logger import Logger
+from mwdocker.metrics import PhaseTiming, RunMetrics
+from mwdocker.perf_history import PerfHistory, RunProgress
+from mwdocker.reconcile import AppPlan, ChangeClass, Reconciler
+from mwdocker.state_store import AppState, StateStore
+
+if TYPE_CHECKING:
+    from python_on_whales import DockerClient
+
+
+@dataclass
+class AppResult:
+    """
+    the result of a cluster action for a single docker application
+    """
+
+    version: str
+    name: str
+    exitCode: int = 0
+    duration: float = 0.0
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        ok = self.exitCode == 0 and self.error is None
+        return ok
 
 
 class MediaWikiCluster(object):
@@ -34,6 +72,11 @@ class MediaWikiCluster(object):
     # 2025-12-18 Security and maintenance release: 1.39.16 / 1.43.6 / 1.44.3 / 1.45.1
     # 2025-12-18 1.39.17 is also out in docker images
 
+    # the maximum number of wikis to check concurrently unless parallel is higher
+    check_workers = 8
+    # the label docker compose sets to the project name of a container
+    compose_project_label = "com.docker.compose.project"
+
     def __init__(self, config: MwClusterConfig, args: Namespace = None):
         """
         Constructor
@@ -44,13 +87,22 @@ class MediaWikiCluster(object):
         self.config = config
         self.args = args
         self.apps = {}
+        # shared by all apps so that identical images are only built once
+        self.image_builder = DockerImageBuilder(
+            verbose=config.verbose, debug=config.debug
+        )
+        self.image_prefetcher = None
+        # the per phase timings of all apps
+        self.metrics = RunMetrics()
 
-    def createApps(self, withGenerate: bool = True) -> dict:
+    def createApps(self, withGenerate: bool = True, fromSaved: bool = False) -> dict:
         """
         create my apps
 
         Args:
             withGenerate(bool): if True generate the config files
+            fromSaved(bool): if True use the saved MwConfig.json of each app
+                without extension definitions e.g. for read only commands
 
         Returns:
             dict(str): a dict of apps by version
@@ -58,14 +110,296 @@ class MediaWikiCluster(object):
         exitCode = self.checkDocker()
         if exitCode > 0:
             raise ValueError("createApps needs docker command in PATH")
-        app_count = len(self.config.versions)
-        for i, version in enumerate(self.config.versions):
-            mwApp = self.getDockerApplication(i, app_count, version)
+        with self.metrics.timed("createApps"):
+            if withGenerate:
+                # pull the base images in the background while generating
+                self.prefetchImages()
+            # one labeled container snapshot for constructing all apps
+            self.refreshContainers()
+            app_count = len(self.config.versions)
+            for i, version in enumerate(self.config.versions):
+                mwApp = self.getDockerApplication(i, app_count, version, fromSaved)
+                self.apps[version] = mwApp
             if withGenerate:
-                mwApp.generateAll(overwrite=self.config.forceRebuild)
-            self.apps[version] = mwApp
+                self.adoptSecrets()
+                self.generateApps()
+                self.recordStates("generate")
+                if self.config.single_compose:
+                    self.generateCompose(overwrite=self.config.forceRebuild)
         return self.apps
 
+    def adoptSecrets(self):
+        """
+        keep the generated database secrets of the saved configurations
+        of my apps unless they have been given explicitly so that
+        regenerating does not lock the wikis out of their existing databases
+        """
+        explicit = self.getExplicitSecrets()
+        for mwApp in self.apps.values():
+            saved = Reconciler.loadSaved(mwApp)
+            if saved is not None:
+                Reconciler.adoptSecrets(mwApp.config, saved, explicit)
+
+    def refreshContainers(self) -> dict:
+        """
+        refresh the snapshot of the running containers of my cluster
+
+        Returns:
+            dict: the running containers by name
+        """
+        container_map = DockerMap.refresh(
+            DockerMap.getLabels(cluster=self.config.prefix)
+        )
+        return container_map
+
+    def getBaseImages(self) -> List[str]:
+        """
+        get the base images needed by my cluster configuration
+
+        Returns:
+            list: the names of the mediawiki and mariadb base images
+        """
+        base_images = [f"mediawiki:{version}" for version in self.config.versions]
+        if not self.config.has_external_db:
+            base_images.append(f"mariadb:{self.config.mariaDBVersion}")
+        return base_images
+
+    def prefetchImages(self):
+        """
+        start pulling my base images concurrently in the background
+        """
+        if self.image_prefetcher is None:
+            self.image_prefetcher = DockerImagePrefetcher(
+                max_workers=max(4, self.config.parallel), verbose=self.config.verbose
+            )
+            self.image_builder.prefetcher = self.image_prefetcher
+        self.image_prefetcher.prefetch(self.getBaseImages())
+
+    @property
+    def cluster_path(self) -> str:
+        """
+        the path of the cluster wide docker compose project
+        """
+        cluster_path = f"{self.config.docker_path}/{self.config.prefix}-cluster"
+        return cluster_path
+
+    @property
+    def cluster_project_name(self) -> str:
+        """
+        the name docker compose derives for the cluster project from the cluster path
+        """
+        project_name = os.path.basename(self.cluster_path).lower()
+        project_name = re.sub(r"[^a-z0-9_-]", "", project_name)
+        return project_name
+
+    def adoptContainers(self) -> List[str]:
+        """
+        stop and remove the containers of other compose projects e.g. the single
+        wiki projects whose names clash with the services of the cluster project -
+        the volumes keep their names so that the wikis keep their data
+
+        Returns:
+            list: the names of the removed containers
+
+        Raises:
+            ValueError: if a clashing container can not be removed
+        """
+        backend = DockerBackend.getBackend()
+        removed = []
+        for mwApp in self.apps.values():
+            kinds = ["mw"] if mwApp.config.has_external_db else ["db", "mw"]
+            for kind in kinds:
+                container_name = mwApp.getContainerName(kind, "-")
+                container = backend.inspectContainer(container_name)
+                if container is None:
+                    continue
+                labels = container.config.labels or {}
+                project_name = labels.get(self.compose_project_label)
+                if project_name == self.cluster_project_name:
+                    continue
+                if self.config.verbose:
+                    print(
+                        f"adopting container {container_name} of compose project {project_name} into {self.cluster_project_name}"
+                    )
+                try:
+                    container.stop()
+                    container.remove()
+                except Exception as ex:
+                    msg = f"container {container_name} of compose project {project_name} clashes with the cluster compose project {self.cluster_project_name} and can not be removed: {ex}"
+                    raise ValueError(msg) from ex
+                removed.append(container_name)
+        if removed:
+            DockerMap.invalidate()
+        return removed
+
+    def getComposeApps(self) -> List[dict]:
+        """
+        get the per app parameters for the cluster docker compose template
+
+        Returns:
+            list: a list of dicts with the compose parameters of each app
+        """
+        compose_apps = []
+        for mwApp in self.apps.values():
+            compose_app = mwApp.getComposeParams()
+            compose_app["config"] = mwApp.config
+            compose_app["has_external_db"] = mwApp.config.has_external_db
+            compose_app["project_name"] = mwApp.getComposeProjectName()
+            for key in ["mysql_data", "wiki_sites"]:
+                source = compose_app[key]
+                if compose_app["volume_type"] == "volume":
+                    # namespaced volume key
+                    source = f"{mwApp.config.container_base_name}-{source}"
+                compose_app[f"{key}_source"] = source
+            compose_apps.append(compose_app)
+        return compose_apps
+
+    def generateCompose(self, overwrite: bool = False) -> str:
+        """
+        generate a single docker compose project for all my apps
+
+        Args:
+            overwrite(bool): if True overwrite an existing docker-compose.yml
+
+        Returns:
+            str: the path of the generated docker-compose.yml
+        """
+        os.makedirs(self.cluster_path, exist_ok=True)
+        compose_path = f"{self.cluster_path}/docker-compose.yml"
+        # all apps share the same templates - use the first app for rendering
+        mwApp = next(iter(self.apps.values()))
+        mwApp.generate(
+            "mwClusterCompose.yml",
+            compose_path,
+            overwrite=overwrite,
+            apps=self.getComposeApps(),
+        )
+        mwApp.manifest.save()
+        return compose_path
+
+    def getComposeClient(self) -> "DockerClient":
+        """
+        get a docker client for the cluster wide docker compose project
+
+        Returns:
+            DockerClient: the docker client for the cluster docker-compose.yml
+        """
+        from python_on_whales import DockerClient
+
+        compose_client = DockerClient(
+            compose_files=[f"{self.cluster_path}/docker-compose.yml"],
+            compose_project_directory=self.cluster_path,
+        )
+        return compose_client
+
+    def upCompose(self, forceRebuild: bool = False):
+        """
+        bring up all my apps with a single docker compose call
+
+        Args:
+            forceRebuild(bool): if True remove existing containers and rebuild the images
+        """
+        if self.config.verbose:
+            print(
+                f"starting {len(self.apps)} docker applications in {self.cluster_path} ..."
+            )
+        # containers might have been created by the single wiki projects
+        self.adoptContainers()
+        if forceRebuild:
+            for mwApp in self.apps.values():
+                mwApp.removeContainers()
+        else:
+            # forced rebuilds are done by the build stage of start
+            self.buildImages()
+        if self.image_prefetcher is not None:
+            with self.metrics.timed("pull"):
+                self.image_prefetcher.wait(self.getBaseImages())
+        compose_client = self.getComposeClient()
+        with self.metrics.timed("compose_up", app=self.config.prefix):
+            compose_client.compose.up(detach=True, force_recreate=forceRebuild)
+        DockerMap.invalidate()
+
+    def buildImages(self, force: bool = False, max_workers: int = None) -> int:
+        """
+        build the images of my apps as one cluster build stage
+
+        each distinct content hash tagged image is built only once and
+        up to max_workers images are built concurrently so that buildkit
+        can work on several versions at the same time
+
+        Args:
+            force(bool): if True rebuild the images even if they exist
+            max_workers(int): the maximum number of concurrent builds - if None use config.parallel
+
+        Returns:
+            int: exitCode - 0 if ok 1 if any build failed
+        """
+        from tabulate import tabulate
+
+        if max_workers is None:
+            max_workers = self.config.parallel
+        max_workers = max(1, max_workers)
+        apps_by_tag = {}
+        for mwApp in self.apps.values():
+            tag = mwApp.getImageTag()
+            if tag is not None:
+                apps_by_tag.setdefault(tag, []).append(mwApp)
+
+        def build_tag(tag: str):
+            mwApp = apps_by_tag[tag][0]
+            start_time = time.monotonic()
+            try:
+                image_build = mwApp.buildImage(force=force)
+                return image_build, None
+            except Exception as ex:
+                return None, (ex, time.monotonic() - start_time)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            build_results = list(executor.map(build_tag, apps_by_tag.keys()))
+        exitCode = 0
+        rows = []
+        for tag, (image_build, failure) in zip(apps_by_tag.keys(), build_results):
+            names = [mwApp.config.container_base_name for mwApp in apps_by_tag[tag]]
+            row = {"image": tag, "apps": ",".join(names)}
+            if failure is not None:
+                ex, duration = failure
+                row["status"] = f"❌ {ex}"
+                row["seconds"] = round(duration, 1)
+                exitCode = 1
+            else:
+                row["status"] = "✅ built" if image_build.built else "✅ reused"
+                row["seconds"] = round(image_build.duration, 1)
+            rows.append(row)
+        if self.config.verbose and rows:
+            print(tabulate(rows, headers="keys"))
+        return exitCode
+
+    def generateApps(self, max_workers: int = None):
+        """
+        generate the config files of all my apps concurrently
+
+        a thread pool is used since the apps hold Jinja environments
+        and hooks that can not be handed over to other processes
+
+        Args:
+            max_workers(int): the maximum number of apps to generate concurrently
+            if None use the parallel setting or the number of cpus
+
+        Raises:
+            Exception: the first exception of an app for which the generation failed
+        """
+        if max_workers is None:
+            cpu_count = os.cpu_count() or 1
+            max_workers = max(self.config.parallel, min(len(self.apps), cpu_count))
+
+        def generate_app(mwApp: DockerApplication):
+            mwApp.generateAll(overwrite=self.config.forceRebuild)
+
+        results = self.runForApps(generate_app, max_workers=max_workers)
+        for result in results.values():
+            if result.error is not None:
+                raise result.error
+
     def checkDocker(self) -> int:
         """
         check the Docker environment
@@ -93,25 +427,267 @@ class MediaWikiCluster(object):
         if exitCode > 0:
             return exitCode
 
-        for version in self.config.versions:
+        if forceRebuild:
+            # build all images in one parallel stage before starting the apps
+            self.buildImages(force=True)
+        withUp = not self.config.single_compose
+
+        def start_app(mwApp: DockerApplication) -> int:
+            return mwApp.start(
+                forceRebuild=forceRebuild, withInitDB=withInitDB, withUp=withUp
+            )
+
+        # wait for the container states via the docker events stream
+        DockerEventWaiter.activate(DockerMap.getLabels(cluster=self.config.prefix))
+        try:
+            if not withUp:
+                self.upCompose(forceRebuild=forceRebuild)
+            results = self.runForApps(
+                start_app, max_workers=self.config.parallel, phase="start"
+            )
+        finally:
+            DockerEventWaiter.deactivate()
+        self.recordStates("start", results)
+        exitCode = self.reportResults("start", results)
+        return exitCode
+
+    def runForApps(
+        self,
+        action: Callable[[DockerApplication], Optional[int]],
+        max_workers: int = 1,
+        phase: str = None,
+    ) -> Dict[str, AppResult]:
+        """
+        run the given action for all my apps - in parallel if max_workers > 1
+
+        failures of a single app are collected and do not abort the others
+
+        Args:
+            action(Callable): the function to call for each app - returning an exitCode or None
+            max_workers(int): the maximum number of apps to handle concurrently
+            phase(str): if set record the duration per app as this phase and
+                show the progress with an ETA based on the history of the phase
+
+        Returns:
+            dict: the AppResults by version in the order of config.versions
+        """
+        versions = list(self.config.versions)
+        if max_workers is None or max_workers < 1:
+            max_workers = 1
+        progress = None
+        if phase is not None:
+            names = [
+                self.apps[version].config.container_base_name for version in versions
+            ]
+            progress = RunProgress(
+                phase, self.history.estimate(phase, names), workers=max_workers
+            )
+            start_msg = progress.getStartMessage()
+            if start_msg and self.config.verbose:
+                print(start_msg)
+
+        def run_action(version: str) -> AppResult:
             mwApp = self.apps[version]
-            mwApp.start(forceRebuild=forceRebuild, withInitDB=withInitDB)
-        return 0
+            result = AppResult(version=version, name=mwApp.config.container_base_name)
+            start = time.time()
+            start_time = time.monotonic()
+            try:
+                exitCode = action(mwApp)
+                result.exitCode = exitCode if exitCode is not None else 0
+            except Exception as ex:
+                result.exitCode = 1
+                result.error = ex
+            result.duration = time.monotonic() - start_time
+            if progress is not None:
+                self.metrics.add(
+                    PhaseTiming(
+                        phase=phase,
+                        app=result.name,
+                        version=version,
+                        start=start,
+                        duration=result.duration,
+                        ok=result.ok,
+                    )
+                )
+                progress_msg = progress.finish(result.name, result.duration)
+                if self.config.verbose:
+                    print(progress_msg)
+            return result
 
-    def down(self, forceRebuild: bool = False):
+        if max_workers > 1 and len(versions) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                result_list = list(executor.map(run_action, versions))
+        else:
+            result_list = [run_action(version) for version in versions]
+        results = {result.version: result for result in result_list}
+        return results
+
+    def reportResults(self, action_name: str, results: Dict[str, AppResult]) -> int:
         """
-        run docker compose down
+        report the given per app results
+
+        Args:
+            action_name(str): the name of the action to report on
+            results(dict): the AppResults by version
+
+        Returns:
+            int: exitCode - 0 if all apps are ok 1 if any app failed
         """
+        exitCode = 0
+        for i, result in enumerate(results.values()):
+            msg = f"{i+1}:{action_name} {result.name} {result.version} ({result.duration:.1f}s)"
+            if result.error is not None:
+                msg += f" failed: {result.error}"
+            if not Logger.check_and_log(msg, result.ok):
+                exitCode = 1
+        return exitCode
+
+    def down(self, forceRebuild: bool = False) -> int:
+        """
+        run docker compose down for all my apps with
+        up to config.parallel apps being taken down concurrently
+
+        Args:
+            forceRebuild(bool): if True also remove the volumes
+
+        Returns:
+            int: exitCode - 0 if ok 1 if any app failed
+        """
+        from python_on_whales.exceptions import DockerException
+
         exitCode = self.checkDocker()
         if exitCode > 0:
             return exitCode
-        for _i, version in enumerate(self.config.versions):
-            mwApp = self.apps[version]
-            mwApp.down(forceRebuild)
 
-    def listWikis(self) -> int:
+        if self.config.single_compose:
+            if self.config.verbose:
+                print(f"running docker compose down in {self.cluster_path} ...")
+            compose_client = self.getComposeClient()
+            try:
+                compose_client.compose.down(volumes=forceRebuild)
+                DockerMap.invalidate()
+                self.recordStates("remove" if forceRebuild else "down")
+            except DockerException as dex:
+                print(
+                    f"warning: docker compose down failed in {self.cluster_path}:{str(dex)}"
+                )
+                exitCode = 1
+            return exitCode
+
+        def down_app(mwApp: DockerApplication) -> int:
+            return mwApp.down(forceRebuild)
+
+        results = self.runForApps(
+            down_app, max_workers=self.config.parallel, phase="down"
+        )
+        self.recordStates("remove" if forceRebuild else "down", results)
+        exitCode = self.reportResults("down", results)
+        return exitCode
+
+    def getExplicitSecrets(self) -> Set[str]:
+        """
+        get the names of the secret fields given explicitly on the command line
+
+        Returns:
+            set: the names of the explicitly given secret fields
+        """
+        explicit = set()
+        if self.args is not None:
+            if getattr(self.args, "mysqlPassword", None):
+                explicit.add("mySQLPassword")
+            if getattr(self.args, "mysqlRootPassword", None):
+                explicit.add("mySQLRootPassword")
+        return explicit
+
+    def plan(self) -> Dict[str, AppPlan]:
+        """
+        plan the reconciliation of my apps by comparing their desired
+        configuration with the saved MwConfig.json and the running containers
+
+        generated secrets of the saved configuration are adopted unless
+        they have been given explicitly
+
+        Returns:
+            dict: the AppPlans by version
+        """
+        plans = Reconciler.planAll(self.apps, self.getExplicitSecrets())
+        return plans
+
+    def showPlan(self, plans: Dict[str, AppPlan], as_json: bool = False):
+        """
+        show the given plans
+
+        Args:
+            plans(dict): the AppPlans by version
+            as_json(bool): if True show the plans as JSON instead of a table
+        """
+        from tabulate import tabulate
+
+        records = [app_plan.as_dict() for app_plan in plans.values()]
+        if as_json:
+            print(json.dumps(records, indent=2))
+        else:
+            rows = []
+            for i, record in enumerate(records):
+                row = {"#": i + 1, **record}
+                row["reasons"] = "\n".join(record["reasons"])
+                rows.append(row)
+            print(tabulate(rows, headers="keys"))
+
+    def apply(self, plans: Dict[str, AppPlan] = None) -> int:
+        """
+        apply the given plans doing only the work needed for the class
+        of change of each app
+
+        Args:
+            plans(dict): the AppPlans by version - if None plan first
+
+        Returns:
+            int: exitCode - 0 if ok 1 if any app failed
+        """
+        exitCode = self.checkDocker()
+        if exitCode > 0:
+            return exitCode
+        if plans is None:
+            plans = self.plan()
+            self.showPlan(plans)
+
+        def prepare_app(mwApp: DockerApplication):
+            mwApp.prepareApply(plans[mwApp.config.version].change)
+
+        results = self.runForApps(prepare_app, max_workers=self.config.parallel)
+        exitCode = self.reportResults("prepare", results)
+        if exitCode > 0:
+            return exitCode
+        withUp = not self.config.single_compose
+
+        def finish_app(mwApp: DockerApplication) -> int:
+            return mwApp.finishApply(plans[mwApp.config.version].change, withUp=withUp)
+
+        DockerEventWaiter.activate(DockerMap.getLabels(cluster=self.config.prefix))
+        try:
+            if not withUp:
+                changes = [app_plan.change for app_plan in plans.values()]
+                if max(changes, default=ChangeClass.NONE) >= ChangeClass.COMPOSE:
+                    self.generateCompose(overwrite=True)
+                    self.upCompose()
+            results = self.runForApps(
+                finish_app, max_workers=self.config.parallel, phase="apply"
+            )
+        finally:
+            DockerEventWaiter.deactivate()
+        self.recordStates("apply", results)
+        exitCode = self.reportResults("apply", results)
+        return exitCode
+
+    def listWikis(self, as_json: bool = False) -> int:
         """
-        list my wikis
+        list the wikis of my cluster from the state store and a single
+        snapshot of the running containers - the states of the apps of my
+        configured versions are shown if the store does not know them
+
+        Args:
+            as_json(bool): if True show the list as JSON
 
         Returns:
             int: exitCode - 0 if ok 1 if failed
@@ -119,18 +695,58 @@ class MediaWikiCluster(object):
         exitCode = self.checkDocker()
         if exitCode > 0:
             return exitCode
-        for i, version in enumerate(self.config.versions):
-            mwApp = self.apps[version]
-            mw, db = mwApp.getContainers()
-            config = mwApp.config
-            ok = mw and db
-            msg = f"{i+1}:{config.container_base_name} {config.fullVersion}"
-            Logger.check_and_log(msg, ok)
+        app_states = self.state_store.query(cluster=self.config.prefix)
+        if not app_states:
+            # listing is read only - the states are not recorded
+            if not self.apps:
+                self.createApps(withGenerate=False, fromSaved=True)
+            app_states = [
+                AppState.fromApp(mwApp, cluster=self.config.prefix)
+                for mwApp in self.apps.values()
+            ]
+        container_map = self.refreshContainers()
+        records = []
+        for i, app_state in enumerate(app_states):
+            running = {}
+            for kind, container_name in [
+                ("mw", app_state.mw_container),
+                ("db", app_state.db_container),
+            ]:
+                container = container_map.get(container_name)
+                if container is None and container_name:
+                    # e.g. an external db or a container created before labeling
+                    container = DockerMap.findRunningContainer(container_name)
+                running[kind] = container is not None
+            records.append(
+                {
+                    "#": i + 1,
+                    "wiki": app_state.app,
+                    "version": app_state.version,
+                    "url": app_state.url,
+                    "mw": running["mw"],
+                    "db": running["db"],
+                    "status": app_state.status,
+                    "healthy": app_state.healthy,
+                    "extensions": app_state.extensions,
+                    "updated": app_state.updated,
+                }
+            )
+        if as_json:
+            print(json.dumps(records, indent=2))
+        else:
+            for record in records:
+                msg = f"{record['#']}:{record['wiki']} MediaWiki {record['version']}"
+                Logger.check_and_log(msg, record["mw"] and record["db"])
         return exitCode
 
-    def check(self) -> int:
+    def followLogs(self, duration: float = None) -> int:
         """
-        check the composer applications
+        follow the logs of the mw and db containers of all my apps
+        into the rotating log files of the apps and show them on the console
+
+        Args:
+            duration(float): the number of seconds to follow - until interrupted or
+                all containers stopped if None
 
         Returns:
             int: exitCode - 0 if ok 1 if failed
@@ -139,21 +755,185 @@ class MediaWikiCluster(object):
         if exitCode > 0:
             return exitCode
 
-        for i, version in enumerate(self.config.versions):
-            mwApp = self.apps[version]
-            msg = f"{i+1}:checking {version} ..."
-            print(msg)
-            exitCode = mwApp.check()
+        def show(source: LogSource, stream_type: str, line: str):
+            target_stream = sys.stderr if stream_type == "stderr" else sys.stdout
+            print(f"{source.container_name}: {line}", file=target_stream)
+
+        listener = show if self.config.verbose else None
+        aggregator = LogAggregator(listener=listener)
+        aggregator.addApps(self.apps.values()).start()
+        try:
+            aggregator.wait(timeout=duration)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            aggregator.stop()
+        return exitCode
+
+    def check(self, timeout: float = 10.0, as_json: bool = False) -> int:
+        """
+        check the composer applications concurrently and
+        show an aggregated report
+
+        Args:
+            timeout(float): the timeout in seconds for accessing each wiki
+            as_json(bool): if True show the report as JSON instead of a table
+
+        Returns:
+            int: exitCode - 0 if all wikis are ok 1 if any check failed
+        """
+        from tabulate import tabulate
+
+        exitCode = self.checkDocker()
+        if exitCode > 0:
+            return exitCode
+        self.refreshContainers()
+        checks_by_version = {}
+
+        def check_app(mwApp: DockerApplication) -> int:
+            checks = mwApp.getChecks(timeout=timeout)
+            checks_by_version[mwApp.config.version] = checks
+            ok = all(wiki_check.ok for wiki_check in checks)
+            return 0 if ok else 1
+
+        # checks mostly wait for the network but all wikis share one host
+        max_workers = max(self.config.parallel, self.check_workers)
+        results = self.runForApps(check_app, max_workers=max_workers)
+        records = []
+        for i, result in enumerate(results.values()):
+            if result.error is not None:
+                checks = [WikiCheck(name="check", ok=False, msg=str(result.error))]
+            else:
+                checks = checks_by_version.get(result.version, [])
+            for wiki_check in checks:
+                record = {
+                    "#": i + 1,
+                    "wiki": result.name,
+                    "version": result.version,
+                    "check": wiki_check.name,
+                    "ok": wiki_check.ok,
+                    "latency": round(wiki_check.latency, 3),
+                    "msg": wiki_check.msg,
+                }
+                records.append(record)
+            if not result.ok:
+                exitCode = 1
+            self.state_store.update(
+                self.config.prefix,
+                result.name,
+                healthy=result.ok,
+                last_action="check",
+                last_duration=result.duration,
+            )
+        if as_json:
+            print(json.dumps(records, indent=2))
+        else:
+            rows = []
+            for record in records:
+                row = record.copy()
+                row["ok"] = "✅" if record["ok"] else "❌"
+                rows.append(row)
+            print(tabulate(rows, headers="keys"))
         return exitCode
 
+    @cached_property
+    def history(self) -> PerfHistory:
+        """
+        the local history of the per app and per phase durations
+        """
+        history = PerfHistory(f"{self.config.docker_path}/perf_history.jsonl")
+        return history
+
+    def recordHistory(self, show: bool = True) -> list:
+        """
+        compare the timings of this run with the history, show the phases
+        that got significantly slower and add the timings to the history
+
+        Args:
+            show(bool): if True show the slower phases
+
+        Returns:
+            list: the Regressions found
+        """
+        timings = self.metrics.getTimings()
+        regressions = self.history.findRegressions(timings)
+        if show:
+            self.history.showRegressions(regressions)
+        self.history.record(timings)
+        return regressions
+
+    @cached_property
+    def state_store(self) -> StateStore:
+        """
+        the local store of the states of the apps of all clusters
+        """
+        state_store = StateStore(f"{self.config.docker_path}/state.db")
+        return state_store
+
+    def recordStates(self, action: str, results: Dict[str, AppResult] = None):
+        """
+        record the states of my apps after the given action
+
+        the apps whose volumes have been removed successfully are removed from the store
+
+        Args:
+            action(str): the action e.g. generate, start, down or remove
+            results(dict): the AppResults of the action by version - all apps ok if None
+        """
+        status_by_action = {
+            "generate": "generated",
+            "start": "started",
+            "apply": "started",
+            "down": "down",
+            "remove": "down",
+        }
+        container_map = {}
+        if action in ["start", "apply"]:
+            container_map = self.refreshContainers()
+        for version, mwApp in self.apps.items():
+            result = results.get(version) if results else None
+            app_state = AppState.fromApp(mwApp, cluster=self.config.prefix)
+            if result is not None and not result.ok:
+                app_state.status = "failed"
+            else:
+                app_state.status = status_by_action.get(action)
+            if action == "remove" and app_state.status == "down":
+                self.state_store.remove(app_state.cluster, app_state.app)
+                continue
+            if result is not None:
+                app_state.last_action = action
+                app_state.last_duration = result.duration
+            for kind, container_name in [
+                ("mw", app_state.mw_container),
+                ("db", app_state.db_container),
+            ]:
+                container = container_map.get(container_name)
+                if container is not None:
+                    setattr(app_state, f"{kind}_container_id", container.id)
+            self.state_store.upsert(app_state)
+            if action == "down" and app_state.status == "down":
+                self.state_store.update(
+                    app_state.cluster,
+                    app_state.app,
+                    mw_container_id=None,
+                    db_container_id=None,
+                    healthy=None,
+                )
+
     def close(self):
         """
         close my apps
         """
         for mwApp in self.apps.values():
             mwApp.close()
+        if "state_store" in self.__dict__:
+            self.state_store.close()
+        if self.image_prefetcher is not None:
+            self.image_prefetcher.close()
 
-    def getDockerApplication(self, i: int, count: int, version: str):
+    def getDockerApplication(
+        self, i: int, count: int, version: str, fromSaved: bool = False
+    ):
         """
         get the docker application for the given version index and version
 
@@ -161,6 +941,7 @@ class MediaWikiCluster(object):
             i(int): the index of the version
             count(int): total number of Docker applications in this cluster
             version(str): the mediawiki version to use
+            fromSaved(bool): if True use the saved MwConfig.json of the app if there is one
 
         Returns:
             DockerApplication: the docker application
@@ -181,5 +962,14 @@ class MediaWikiCluster(object):
                 self.args.db_container_name if self.args else None
             )
         appConfig.__post_init__()
+        if fromSaved:
+            config_path = (
+                f"{appConfig.docker_path}/{appConfig.container_base_name}/MwConfig.json"
+            )
+            if os.path.isfile(config_path):
+                appConfig = appConfig.load(config_path, withExtensions=False)
         mwApp = DockerApplication(config=appConfig)
+        mwApp.image_builder = self.image_builder
+        mwApp.image_prefetcher = self.image_prefetcher
+        mwApp.metrics = self.metrics
         return mwApp
@@ -10,13 +10,15 @@ from argparse import ArgumentParser, Namespace
 from basemkit.base_cmd import BaseCmd
 
 from mwdocker.config import MwClusterConfig, MwConfig
-from mwdocker.mwcluster import MediaWikiCluster
 from mwdocker.version import Version
 
 
 class MediaWikiDockerCmd(BaseCmd):
     """
     pymediawiki docker main
+
+    the docker, database and template machinery is only imported
+    when a command needs it so that --version and --help start fast
     """
 
     def __init__(self, version=Version):
@@ -50,25 +52,125 @@ class MediaWikiDockerCmd(BaseCmd):
         parser.add_argument("--down", action="store_true")
         parser.add_argument("--check", action="store_true")
         parser.add_argument("--list", action="store_true")
+        parser.add_argument(
+            "--precompile",
+            action="store_true",
+            help="compile all packaged templates into the bytecode cache under the docker path",
+        )
+        parser.add_argument(
+            "--plan",
+            action="store_true",
+            help="show the changes needed to reconcile the wikis with the configuration",
+        )
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="reconcile the wikis with the configuration doing only the needed work",
+        )
+        parser.add_argument(
+            "--logs",
+            action="store_true",
+            help="follow the container logs of all wikis into rotating compressed files in their logs directories",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="show results in JSON format"
+        )
+        parser.add_argument(
+            "--metrics",
+            help="save the per phase timings to the given file - JSON for .json else OpenMetrics text",
+        )
+        parser.add_argument(
+            "--timings",
+            action="store_true",
+            help="show a summary table of the per phase timings",
+        )
+        parser.add_argument(
+            "--profile",
+            help="save a cProfile dump of the run to the given file",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=10.0,
+            help="timeout in seconds for checking each wiki [default: %(default)s]",
+        )
 
     def handle_args(self, args: Namespace) -> bool:
         if super().handle_args(args):
             return True
-        self.config.fromArgs(args)
+        from mwdocker.docker import DockerApplication
+        from mwdocker.mwcluster import MediaWikiCluster
+
+        # read only commands do not need the extension definitions
+        # and use the saved configurations of the wikis
+        read_only = (args.list or args.check or args.logs) and not args.create
+        self.config.fromArgs(args, withExtensions=not read_only)
+        if args.precompile:
+            count = DockerApplication.precompileTemplates(self.config.docker_path)
+            if self.config.verbose:
+                print(f"{count} templates precompiled")
+            actions = [
+                args.check,
+                args.create,
+                args.list,
+                args.down,
+                args.plan,
+                args.apply,
+                args.logs,
+            ]
+            if not any(actions):
+                self.exit_code = 0
+                return True
         self.cluster = MediaWikiCluster(self.config, args)
-        self.cluster.createApps(withGenerate=args.create)
+        profiler = None
+        if args.profile:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            self.runCommand(args, read_only)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(args.profile)
+            if args.create or args.down or args.apply:
+                # persist the timings of changing runs for ETAs and regressions
+                self.cluster.recordHistory(show=self.config.verbose)
+            if args.metrics:
+                self.cluster.metrics.save(args.metrics)
+            if args.timings:
+                self.cluster.metrics.showSummary()
+        return True
+
+    def runCommand(self, args: Namespace, read_only: bool):
+        """
+        create the apps of my cluster and run the command given by the arguments
+
+        Args:
+            args(Namespace): the command line arguments
+            read_only(bool): if True use the saved configurations of the wikis
+        """
+        if args.list and not any([args.check, args.plan, args.apply, args.create]):
+            # answered from the state store and a single container snapshot
+            self.exit_code = self.cluster.listWikis(as_json=args.json)
+            return
+        self.cluster.createApps(withGenerate=args.create, fromSaved=read_only)
         if args.check:
-            self.exit_code = self.cluster.check()
+            self.exit_code = self.cluster.check(timeout=args.timeout, as_json=args.json)
+        elif args.plan:
+            self.cluster.showPlan(self.cluster.plan(), as_json=args.json)
+        elif args.apply:
+            self.exit_code = self.cluster.apply()
         elif args.create:
             self.exit_code = self.cluster.start(forceRebuild=self.config.forceRebuild)
-        elif args.list:
-            self.exit_code = self.cluster.listWikis()
         elif args.down:
             self.exit_code = self.cluster.down(forceRebuild=self.config.forceRebuild)
+        elif args.logs:
+            self.exit_code = self.cluster.followLogs()
         else:
             self.parser.print_usage()
             self.exit_code = 1
-        return True
 
 
 def main(argv=None):
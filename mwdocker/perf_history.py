@@ -0,0 +1,399 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from mwdocker.metrics import PhaseTiming
+
+
+@dataclass
+class PhaseRecord:
+    """
+    the total duration of a phase of an app in a single run
+    """
+
+    run: float
+    phase: str
+    app: str
+    version: str
+    detail: str
+    duration: float
+    ok: bool = True
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.phase, self.app, self.detail)
+
+
+@dataclass
+class Regression:
+    """
+    a phase that took significantly longer than its historical median
+    """
+
+    record: PhaseRecord
+    median: float
+    samples: int
+
+    @property
+    def ratio(self) -> float:
+        ratio = self.record.duration / self.median if self.median > 0 else 0.0
+        return ratio
+
+
+class PerfHistory:
+    """
+    local history of the per app and per phase durations of the runs
+    as a JSON lines file e.g. to estimate the remaining time of a run and
+    to detect phases that got slower
+    """
+
+    # phases whose detail varies from run to run e.g. attempt 3
+    detail_free_phases = ("db_connect",)
+
+    def __init__(
+        self,
+        path: str,
+        max_samples: int = 20,
+        max_records: int = 10000,
+    ):
+        """
+        constructor
+
+        Args:
+            path(str): the path of the JSON lines file
+            max_samples(int): the number of most recent runs to use per phase and app
+            max_records(int): the number of records at which the file is compacted
+        """
+        self.path = path
+        self.max_samples = max_samples
+        self.max_records = max_records
+        self.lock = threading.Lock()
+        self._samples = None
+        self.record_count = 0
+
+    @classmethod
+    def aggregate(
+        cls, timings: Iterable[PhaseTiming], run: float = None
+    ) -> List[PhaseRecord]:
+        """
+        sum up the given timings of a run by phase, app and detail
+
+        Args:
+            timings(Iterable): the PhaseTimings of the run
+            run(float): the unix timestamp of the run - now if None
+
+        Returns:
+            list: the PhaseRecords in the order of the first timing
+        """
+        if run is None:
+            run = time.time()
+        records = {}
+        for timing in timings:
+            detail = "" if timing.phase in cls.detail_free_phases else timing.detail
+            key = (timing.phase, timing.app, detail)
+            record = records.get(key)
+            if record is None:
+                record = PhaseRecord(
+                    run=run,
+                    phase=timing.phase,
+                    app=timing.app,
+                    version=timing.version,
+                    detail=detail,
+                    duration=0.0,
+                )
+                records[key] = record
+            record.duration += timing.duration
+            record.ok = record.ok and timing.ok
+        return list(records.values())
+
+    def load(self) -> Dict[Tuple[str, str, str], List[float]]:
+        """
+        load the durations of the successful runs by phase, app and detail
+
+        Returns:
+            dict: the most recent durations by (phase, app, detail)
+        """
+        with self.lock:
+            if self._samples is None:
+                samples = {}
+                self.record_count = 0
+                if os.path.isfile(self.path):
+                    with open(self.path, encoding="utf-8") as history_file:
+                        for line in history_file:
+                            try:
+                                record = PhaseRecord(**json.loads(line))
+                            except (ValueError, TypeError):
+                                # ignore truncated or foreign lines
+                                continue
+                            self.record_count += 1
+                            if record.ok:
+                                durations = samples.setdefault(record.key, [])
+                                durations.append(record.duration)
+                                if len(durations) > self.max_samples:
+                                    del durations[0]
+                self._samples = samples
+            return self._samples
+
+    def median(self, phase: str, app: str, detail: str = "") -> Optional[float]:
+        """
+        get the median duration of the given phase of the given app
+
+        Returns:
+            float: the median in seconds - None if there is no history
+        """
+        durations = self.load().get((phase, app, detail))
+        median = statistics.median(durations) if durations else None
+        return median
+
+    def sampleCount(self, phase: str, app: str, detail: str = "") -> int:
+        """
+        get the number of historical samples of the given phase of the given app
+        """
+        return len(self.load().get((phase, app, detail), []))
+
+    def estimate(self, phase: str, apps: List[str]) -> Dict[str, Optional[float]]:
+        """
+        estimate the duration of the given phase for each of the given apps
+
+        apps without history get the mean of the estimates of the others
+
+        Args:
+            phase(str): the phase e.g. start
+            apps(list): the names of the apps
+
+        Returns:
+            dict: the estimated seconds by app - None if there is no history at all
+        """
+        estimates = {app: self.median(phase, app) for app in apps}
+        known = [estimate for estimate in estimates.values() if estimate is not None]
+        if known:
+            default = statistics.mean(known)
+            estimates = {
+                app: default if estimate is None else estimate
+                for app, estimate in estimates.items()
+            }
+        return estimates
+
+    def findRegressions(
+        self,
+        timings: Iterable[PhaseTiming],
+        factor: float = 1.5,
+        min_seconds: float = 1.0,
+        min_samples: int = 3,
+    ) -> List[Regression]:
+        """
+        find the phases of the given run that took significantly longer
+        than their historical median
+
+        Args:
+            timings(Iterable): the PhaseTimings of the run
+            factor(float): the ratio to the median at which a phase is flagged
+            min_seconds(float): the minimum slowdown in seconds to ignore noise of fast phases
+            min_samples(int): the minimum number of historical runs needed
+
+        Returns:
+            list: the Regressions with the largest slowdown first
+        """
+        regressions = []
+        for record in self.aggregate(timings):
+            if not record.ok:
+                continue
+            if self.sampleCount(*record.key) < min_samples:
+                continue
+            median = self.median(*record.key)
+            if (
+                record.duration > factor * median
+                and record.duration - median >= min_seconds
+            ):
+                regressions.append(
+                    Regression(
+                        record=record,
+                        median=median,
+                        samples=self.sampleCount(*record.key),
+                    )
+                )
+        regressions.sort(key=lambda r: r.record.duration - r.median, reverse=True)
+        return regressions
+
+    def record(self, timings: Iterable[PhaseTiming], run: float = None) -> int:
+        """
+        append the given timings of a run to the history
+
+        Args:
+            timings(Iterable): the PhaseTimings of the run
+            run(float): the unix timestamp of the run - now if None
+
+        Returns:
+            int: the number of records appended
+        """
+        records = self.aggregate(timings, run)
+        if not records:
+            return 0
+        self.load()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as history_file:
+                for record in records:
+                    history_file.write(json.dumps(asdict(record)) + "\n")
+            self.record_count += len(records)
+            compact = self.record_count > self.max_records
+            # reload on next access
+            self._samples = None
+        if compact:
+            self.compact()
+        return len(records)
+
+    def compact(self):
+        """
+        keep only the most recent half of the records
+        """
+        with self.lock:
+            with open(self.path, encoding="utf-8") as history_file:
+                lines = history_file.readlines()
+            lines = lines[-(self.max_records // 2) :]
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as history_file:
+                history_file.writelines(lines)
+            os.replace(tmp_path, self.path)
+            self._samples = None
+
+    @classmethod
+    def showRegressions(cls, regressions: List[Regression]):
+        """
+        show the given regressions as a table
+        """
+        from tabulate import tabulate
+
+        rows = []
+        for regression in regressions:
+            record = regression.record
+            rows.append(
+                {
+                    "phase": record.phase,
+                    "app": record.app,
+                    "detail": record.detail,
+                    "seconds": round(record.duration, 2),
+                    "median": round(regression.median, 2),
+                    "ratio": round(regression.ratio, 1),
+                    "runs": regression.samples,
+                }
+            )
+        if rows:
+            print(f"⚠️ {len(rows)} phases slower than their history:")
+            print(tabulate(rows, headers="keys"))
+
+
+class RunProgress:
+    """
+    progress and estimated time of arrival of a cluster action
+    based on the historical durations of the action per app
+    """
+
+    def __init__(
+        self, action: str, estimates: Dict[str, Optional[float]], workers: int = 1
+    ):
+        """
+        constructor
+
+        Args:
+            action(str): the name of the action e.g. start
+            estimates(dict): the estimated seconds by app - None if unknown
+            workers(int): the number of apps handled concurrently
+        """
+        self.action = action
+        self.estimates = estimates
+        self.workers = max(1, min(workers or 1, len(estimates) or 1))
+        self.done: List[str] = []
+        self.start_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def known(self) -> bool:
+        """
+        True if there is an estimate for each app
+        """
+        known = bool(self.estimates) and all(
+            estimate is not None for estimate in self.estimates.values()
+        )
+        return known
+
+    @classmethod
+    def formatSeconds(cls, seconds: float) -> str:
+        """
+        format the given seconds e.g. as 2m05s
+        """
+        seconds = int(round(seconds))
+        if seconds >= 60:
+            text = f"{seconds // 60}m{seconds % 60:02d}s"
+        else:
+            text = f"{seconds}s"
+        return text
+
+    def eta(self) -> Optional[float]:
+        """
+        get the estimated remaining seconds
+
+        the historical estimate is scaled by how fast the finished apps
+        have been compared to their history
+
+        Returns:
+            float: the remaining seconds - None if there is no history
+        """
+        if not self.known:
+            return None
+        elapsed = time.monotonic() - self.start_time
+        total = sum(self.estimates.values())
+        with self.lock:
+            done_expected = sum(self.estimates[app] for app in self.done)
+        if done_expected > 0 and total > 0:
+            projected = elapsed * total / done_expected
+        else:
+            projected = total / self.workers
+        eta = max(0.0, projected - elapsed)
+        return eta
+
+    def getStartMessage(self) -> Optional[str]:
+        """
+        get the message announcing the expected duration
+        """
+        if not self.known:
+            return None
+        expected = sum(self.estimates.values()) / self.workers
+        msg = f"{self.action} of {len(self.estimates)} apps: expected {self.formatSeconds(expected)} based on history"
+        return msg
+
+    def finish(self, app: str, duration: float) -> str:
+        """
+        mark the given app as finished
+
+        Args:
+            app(str): the name of the app
+            duration(float): the seconds the action took for the app
+
+        Returns:
+            str: the progress message
+        """
+        with self.lock:
+            self.done.append(app)
+            done_count = len(self.done)
+        msg = f"{self.action} {done_count}/{len(self.estimates)} {app} ({duration:.1f}s"
+        estimate = self.estimates.get(app)
+        if estimate is not None:
+            msg += f" median {estimate:.1f}s"
+        msg += ")"
+        eta = self.eta()
+        if eta is not None and done_count < len(self.estimates):
+            msg += f" ETA {self.formatSeconds(eta)}"
+        return msg
@@ -0,0 +1,210 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, List, Set
+
+
+class ChangeClass(IntEnum):
+    """
+    the classes of changes between a saved and a desired configuration
+    ordered by the amount of work needed to apply them - applying a class
+    includes the work of all lower classes
+    """
+
+    NONE = 0
+    LOCAL_SETTINGS = 1
+    COMPOSE = 2
+    IMAGE = 3
+    DATA_RESET = 4
+
+
+@dataclass
+class AppPlan:
+    """
+    the plan for reconciling a single docker application
+    """
+
+    version: str
+    name: str
+    change: ChangeClass = ChangeClass.NONE
+    reasons: List[str] = field(default_factory=list)
+
+    def add(self, change: ChangeClass, reason: str):
+        """
+        add the given change with the given reason
+
+        Args:
+            change(ChangeClass): the class of the change
+            reason(str): the reason for the change
+        """
+        self.reasons.append(reason)
+        if change > self.change:
+            self.change = change
+
+    def as_dict(self) -> dict:
+        """
+        get my dict representation
+
+        Returns:
+            dict: my fields with the change class by name
+        """
+        plan_dict = {
+            "version": self.version,
+            "name": self.name,
+            "change": self.change.name.lower(),
+            "reasons": self.reasons,
+        }
+        return plan_dict
+
+
+class Reconciler:
+    """
+    plans the minimal work to get from the saved MwConfig.json
+    and the running containers to a desired configuration
+    """
+
+    # the change class caused by a difference in a configuration field
+    # fields that are not listed (e.g. verbose, debug, parallel) do not need any work
+    field_changes = {
+        "extensionNameList": ChangeClass.LOCAL_SETTINGS,
+        "extensionJsonFile": ChangeClass.LOCAL_SETTINGS,
+        "smw_version": ChangeClass.LOCAL_SETTINGS,
+        "user": ChangeClass.LOCAL_SETTINGS,
+        "password": ChangeClass.LOCAL_SETTINGS,
+        "logo": ChangeClass.LOCAL_SETTINGS,
+        "prot": ChangeClass.LOCAL_SETTINGS,
+        "host": ChangeClass.LOCAL_SETTINGS,
+        "article_path": ChangeClass.LOCAL_SETTINGS,
+        "script_path": ChangeClass.LOCAL_SETTINGS,
+        "port": ChangeClass.COMPOSE,
+        "sql_port": ChangeClass.COMPOSE,
+        "uid": ChangeClass.COMPOSE,
+        "gid": ChangeClass.COMPOSE,
+        "mariaDBVersion": ChangeClass.COMPOSE,
+        "networkName": ChangeClass.COMPOSE,
+        "version": ChangeClass.IMAGE,
+        # the database users and passwords are only set when the volume is created
+        "mySQLPassword": ChangeClass.DATA_RESET,
+        "mySQLRootPassword": ChangeClass.DATA_RESET,
+        "bind_mount": ChangeClass.DATA_RESET,
+        "db_container_name": ChangeClass.DATA_RESET,
+    }
+
+    # generated secrets that are kept from the saved configuration
+    # unless they have been given explicitly
+    secret_fields = ["mySQLPassword", "mySQLRootPassword"]
+
+    @classmethod
+    def loadSaved(cls, mwApp):
+        """
+        load the saved configuration of the given docker application
+
+        Args:
+            mwApp(DockerApplication): the docker application
+
+        Returns:
+            MwConfig: the saved configuration or None if there is none
+        """
+        saved = None
+        config_path = mwApp.config.get_config_path()
+        if os.path.isfile(config_path):
+            saved = mwApp.config.load(config_path)
+        return saved
+
+    @classmethod
+    def adoptSecrets(cls, desired, saved, explicit: Set[str]):
+        """
+        keep the generated secrets of the saved configuration
+
+        Args:
+            desired(MwConfig): the desired configuration to modify
+            saved(MwConfig): the saved configuration
+            explicit(set): the names of the secret fields given explicitly
+        """
+        secret_fields = list(cls.secret_fields)
+        if desired.random_password:
+            secret_fields.append("password")
+        for secret_field in secret_fields:
+            saved_value = getattr(saved, secret_field)
+            if secret_field not in explicit and saved_value:
+                setattr(desired, secret_field, saved_value)
+
+    @classmethod
+    def getValue(cls, config, field_name: str):
+        """
+        get the comparable value of the given field
+        """
+        value = getattr(config, field_name, None)
+        if isinstance(value, list):
+            value = sorted(value)
+        return value
+
+    @classmethod
+    def plan(cls, mwApp, explicit: Set[str] = None) -> AppPlan:
+        """
+        plan the reconciliation of the given docker application
+
+        Args:
+            mwApp(DockerApplication): the docker application with the desired configuration
+            explicit(set): the names of the secret fields given explicitly
+
+        Returns:
+            AppPlan: the plan
+        """
+        desired = mwApp.config
+        app_plan = AppPlan(version=desired.version, name=desired.container_base_name)
+        saved = cls.loadSaved(mwApp)
+        if saved is None:
+            app_plan.add(ChangeClass.DATA_RESET, "no saved configuration")
+            return app_plan
+        cls.adoptSecrets(desired, saved, explicit or set())
+        for field_name, change in cls.field_changes.items():
+            saved_value = cls.getValue(saved, field_name)
+            desired_value = cls.getValue(desired, field_name)
+            if saved_value != desired_value:
+                if field_name in cls.secret_fields or field_name == "password":
+                    reason = f"{field_name} changed"
+                else:
+                    reason = f"{field_name}: {saved_value} → {desired_value}"
+                app_plan.add(change, reason)
+        # the database name is derived from the wiki id
+        saved_wiki_id = saved.getWikiId()
+        desired_wiki_id = desired.getWikiId()
+        if saved_wiki_id != desired_wiki_id:
+            app_plan.add(
+                ChangeClass.DATA_RESET,
+                f"wiki id: {saved_wiki_id} → {desired_wiki_id}",
+            )
+        mw, db = mwApp.getContainers()
+        if mw is None or not mw.container.state.running:
+            app_plan.add(ChangeClass.COMPOSE, "mediawiki container not running")
+        if not desired.has_external_db and (
+            db is None or not db.container.state.running
+        ):
+            app_plan.add(ChangeClass.COMPOSE, "database container not running")
+        return app_plan
+
+    @classmethod
+    def planAll(
+        cls, apps: Dict[str, object], explicit: Set[str] = None
+    ) -> Dict[str, AppPlan]:
+        """
+        plan the reconciliation of the given docker applications
+
+        Args:
+            apps(dict): the docker applications by version
+            explicit(set): the names of the secret fields given explicitly
+
+        Returns:
+            dict: the AppPlans by version
+        """
+        plans = {}
+        for version, mwApp in apps.items():
+            plans[version] = cls.plan(mwApp, explicit)
+        return plans
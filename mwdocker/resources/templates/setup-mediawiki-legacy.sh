@@ -222,9 +222,15 @@ EOF
 initdb() {
   get_mysql_connection
 
-  # Check if SQL file exists
-  if [ ! -f "${SCRIPT_DIR}/wiki.sql" ]; then
-    error "SQL file not found: ${SCRIPT_DIR}/wiki.sql"
+  # Check if SQL file exists - prefer the compressed one
+  local sql_file="${SCRIPT_DIR}/wiki.sql.gz"
+  local sql_cat="gunzip -c"
+  if [ ! -f "$sql_file" ]; then
+    sql_file="${SCRIPT_DIR}/wiki.sql"
+    sql_cat="cat"
+  fi
+  if [ ! -f "$sql_file" ]; then
+    error "SQL file not found: $sql_file"
   fi
 
   # Test database connection first
@@ -233,7 +239,7 @@ initdb() {
   fi
 
   # Import with error handling
-  if cat "${SCRIPT_DIR}/wiki.sql" | mysql --host=db -u"$DB_USER" -p"$DB_PASSWORD" "$DB_NAME"; then
+  if $sql_cat "$sql_file" | mysql --host=db -u"$DB_USER" -p"$DB_PASSWORD" "$DB_NAME"; then
     color_msg "$green" "Database initialized successfully"
   else
     error "Failed to initialize database from wiki.sql"
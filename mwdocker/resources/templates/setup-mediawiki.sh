@@ -94,6 +94,7 @@ GENERAL OPTIONS:
 STEPS (choose any; default is --all if none given):
   --all                 Run all steps (default)
   --install-files       Install config and utility files
+  --update-files        Install config and utility files replacing existing ones
   --initdb              Initialize database from SQL backup
   --fixmariadb          Fix MariaDB problems e.g. SSL enforcement
   --grant               Grant database permissions
@@ -249,17 +250,22 @@ wait_for_db() {
   local host="$DB_HOST"
   local user="$1"
   local pass="$2"
-  local max_retries=60
-  local count=0
+  local max_wait=60
+  local deadline=$((SECONDS + max_wait))
+  # probe quickly first and back off to 1s - the database is usually ready within a second
+  local delays="0.1 0.2 0.3 0.5 1"
+  local delay
 
-  color_msg "$blue" "Waiting up to $max_retries for database connection..."
+  color_msg "$blue" "Waiting up to ${max_wait}s for database connection..."
   while ! mysql --host="$host" -u"$user" -p"$pass" -e "SELECT 1;" >/dev/null 2>&1; do
-    sleep 1
-    echo -n "."
-    count=$((count + 1))
-    if [ $count -ge $max_retries ]; then
+    if [ $SECONDS -ge $deadline ]; then
       error "Timed out waiting for database connection."
     fi
+    # the last delay is repeated
+    delay="${delays%% *}"
+    delays="${delays#* }"
+    sleep "$delay"
+    echo -n "."
   done
   color_msg "$green" "Database connected."
 }
@@ -329,14 +335,20 @@ initdb() {
   fi
 
 
-  # Check if SQL file exists
-  if [ ! -f "${SCRIPT_DIR}/wiki.sql" ]; then
-    error "SQL file not found: ${SCRIPT_DIR}/wiki.sql"
+  # Check if SQL file exists - prefer the compressed one
+  local sql_file="${SCRIPT_DIR}/wiki.sql.gz"
+  local sql_cat="gunzip -c"
+  if [ ! -f "$sql_file" ]; then
+    sql_file="${SCRIPT_DIR}/wiki.sql"
+    sql_cat="cat"
+  fi
+  if [ ! -f "$sql_file" ]; then
+    error "SQL file not found: $sql_file"
   fi
 
 
   # Import with error handling
-  if cat "${SCRIPT_DIR}/wiki.sql" | mysql --host=db -u"$DB_USER" -p"$DB_PASSWORD" "$DB_NAME"; then
+  if $sql_cat "$sql_file" | mysql --host=db -u"$DB_USER" -p"$DB_PASSWORD" "$DB_NAME"; then
     color_msg "$green" "Database initialized successfully"
   else
     error "Failed to initialize database from wiki.sql"
@@ -361,7 +373,7 @@ install_files() {
 
       # Check if src exists to allow partial updates
       if [ -f "$src" ]; then
-	    if [ ! -f "$dest" ]; then
+	    if [ ! -f "$dest" ] || [ "${FORCE_INSTALL:-false}" = "true" ]; then
 	      install -m "$mode" -o www-data -g www-data "$src" "$dest"
 	    fi
       else
@@ -370,6 +382,13 @@ install_files() {
 	done
 }
 
+#
+# update config and utility files replacing the installed ones
+#
+update_files() {
+  FORCE_INSTALL=true install_files
+}
+
 #
 # install extensions not managed via composer
 #
@@ -433,6 +452,46 @@ EOF
 }
 
 
+# the step currently running - reported as failed by the exit trap
+CURRENT_STEP=""
+
+#
+# emit a structured step marker that is parsed by pymediawikidocker
+#   params:
+#     1: l_event - start or end
+#     2: l_name - the name of the step
+#     3: l_status - the exit status for end markers
+#
+step_marker() {
+  local l_event="$1"
+  local l_name="$2"
+  local l_status="${3:-}"
+  local l_marker="##pmwd-step ${l_event} name=${l_name} ts=$(date +%s.%N)"
+  if [ -n "$l_status" ]; then
+    l_marker="${l_marker} status=${l_status}"
+  fi
+  echo "$l_marker"
+}
+
+#
+# run the given setup step between start and end markers
+#   params:
+#     1: l_name - the name of the step
+#     *: the command of the step
+#
+step() {
+  local l_name="$1"
+  shift
+  CURRENT_STEP="$l_name"
+  step_marker start "$l_name"
+  "$@"
+  step_marker end "$l_name" 0
+  CURRENT_STEP=""
+}
+
+# a failing step exits the script - report its end with the exit status
+trap 'l_status=$?; if [ -n "$CURRENT_STEP" ]; then step_marker end "$CURRENT_STEP" "$l_status"; fi' EXIT
+
 #
 # run all MediaWiki setup steps
 #
@@ -440,42 +499,42 @@ all() {
 	echo "Setting up MediaWiki using scripts from: ${SCRIPT_DIR}"
 
 	# make sure we copy installation files from script dir
-	install_files
+	step install-files install_files
 
 	# fix maria db issues
-	fix_mariadb
+	step fix-mariadb fix_mariadb
 
 	cd "${WEB_DIR}"
 	# call initialize database function
-	initdb
+	step initdb initdb
 
 	# install non composer extensions
-	do_extensions
+	step extensions do_extensions
 
 	# fix permissions
-	fix_permissions
+	step permissions fix_permissions
 
 	# install composer based extensions
-	do_composer_update
+	step composer do_composer_update
 
 
 	# run the update script to initialize tables e.g. for Semanticmediawiki
-	run_update
+	step update run_update
 
 	# add sysop user
-	do_sysop
+	step sysop do_sysop
 
 	# allow short urls
-	short_urls_htaccess
+	step short-urls short_urls_htaccess
 
 	# install language images
-	lang_images "${WEB_DIR}/images"
+	step lang-images lang_images "${WEB_DIR}/images"
 
 	# fix permissions again before finishing
-	fix_permissions
+	step permissions fix_permissions
 
 	# make sure we start runjobs every minute for updates
-	add_crontab_entry
+	step crontab add_crontab_entry
 
 	echo "MediaWiki setup complete!"
 }
@@ -498,18 +557,19 @@ while [[ $# -gt 0 ]]; do
     	;;
     --settings)      export SETTINGS="${2:?missing FILE}";  shift ;;
     --mysql-root-password) export MYSQL_ROOT_PASSWORD="${2:?missing PWD}"; shift ;;
-    --install-files) install_files ;;
-    --initdb)        initdb ;;
-    --grant)         grant_permissions;;
-    --extensions)    do_extensions ;;
-    --fixmariadb)    fix_mariadb;;
-    --permissions)   fix_permissions ;;
-    --composer)      do_composer_update ;;
-    --update)        run_update ;;
-    --short-urls)    short_urls_htaccess ;;
-    --sysop)         do_sysop ;;
-    --lang-images)   lang_images "${WEB_DIR}/images" ;;
-    --crontab)       add_crontab_entry ;;
+    --install-files) step install-files install_files ;;
+    --update-files)  step update-files update_files ;;
+    --initdb)        step initdb initdb ;;
+    --grant)         step grant grant_permissions;;
+    --extensions)    step extensions do_extensions ;;
+    --fixmariadb)    step fix-mariadb fix_mariadb;;
+    --permissions)   step permissions fix_permissions ;;
+    --composer)      step composer do_composer_update ;;
+    --update)        step update run_update ;;
+    --short-urls)    step short-urls short_urls_htaccess ;;
+    --sysop)         step sysop do_sysop ;;
+    --lang-images)   step lang-images lang_images "${WEB_DIR}/images" ;;
+    --crontab)       step crontab add_crontab_entry ;;
     --start-runjobs) start_runJobs ;;
     --all)           all;;
     -h|--help)       usage; exit 0 ;;
@@ -0,0 +1,123 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from mwdocker.exec_log import LogLine
+
+
+@dataclass
+class SetupStep:
+    """
+    a step of setup-mediawiki.sh as reported by its step markers
+    """
+
+    name: str
+    # unix timestamps of the start and end markers
+    start: float
+    end: Optional[float] = None
+    # the exit status - None if the step did not end
+    status: Optional[int] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        the duration in seconds - None if the step did not end
+        """
+        duration = None if self.end is None else self.end - self.start
+        return duration
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 0
+
+
+@dataclass
+class SetupStepReport:
+    """
+    the per step durations of a run of setup-mediawiki.sh parsed
+    from the step markers in the exec output
+    """
+
+    app: str = ""
+    steps: List[SetupStep] = field(default_factory=list)
+
+    # e.g. ##pmwd-step end name=composer ts=1760000000.123456789 status=0
+    marker_pattern = re.compile(
+        r"##pmwd-step (?P<event>start|end) name=(?P<name>\S+) ts=(?P<ts>[0-9.]+)"
+        r"(?: status=(?P<status>\d+))?"
+    )
+
+    def parse(self, line: str) -> bool:
+        """
+        parse the given line of output
+
+        Args:
+            line(str): the line
+
+        Returns:
+            bool: True if the line is a step marker
+        """
+        match = self.marker_pattern.search(line)
+        if match is None:
+            return False
+        timestamp = float(match.group("ts"))
+        name = match.group("name")
+        if match.group("event") == "start":
+            self.steps.append(SetupStep(name=name, start=timestamp))
+        else:
+            for setup_step in reversed(self.steps):
+                if setup_step.name == name and setup_step.end is None:
+                    setup_step.end = timestamp
+                    status = match.group("status")
+                    setup_step.status = int(status) if status is not None else None
+                    break
+        return True
+
+    def onLogLine(self, log_line: LogLine):
+        """
+        listener for the lines of an ExecLog
+        """
+        self.parse(log_line.text)
+
+    def getDurations(self) -> Dict[str, float]:
+        """
+        get the total durations by step name - steps may run more than once
+
+        Returns:
+            dict: seconds by step name in the order of the first run
+        """
+        durations = {}
+        for setup_step in self.steps:
+            if setup_step.duration is not None:
+                durations[setup_step.name] = (
+                    durations.get(setup_step.name, 0.0) + setup_step.duration
+                )
+        return durations
+
+    def show(self):
+        """
+        show the report as a table with the slowest steps first
+        """
+        from tabulate import tabulate
+
+        rows = []
+        for setup_step in sorted(
+            self.steps, key=lambda s: s.duration or 0.0, reverse=True
+        ):
+            duration = setup_step.duration
+            rows.append(
+                {
+                    "app": self.app,
+                    "step": setup_step.name,
+                    "seconds": round(duration, 2) if duration is not None else "",
+                    "status": "✅" if setup_step.ok else "❌",
+                }
+            )
+        if rows:
+            print(tabulate(rows, headers="keys"))
@@ -0,0 +1,272 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import List, Optional
+
+
+@dataclass
+class AppState:
+    """
+    the last known state of a docker application of a cluster
+    """
+
+    # the container base name e.g. mw-139
+    app: str
+    cluster: str
+    version: str
+    port: Optional[int] = None
+    sql_port: Optional[int] = None
+    url: Optional[str] = None
+    docker_path: Optional[str] = None
+    mw_container: Optional[str] = None
+    db_container: Optional[str] = None
+    mw_container_id: Optional[str] = None
+    db_container_id: Optional[str] = None
+    extensions: List[str] = field(default_factory=list)
+    # generated, started, down or failed
+    status: Optional[str] = None
+    # the result of the last check - None if never checked
+    healthy: Optional[bool] = None
+    last_action: Optional[str] = None
+    # seconds the last action took
+    last_duration: Optional[float] = None
+    # unix timestamp of the last update
+    updated: Optional[float] = None
+
+    @classmethod
+    def fromApp(cls, mwApp, cluster: str = None) -> "AppState":
+        """
+        get the state of the given DockerApplication from its config
+
+        Args:
+            mwApp(DockerApplication): the app
+            cluster(str): the name of the cluster - the prefix of the app config if None
+        """
+        config = mwApp.config
+        extension_map = getattr(config, "extensionMap", None) or {}
+        app_state = cls(
+            app=config.container_base_name,
+            cluster=cluster or config.prefix,
+            version=config.version,
+            port=config.port,
+            sql_port=config.sql_port,
+            url=config.full_url,
+            docker_path=mwApp.docker_path,
+            mw_container=mwApp.getContainerName("mw", "-"),
+            db_container=config.db_container_name,
+            extensions=sorted(extension_map),
+        )
+        return app_state
+
+
+class StateStore:
+    """
+    SQLite store of the states of the apps of all clusters
+    keyed by cluster and app and indexed by version and status so that
+    listing hundreds of wikis is a single query
+    """
+
+    # increase when the schema changes - older tables are recreated
+    schema_version = 2
+
+    # the columns identifying an app
+    key_columns = ("cluster", "app")
+
+    # column types of the app table - the other AppState fields are TEXT
+    column_types = {
+        "port": "INTEGER",
+        "sql_port": "INTEGER",
+        "healthy": "INTEGER",
+        "last_duration": "REAL",
+        "updated": "REAL",
+    }
+
+    def __init__(self, path: str):
+        """
+        constructor
+
+        Args:
+            path(str): the path of the SQLite database file - ":memory:" for tests
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lock = threading.Lock()
+        # the apps of a cluster are updated from the threads of runForApps
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=10.0)
+        self.connection.row_factory = sqlite3.Row
+        self.columns = [state_field.name for state_field in fields(AppState)]
+        self.createSchema()
+
+    def createSchema(self):
+        """
+        create the app table and its indices if needed
+        """
+        with self.lock, self.connection:
+            user_version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            if user_version != self.schema_version:
+                self.connection.execute("DROP TABLE IF EXISTS app")
+            column_ddl = ",\n".join(
+                f"{column} {self.column_types.get(column, 'TEXT')}"
+                for column in self.columns
+            )
+            primary_key = ", ".join(self.key_columns)
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS app (\n{column_ddl},\nPRIMARY KEY ({primary_key})\n)"
+            )
+            # the primary key already indexes the cluster
+            for column in ["version", "status"]:
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS app_{column} ON app({column})"
+                )
+            self.connection.execute(f"PRAGMA user_version={self.schema_version}")
+
+    def toRow(self, app_state: AppState) -> dict:
+        """
+        convert the given state to a table row
+        """
+        row = asdict(app_state)
+        row["extensions"] = json.dumps(row["extensions"])
+        if row["healthy"] is not None:
+            row["healthy"] = int(row["healthy"])
+        return row
+
+    def fromRow(self, row: sqlite3.Row) -> AppState:
+        """
+        convert the given table row to a state
+        """
+        values = dict(row)
+        values["extensions"] = json.loads(values["extensions"] or "[]")
+        if values["healthy"] is not None:
+            values["healthy"] = bool(values["healthy"])
+        app_state = AppState(**values)
+        return app_state
+
+    def upsert(self, app_state: AppState) -> AppState:
+        """
+        insert or replace the configuration of the given app keeping
+        the container ids, status and results of an existing entry if not given
+
+        Args:
+            app_state(AppState): the state to store
+
+        Returns:
+            AppState: the stored state
+        """
+        app_state.updated = time.time()
+        row = self.toRow(app_state)
+        columns = ", ".join(self.columns)
+        params = ", ".join(f":{column}" for column in self.columns)
+        updates = ", ".join(
+            f"{column}=coalesce(excluded.{column}, {column})"
+            for column in self.columns
+            if column not in self.key_columns
+        )
+        primary_key = ", ".join(self.key_columns)
+        sql = f"INSERT INTO app ({columns}) VALUES ({params}) ON CONFLICT({primary_key}) DO UPDATE SET {updates}"
+        with self.lock, self.connection:
+            self.connection.execute(sql, row)
+        return app_state
+
+    def update(self, cluster: str, app: str, **values) -> bool:
+        """
+        update the given fields of the given app
+
+        Args:
+            cluster(str): the name of the cluster
+            app(str): the name of the app
+            values: the AppState fields to update
+
+        Returns:
+            bool: True if the app is known
+        """
+        unknown = set(values) - (set(self.columns) - set(self.key_columns))
+        if unknown:
+            raise ValueError(f"unknown app state fields {sorted(unknown)}")
+        values["updated"] = time.time()
+        if "healthy" in values and values["healthy"] is not None:
+            values["healthy"] = int(values["healthy"])
+        if "extensions" in values:
+            values["extensions"] = json.dumps(values["extensions"])
+        assignments = ", ".join(f"{column}=:{column}" for column in values)
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                f"UPDATE app SET {assignments} WHERE cluster=:cluster AND app=:app",
+                {**values, "cluster": cluster, "app": app},
+            )
+        return cursor.rowcount > 0
+
+    def get(self, cluster: str, app: str) -> Optional[AppState]:
+        """
+        get the state of the given app of the given cluster
+
+        Returns:
+            AppState: the state or None if the app is not known
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT * FROM app WHERE cluster=? AND app=?", (cluster, app)
+            ).fetchone()
+        app_state = self.fromRow(row) if row is not None else None
+        return app_state
+
+    def query(
+        self, cluster: str = None, status: str = None, version: str = None
+    ) -> List[AppState]:
+        """
+        query the states of the apps with an index lookup
+
+        Args:
+            cluster(str): only the apps of the given cluster
+            status(str): only the apps with the given status
+            version(str): only the apps of the given MediaWiki version
+
+        Returns:
+            list: the states ordered by port and name
+        """
+        conditions = []
+        params = {}
+        for column, value in [
+            ("cluster", cluster),
+            ("status", status),
+            ("version", version),
+        ]:
+            if value is not None:
+                conditions.append(f"{column}=:{column}")
+                params[column] = value
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT * FROM app{where} ORDER BY port, app", params
+            ).fetchall()
+        app_states = [self.fromRow(row) for row in rows]
+        return app_states
+
+    def remove(self, cluster: str, app: str) -> bool:
+        """
+        remove the given app of the given cluster
+
+        Returns:
+            bool: True if the app was known
+        """
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "DELETE FROM app WHERE cluster=? AND app=?", (cluster, app)
+            )
+        return cursor.rowcount > 0
+
+    def close(self):
+        """
+        close the database connection
+        """
+        with self.lock:
+            self.connection.close()
@@ -6,8 +6,6 @@ Created on 2020-08-20
 
 from urllib.request import Request, urlopen
 
-from bs4 import BeautifulSoup
-
 
 class WebScrape(object):
     """
@@ -23,15 +21,22 @@ class WebScrape(object):
         self.debug = debug
         self.showHtml = showHtml
 
-    def getSoup(self, url, showHtml):
+    def getSoup(self, url, showHtml, timeout: float = None):
         """
         get the beautiful Soup parser
 
         Args:
            showHtml(boolean): True if the html code should be pretty printed and shown
+           timeout(float): the timeout in seconds for blocking operations - None for no timeout
         """
+        # bs4 is only needed when scraping so it is not imported on startup
+        from bs4 import BeautifulSoup
+
         req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        html = urlopen(req).read()
+        if timeout is None:
+            html = urlopen(req).read()
+        else:
+            html = urlopen(req, timeout=timeout).read()
         soup = BeautifulSoup(html, "html.parser", from_encoding="utf-8")
         if showHtml:
             self.printPrettyHtml(soup)
@@ -0,0 +1,409 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+
+offline micro benchmarks of the python control plane
+
+runs against an in-process fake docker backend for synthetic clusters
+of 1, 10 and 100 wikis and saves the results as JSON so that runs of
+different commits can be compared:
+
+    python -m tests.benchmark --output before.json
+    python -m tests.benchmark --baseline before.json
+"""
+
+import html
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+from tabulate import tabulate
+
+from mwdocker.config import MwConfig
+from mwdocker.docker import DockerApplication
+from mwdocker.docker_backend import DockerBackend
+from mwdocker.docker_map import DockerMap
+from mwdocker.html_table import HtmlTables
+from mwdocker.mw import ExtensionList
+from mwdocker.mwdocker_cmd import MediaWikiDockerCmd
+from tests.fake_docker import FakeDockerBackend
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    the timing of a benchmark case at a given scale
+    """
+
+    name: str
+    scale: int
+    repeat: int
+    # seconds of the fastest and the median repetition
+    best: float
+    median: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.scale}]"
+
+
+class Benchmark:
+    """
+    micro benchmarks of the config, extension, generation, scraping
+    and container lookup code for synthetic clusters of wikis
+    """
+
+    # the base versions of the synthetic wikis
+    base_versions = ["1.35", "1.39", "1.43", "1.44", "1.45"]
+    # the extensions of the synthetic wikis
+    extension_names = ["Admin Links", "Header Tabs", "MagicNoCache", "Variables"]
+
+    def __init__(self, scales: List[int] = None, repeat: int = 5, debug=False):
+        """
+        constructor
+
+        Args:
+            scales(list): the numbers of wikis of the synthetic clusters
+            repeat(int): the number of repetitions of each case
+            debug(bool): if True show each result when measured
+        """
+        self.scales = scales or [1, 10, 100]
+        self.repeat = repeat
+        self.debug = debug
+        self.results: List[BenchmarkResult] = []
+        self.cases: Dict[str, Callable[[int], Callable[[], None]]] = {
+            "config_create": self.prepareConfigCreate,
+            "config_fromArgs": self.prepareFromArgs,
+            "extension_map": self.prepareExtensionMap,
+            "generate_all": self.prepareGenerateAll,
+            "html_tables": self.prepareHtmlTables,
+            "docker_map": self.prepareDockerMap,
+        }
+        self.tmpdir = None
+
+    def getVersions(self, scale: int) -> List[str]:
+        """
+        get distinct synthetic MediaWiki versions for the given number of wikis
+        """
+        count = len(self.base_versions)
+        versions = [
+            f"{self.base_versions[i % count]}.{i // count + 1}" for i in range(scale)
+        ]
+        return versions
+
+    def getConfig(self, i: int, version: str, docker_path: str = None) -> MwConfig:
+        """
+        get the config of the i-th synthetic wiki
+        """
+        config = MwConfig(
+            version=version,
+            prefix=f"bench{i}",
+            port=9080 + i,
+            sql_port=9306 + i,
+            host="localhost",
+            docker_path=docker_path,
+            mySQLRootPassword="root",
+        )
+        return config
+
+    def prepareConfigCreate(self, scale: int) -> Callable[[], None]:
+        versions = self.getVersions(scale)
+
+        def run():
+            for i, version in enumerate(versions):
+                self.getConfig(i, version, self.tmpdir)
+
+        return run
+
+    def prepareFromArgs(self, scale: int) -> Callable[[], None]:
+        argv = ["--host", "localhost", "--quiet", "-vl"] + self.getVersions(scale)
+        argv += ["-el"] + self.extension_names
+
+        def run():
+            MediaWikiDockerCmd().getMwConfig(argv)
+
+        return run
+
+    def prepareExtensionMap(self, scale: int) -> Callable[[], None]:
+        configs = [
+            self.getConfig(i, version, self.tmpdir)
+            for i, version in enumerate(self.getVersions(scale))
+        ]
+
+        def run():
+            for config in configs:
+                config.getExtensionMap(self.extension_names)
+
+        return run
+
+    def prepareGenerateAll(self, scale: int) -> Callable[[], None]:
+        # a fresh directory per repetition so that every file is generated
+        docker_path = tempfile.mkdtemp(dir=self.tmpdir)
+        apps = []
+        for i, version in enumerate(self.getVersions(scale)):
+            config = self.getConfig(i, version, docker_path)
+            config.verbose = False
+            config.getExtensionMap(self.extension_names)
+            apps.append(DockerApplication(config))
+
+        def run():
+            for mwApp in apps:
+                mwApp.generateAll(overwrite=True)
+
+        return run
+
+    @classmethod
+    def getSpecialVersionHtml(cls, extension_list: ExtensionList) -> str:
+        """
+        get a Special:Version page in the markup of MediaWiki for the given extensions
+        """
+        rows = []
+        for ext in extension_list.extensions:
+            name = html.escape(ext.name)
+            purpose = html.escape((ext.purpose or "").strip())
+            ext_id = name.replace(" ", "_")
+            rows.append(
+                f'<tr class="mw-version-ext" id="mw-version-ext-other-{ext_id}">'
+                f'<td><a class="mw-version-ext-name" href="{html.escape(ext.url)}">{name}</a></td>'
+                f'<td><span class="mw-version-ext-version">1.0</span></td>'
+                f"<td>GPL-2.0-or-later</td>"
+                f'<td class="mw-version-ext-description">{purpose}</td>'
+                f"<td>wf</td></tr>"
+            )
+        page = f"""<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>Version - Benchmark Wiki</title></head>
+<body><div id="mw-content-text">
+<h2 id="mw-version-software">Installed software</h2>
+<table class="wikitable plainlinks" id="sv-software">
+<tr><th>Product</th><th>Version</th></tr>
+<tr><td>MediaWiki</td><td>1.39.17</td></tr>
+<tr><td>PHP</td><td>8.1.2 (apache2handler)</td></tr>
+<tr><td>MariaDB</td><td>10.11.6-MariaDB</td></tr>
+</table>
+<h2 id="mw-version-ext">Installed extensions</h2>
+<table class="wikitable plainlinks mw-installed-software" id="sv-ext-other">
+<tr><th colspan="5" id="mw-version-ext-other">Other</th></tr>
+<tr><th>Extension</th><th>Version</th><th>License</th><th>Description</th><th>Authors</th></tr>
+{chr(10).join(rows)}
+</table>
+</div></body></html>
+"""
+        return page
+
+    def prepareHtmlTables(self, scale: int) -> Callable[[], None]:
+        page_path = os.path.join(self.tmpdir, "Special_Version.html")
+        if not os.path.isfile(page_path):
+            with open(page_path, "w", encoding="utf-8") as page_file:
+                page_file.write(self.getSpecialVersionHtml(ExtensionList.restore()))
+        url = f"file://{page_path}"
+
+        def run():
+            for _i in range(scale):
+                tables = HtmlTables(url).get_tables("h2")
+                assert "Installed extensions" in tables
+
+        return run
+
+    def prepareDockerMap(self, scale: int) -> Callable[[], None]:
+        backend = FakeDockerBackend()
+        names = []
+        for i, version in enumerate(self.getVersions(scale)):
+            app = self.getConfig(i, version).container_base_name
+            backend.addApp(app, version)
+            names.extend([f"{app}-mw", f"{app}-db"])
+        DockerBackend.setBackend(backend)
+        DockerMap.invalidate()
+
+        def run():
+            DockerMap.refresh()
+            for name in names:
+                DockerMap.getContainer(name)
+                DockerMap.findRunningContainer(name)
+                DockerMap.getEnv(name)
+            # a container that is not in the snapshot is inspected directly
+            DockerMap.findRunningContainer("unknown-mw")
+
+        return run
+
+    def measure(self, name: str, scale: int) -> BenchmarkResult:
+        """
+        measure the given case at the given scale - preparation is not timed
+
+        Args:
+            name(str): the name of the case
+            scale(int): the number of wikis
+
+        Returns:
+            BenchmarkResult: the result
+        """
+        prepare = self.cases[name]
+        durations = []
+        try:
+            for _i in range(self.repeat):
+                run = prepare(scale)
+                start_time = time.perf_counter()
+                run()
+                durations.append(time.perf_counter() - start_time)
+        finally:
+            DockerBackend.setBackend(None)
+            DockerMap.invalidate()
+        result = BenchmarkResult(
+            name=name,
+            scale=scale,
+            repeat=self.repeat,
+            best=min(durations),
+            median=statistics.median(durations),
+        )
+        self.results.append(result)
+        if self.debug:
+            print(f"{result.key}: {result.best*1000:.2f} ms")
+        return result
+
+    def run(self, names: List[str] = None) -> List[BenchmarkResult]:
+        """
+        run the given cases at all my scales
+
+        Args:
+            names(list): the names of the cases - all if None
+
+        Returns:
+            list: the results
+        """
+        names = names or list(self.cases)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.tmpdir = tmpdir
+            for name in names:
+                for scale in self.scales:
+                    self.measure(name, scale)
+        self.tmpdir = None
+        return self.results
+
+    @classmethod
+    def getCommit(cls) -> Optional[str]:
+        """
+        get the git commit of the working tree if available
+        """
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                timeout=10,
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            commit = None
+        return commit or None
+
+    def as_dict(self) -> dict:
+        """
+        get the results with the environment they were measured in
+        """
+        bench = {
+            "commit": self.getCommit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "results": [asdict(result) for result in self.results],
+        }
+        return bench
+
+    def save(self, path: str):
+        """
+        save my results as JSON to the given path
+        """
+        with open(path, "w") as json_file:
+            json.dump(self.as_dict(), json_file, indent=2)
+
+    def compare(self, baseline: dict, threshold: float = 1.25) -> List[dict]:
+        """
+        compare my results with the given baseline results
+
+        Args:
+            baseline(dict): the results of a previous run as saved
+            threshold(float): the ratio of the best times at which a case is flagged
+
+        Returns:
+            list: a comparison row per case measured in both runs
+        """
+        baseline_results = {
+            f"{result['name']}[{result['scale']}]": result
+            for result in baseline.get("results", [])
+        }
+        rows = []
+        for result in self.results:
+            base = baseline_results.get(result.key)
+            if base is None or base["best"] <= 0:
+                continue
+            ratio = result.best / base["best"]
+            rows.append(
+                {
+                    "case": result.key,
+                    "baseline ms": round(base["best"] * 1000, 2),
+                    "ms": round(result.best * 1000, 2),
+                    "ratio": round(ratio, 2),
+                    "slower": ratio > threshold,
+                }
+            )
+        return rows
+
+    def show(self):
+        """
+        show my results as a table
+        """
+        rows = [
+            {
+                "case": result.key,
+                "best ms": round(result.best * 1000, 2),
+                "median ms": round(result.median * 1000, 2),
+                "ms/wiki": round(result.best * 1000 / result.scale, 3),
+            }
+            for result in self.results
+        ]
+        print(tabulate(rows, headers="keys"))
+
+
+def main(argv=None) -> int:
+    parser = ArgumentParser(description="offline micro benchmarks of mwdocker")
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=[1, 10, 100], help="numbers of wikis"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", nargs="+", help="the cases to run [default: all]")
+    parser.add_argument("--output", help="save the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare with the results in this file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="ratio at which a case counts as slower [default: %(default)s]",
+    )
+    args = parser.parse_args(argv)
+    benchmark = Benchmark(scales=args.scales, repeat=args.repeat)
+    benchmark.run(args.cases)
+    benchmark.show()
+    if args.output:
+        benchmark.save(args.output)
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as json_file:
+            baseline = json.load(json_file)
+        rows = benchmark.compare(baseline, threshold=args.threshold)
+        print(f"compared with {baseline.get('commit')}:")
+        print(tabulate(rows, headers="keys"))
+        if any(row["slower"] for row in rows):
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
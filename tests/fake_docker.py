@@ -0,0 +1,160 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from mwdocker.config import MwClusterConfig
+from mwdocker.docker_backend import (
+    ContainerConfig,
+    ContainerState,
+    DockerBackend,
+    EventStream,
+    HostConfig,
+    LogStream,
+    PortBinding,
+)
+from mwdocker.docker_map import DockerMap
+from mwdocker.mwcluster import MediaWikiCluster
+
+
+@dataclass
+class FakeContainer:
+    """
+    a container of the fake docker backend
+    """
+
+    name: str
+    id: str = ""
+    state: ContainerState = field(default_factory=lambda: ContainerState(True))
+    config: ContainerConfig = field(default_factory=ContainerConfig)
+    host_config: HostConfig = field(default_factory=HostConfig)
+
+    def stop(self):
+        self.state.running = False
+
+    def remove(self):
+        pass
+
+
+class FakeDockerBackend(DockerBackend):
+    """
+    in-process docker backend with synthetic containers
+    """
+
+    name = "fake"
+
+    def __init__(self):
+        """
+        constructor
+        """
+        self.containers: Dict[str, FakeContainer] = {}
+        # the commands executed in the containers
+        self.executed: List[Tuple[str, List[str]]] = []
+        # the connected containers and aliases by network name
+        self.networks: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+
+    def addApp(self, app: str, version: str, cluster: str = "bench", port: int = None):
+        """
+        add the mw and db containers of the given app
+
+        Args:
+            app(str): the container base name
+            version(str): the MediaWiki version
+            cluster(str): the name of the cluster
+            port(int): the host port of the webserver - no port binding if None
+        """
+        for kind in ["mw", "db"]:
+            name = f"{app}-{kind}"
+            labels = DockerMap.getLabels(cluster=cluster, app=app, version=version)
+            labels[f"{DockerMap.label_prefix}.kind"] = kind
+            env = ["MYSQL_ROOT_PASSWORD=root", f"MW_VERSION={version}"]
+            host_config = HostConfig()
+            if kind == "mw" and port is not None:
+                host_config.port_bindings["80/tcp"] = [
+                    PortBinding(host_ip="0.0.0.0", host_port=str(port))
+                ]
+            self.containers[name] = FakeContainer(
+                name=name,
+                id=f"{len(self.containers):064x}",
+                config=ContainerConfig(env=env, labels=labels),
+                host_config=host_config,
+            )
+
+    def listContainers(self, labels: Dict[str, str] = None) -> List[FakeContainer]:
+        containers = []
+        for container in self.containers.values():
+            container_labels = container.config.labels
+            matches = all(
+                key in container_labels
+                and (value is None or container_labels[key] == value)
+                for key, value in (labels or {}).items()
+            )
+            if matches and container.state.running:
+                containers.append(container)
+        return containers
+
+    def inspectContainer(self, container_name: str) -> Optional[FakeContainer]:
+        return self.containers.get(container_name)
+
+    def logs(self, container_name: str, tail: int = None, since: float = None) -> str:
+        return ""
+
+    def followLogs(self, container_name: str, since: float = None) -> LogStream:
+        return LogStream(iter([]))
+
+    def volumeExists(self, volume_name: str) -> bool:
+        return False
+
+    def openEvents(self, filters: Dict[str, List[str]]) -> EventStream:
+        return EventStream(iter([]))
+
+    def removeVolume(self, volume_name: str):
+        pass
+
+    def execute(
+        self, container_name: str, command: List[str]
+    ) -> Iterator[Tuple[str, bytes]]:
+        self.executed.append((container_name, command))
+        return iter([])
+
+    def listNetworks(self) -> List[str]:
+        return list(self.networks)
+
+    def createNetwork(self, network_name: str):
+        self.networks[network_name] = []
+
+    def connectNetwork(self, network_name: str, container_name: str, alias: str = None):
+        self.networks[network_name].append((container_name, alias))
+
+
+def getTestCluster(versions: List[str], docker_path: str, **values) -> MediaWikiCluster:
+    """
+    get a cluster with real docker applications for the given versions
+
+    the applications only need docker for their docker calls which can
+    be answered by a FakeDockerBackend or stubbed by the test
+
+    Args:
+        versions(list): the MediaWiki versions
+        docker_path(str): the docker path e.g. of a temporary directory
+        values: further configuration values
+
+    Returns:
+        MediaWikiCluster: the cluster with its apps
+    """
+    values = {
+        "host": "localhost",
+        "mySQLRootPassword": "root",
+        "verbose": False,
+        **values,
+    }
+    config = MwClusterConfig(versions=versions, docker_path=docker_path, **values)
+    config.extensionMap = {}
+    cluster = MediaWikiCluster(config)
+    for i, version in enumerate(versions):
+        cluster.apps[version] = cluster.getDockerApplication(i, len(versions), version)
+    return cluster
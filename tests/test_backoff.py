@@ -0,0 +1,45 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+from basemkit.basetest import Basetest
+
+from mwdocker.backoff import Backoff
+
+
+class TestBackoff(Basetest):
+    """
+    test the jittered exponential backoff
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def testDelays(self):
+        """
+        test that the jittered delays grow up to the maximum
+        """
+        backoff = Backoff()
+        delays = backoff.delays()
+        for i in range(20):
+            delay = next(delays)
+            expected = min(backoff.initial * backoff.factor**i, backoff.maximum)
+            self.assertLessEqual(delay, expected)
+            self.assertGreaterEqual(delay, expected * (1.0 - backoff.jitter))
+
+    def testGetTries(self):
+        """
+        test the number of tries needed to cover a duration
+        """
+        backoff = Backoff()
+        self.assertEqual(0, backoff.getTries(0.0))
+        self.assertEqual(1, backoff.getTries(0.1))
+        # 0.1 + 0.15 + 0.225
+        self.assertEqual(3, backoff.getTries(0.4))
+        tries = backoff.getTries(150.0)
+        if self.debug:
+            print(f"{tries} tries cover 150s")
+        # the first 8 delays sum up to about 5s the others are 2s each
+        self.assertEqual(81, tries)
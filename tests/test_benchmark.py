@@ -0,0 +1,45 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import os
+import tempfile
+
+from basemkit.basetest import Basetest
+
+from tests.benchmark import Benchmark
+
+
+class TestBenchmark(Basetest):
+    """
+    test the offline micro benchmark suite at a small scale
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def testBenchmark(self):
+        """
+        test running all cases and comparing with a baseline
+        """
+        benchmark = Benchmark(scales=[1, 2], repeat=1, debug=self.debug)
+        results = benchmark.run()
+        self.assertEqual(2 * len(benchmark.cases), len(results))
+        self.assertTrue(all(result.best > 0 for result in results))
+        if self.debug:
+            benchmark.show()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path = os.path.join(tmpdir, "bench.json")
+            benchmark.save(json_path)
+            with open(json_path) as json_file:
+                baseline = json.load(json_file)
+        # a baseline twice as fast flags every case
+        for result in baseline["results"]:
+            result["best"] /= 2
+        rows = benchmark.compare(baseline)
+        self.assertEqual(len(results), len(rows))
+        self.assertTrue(all(row["slower"] for row in rows))
+        self.assertFalse(any(row["slower"] for row in benchmark.compare(baseline, 3.0)))
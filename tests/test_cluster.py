@@ -0,0 +1,362 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import yaml
+from basemkit.basetest import Basetest
+
+from mwdocker.config import MwClusterConfig
+from mwdocker.docker import DockerApplication, WikiCheck
+from mwdocker.docker_backend import DockerBackend
+from mwdocker.docker_map import DockerMap
+from mwdocker.mwcluster import MediaWikiCluster
+from tests.fake_docker import FakeDockerBackend, getTestCluster
+
+
+class TestCluster(Basetest):
+    """
+    test the MediaWiki cluster handling without docker
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.docker_path = self.tmpdir.name
+
+    def tearDown(self):
+        DockerBackend.setBackend(None)
+        DockerMap.invalidate()
+        self.tmpdir.cleanup()
+        Basetest.tearDown(self)
+
+    def getCluster(self, versions: list) -> MediaWikiCluster:
+        """
+        get a cluster with real apps for the given versions
+        """
+        cluster = getTestCluster(versions, self.docker_path)
+        return cluster
+
+    def testRunForAppsParallel(self):
+        """
+        test that apps are handled concurrently and failures are collected
+        """
+        versions = ["1.35.13", "1.39.17", "1.43.9", "1.44.6"]
+        cluster = self.getCluster(versions)
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def action(mwApp) -> int:
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.1)
+            with lock:
+                active["now"] -= 1
+            if mwApp.config.version == "1.43.9":
+                raise ValueError("simulated failure")
+            return 0
+
+        results = cluster.runForApps(action, max_workers=2)
+        self.assertEqual(versions, list(results.keys()))
+        self.assertEqual(2, active["max"])
+        failed = [result.version for result in results.values() if not result.ok]
+        self.assertEqual(["1.43.9"], failed)
+        exitCode = cluster.reportResults("start", results)
+        self.assertEqual(1, exitCode)
+
+    def testRunForAppsSerial(self):
+        """
+        test the serial mode
+        """
+        versions = ["1.39.17", "1.43.9"]
+        cluster = self.getCluster(versions)
+        results = cluster.runForApps(lambda mwApp: None)
+        self.assertTrue(all(result.ok for result in results.values()))
+        self.assertEqual(0, cluster.reportResults("start", results))
+
+    def testGenerateApps(self):
+        """
+        test the concurrent generation of the app config files
+        """
+        versions = ["1.35.13", "1.39.17", "1.43.9"]
+        cluster = self.getCluster(versions)
+        generated = []
+        for mwApp in cluster.apps.values():
+            mwApp.generateAll = lambda overwrite, mwApp=mwApp: generated.append(
+                mwApp.config.version
+            )
+        cluster.generateApps(max_workers=3)
+        self.assertEqual(sorted(versions), sorted(generated))
+        self.assertEqual(versions, list(cluster.apps.keys()))
+
+        def fail(overwrite):
+            raise ValueError("template failure")
+
+        cluster.apps["1.39.17"].generateAll = fail
+        with self.assertRaises(ValueError):
+            cluster.generateApps(max_workers=3)
+
+    def testReadOnlyApps(self):
+        """
+        test that read only apps use the saved configuration and
+        do not touch the docker path
+        """
+        with tempfile.TemporaryDirectory() as docker_path:
+            config = MwClusterConfig(
+                versions=["1.39.17", "1.43.9"], docker_path=docker_path
+            )
+            config.extensionMap = {}
+            cluster = MediaWikiCluster(config)
+            mwApp = cluster.getDockerApplication(0, 2, "1.39.17", fromSaved=True)
+            self.assertEqual([], os.listdir(docker_path))
+            mwApp.config.port = 9999
+            mwApp.config.save()
+            mwApp = cluster.getDockerApplication(0, 2, "1.39.17", fromSaved=True)
+            self.assertEqual(9999, mwApp.config.port)
+            self.assertEqual({}, mwApp.config.extensionMap)
+
+    def testGenerateClusterCompose(self):
+        """
+        test generating a single compose project for the cluster
+        """
+        versions = ["1.39.17", "1.43.9"]
+        cluster = self.getCluster(versions)
+        compose_path = cluster.generateCompose()
+        with open(compose_path) as compose_file:
+            compose = yaml.safe_load(compose_file)
+        if self.debug:
+            print(yaml.dump(compose))
+        services = compose["services"]
+        self.assertEqual(
+            ["mw-139-db", "mw-139-mw", "mw-143-db", "mw-143-mw"], sorted(services)
+        )
+        self.assertEqual(["mw-139-net", "mw-143-net"], sorted(compose["networks"]))
+        self.assertNotIn("links", services["mw-143-mw"])
+        self.assertEqual(["mw-143-net"], services["mw-143-mw"]["networks"])
+        self.assertEqual(
+            {"mw-143-net": {"aliases": ["db"]}}, services["mw-143-db"]["networks"]
+        )
+        self.assertEqual(["9081:80"], services["mw-143-mw"]["ports"])
+        labels = services["mw-143-db"]["labels"]
+        self.assertEqual("mw-143", labels["pymediawikidocker.app"])
+        self.assertEqual("db", labels["pymediawikidocker.kind"])
+        self.assertIn("healthcheck", services["mw-143-db"])
+        timings = cluster.metrics.getTimings()
+        self.assertEqual(["mwClusterCompose.yml"], [t.detail for t in timings])
+        self.assertEqual(
+            {"mw-143-db": {"condition": "service_healthy"}},
+            services["mw-143-mw"]["depends_on"],
+        )
+        volumes = compose["volumes"]
+        self.assertEqual("mw-139_mysql-data", volumes["mw-139-mysql-data"]["name"])
+        self.assertEqual(
+            "mw-143-mysql-data", services["mw-143-db"]["volumes"][0]["source"]
+        )
+
+    def testAdoptContainers(self):
+        """
+        test that the containers of the single wiki compose projects
+        are removed before the cluster compose project is started
+        """
+        cluster = self.getCluster(["1.39.17", "1.43.9"])
+        backend = FakeDockerBackend()
+        backend.addApp("mw-139", "1.39.17")
+        backend.addApp("mw-143", "1.43.9")
+        for kind in ["mw", "db"]:
+            labels = backend.containers[f"mw-139-{kind}"].config.labels
+            labels[cluster.compose_project_label] = "mw-139"
+            labels = backend.containers[f"mw-143-{kind}"].config.labels
+            labels[cluster.compose_project_label] = cluster.cluster_project_name
+        DockerBackend.setBackend(backend)
+        removed = cluster.adoptContainers()
+        self.assertEqual(["mw-139-db", "mw-139-mw"], removed)
+        self.assertFalse(backend.containers["mw-139-mw"].state.running)
+        self.assertTrue(backend.containers["mw-143-mw"].state.running)
+
+        def remove():
+            raise Exception("removal of container mw-143-db failed")
+
+        backend.containers["mw-143-db"].config.labels[
+            cluster.compose_project_label
+        ] = "mw-143"
+        backend.containers["mw-143-db"].remove = remove
+        with self.assertRaises(ValueError) as context:
+            cluster.adoptContainers()
+        self.assertIn(
+            "clashes with the cluster compose project", str(context.exception)
+        )
+
+    def testBuildImages(self):
+        """
+        test the cluster build stage builds each distinct image once
+        """
+        versions = ["1.39.17", "1.43.9", "1.44.6"]
+        cluster = self.getCluster(versions)
+        built = []
+        for mwApp in cluster.apps.values():
+            tag = f"mediawiki:{mwApp.config.version[:4]}"
+            mwApp.getImageTag = lambda tag=tag: tag
+            mwApp.buildImage = lambda force, mwApp=mwApp: built.append(
+                mwApp.config.version
+            ) or SimpleNamespace(built=True, duration=0.1)
+        # two apps share the same image
+        cluster.apps["1.44.6"].getImageTag = lambda: "mediawiki:1.43"
+        exitCode = cluster.buildImages(force=True, max_workers=2)
+        self.assertEqual(0, exitCode)
+        self.assertEqual(["1.39.17", "1.43.9"], sorted(built))
+
+    def testCheck(self):
+        """
+        test the aggregated check report and its exit code
+        """
+        versions = ["1.35.13", "1.39.17", "1.43.9", "1.44.6"]
+        cluster = self.getCluster(versions)
+        cluster.checkDocker = lambda: 0
+        cluster.check_workers = 2
+        backend = FakeDockerBackend()
+        apps = list(cluster.apps.values())
+        # the second wiki has no containers and the third a wrong port
+        for i, mwApp in enumerate(apps):
+            config = mwApp.config
+            port = config.port + 100 if i == 2 else config.port
+            if i != 1:
+                backend.addApp(
+                    config.container_base_name, config.version, config.prefix, port
+                )
+        DockerBackend.setBackend(backend)
+        DockerMap.invalidate()
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def getVersionChecks(version_url, timeout=None):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return [WikiCheck(name="Special:Version", ok=True, msg=version_url)]
+
+        for mwApp in apps:
+            mwApp.getVersionChecks = getVersionChecks
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            exitCode = cluster.check(as_json=True)
+        self.assertEqual(1, exitCode)
+        self.assertLessEqual(active["max"], 2)
+        records = json.loads(stdout.getvalue())
+        if self.debug:
+            print(json.dumps(records, indent=2))
+        failed = [
+            (record["wiki"], record["check"]) for record in records if not record["ok"]
+        ]
+        self.assertEqual(
+            [
+                ("mw-139", "mediawiki container"),
+                ("mw-139", "database container"),
+                ("mw-143", "port binding"),
+            ],
+            failed,
+        )
+        version_checks = [
+            record["wiki"] for record in records if record["check"] == "Special:Version"
+        ]
+        self.assertEqual(["mw-135", "mw-144"], version_checks)
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            exitCode = cluster.check()
+        self.assertEqual(1, exitCode)
+        table = stdout.getvalue()
+        self.assertEqual(3, table.count("❌"))
+        self.assertIn(
+            f"{apps[2].config.port + 100} expected {apps[2].config.port}", table
+        )
+
+    def testDown(self):
+        """
+        test that a failing docker compose down of one app is reported
+        and fails the cluster
+        """
+        versions = ["1.39.17", "1.43.9", "1.44.6"]
+        cluster = self.getCluster(versions)
+        cluster.config.parallel = 2
+        cluster.checkDocker = lambda: 0
+        removed = []
+        for mwApp in cluster.apps.values():
+
+            def down(forceRebuild: bool, mwApp=mwApp) -> int:
+                removed.append((mwApp.config.version, forceRebuild))
+                return 1 if mwApp.config.version == "1.43.9" else 0
+
+            mwApp.down = down
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            exitCode = cluster.down(forceRebuild=True)
+        self.assertEqual(1, exitCode)
+        self.assertEqual([(version, True) for version in versions], sorted(removed))
+        lines = stdout.getvalue().splitlines()
+        if self.debug:
+            print("\n".join(lines))
+        summary = [line for line in lines if ":down " in line]
+        self.assertEqual(3, len(summary))
+        self.assertTrue(summary[0].startswith("1:down mw-139 1.39.17"))
+        self.assertTrue(summary[0].endswith("✅"))
+        self.assertTrue(summary[1].startswith("2:down mw-143 1.43.9"))
+        self.assertTrue(summary[1].endswith("❌"))
+        self.assertTrue(summary[2].endswith("✅"))
+
+    def testExternalDbNetwork(self):
+        """
+        test connecting an external database container through the docker backend
+        """
+        cluster = self.getCluster(["1.39.17"])
+        mwApp = cluster.apps["1.39.17"]
+        backend = FakeDockerBackend()
+        DockerBackend.setBackend(backend)
+        mwApp.prepare_external_db_access(network_name="db", db_alias="db")
+        self.assertEqual(
+            [(mwApp.config.db_container_name, "db")], backend.networks["db"]
+        )
+
+    def testGenerateWikiUsers(self):
+        """
+        test that the concurrently generated apps save a shared
+        wiki user one at a time
+        """
+        versions = ["1.39.17", "1.43.9", "1.44.6"]
+        cluster = self.getCluster(versions)
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+        saved = []
+
+        def createWikiUser(mwApp, wikiId, store=False):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05)
+            saved.append(wikiId)
+            with lock:
+                active["now"] -= 1
+            return SimpleNamespace(getPassword=lambda: mwApp.config.password)
+
+        for mwApp in cluster.apps.values():
+            mwApp.config.wikiId = "cluster-wiki"
+            mwApp.config.random_password = True
+            mwApp.config.force_user = True
+        with patch.object(DockerApplication, "createWikiUser", createWikiUser):
+            with patch("wikibot3rd.wikiuser.WikiUser.getWikiUsers", lambda lenient: {}):
+                cluster.generateApps(max_workers=3)
+        self.assertEqual(["cluster-wiki"] * 3, saved)
+        self.assertEqual(1, active["max"])
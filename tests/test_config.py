@@ -64,6 +64,8 @@ class TestConfig(Basetest):
             "wikiId": None,
             "versions": ["1.35.13", "1.39.17", "1.43.9", "1.44.6", "1.45.4"],
             "base_port": 9080,
+            "parallel": 1,
+            "single_compose": False,
             "gid": 33,
             "uid": 33,
             "bind_mount": False,
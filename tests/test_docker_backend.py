@@ -0,0 +1,293 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import os
+import socketserver
+import struct
+import tempfile
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler
+
+from basemkit.basetest import Basetest
+
+from mwdocker.docker_backend import (
+    ApiDockerBackend,
+    DockerApiError,
+    DockerBackend,
+    DockerExecError,
+)
+from mwdocker.docker_map import DockerMap
+
+
+class FakeDockerHandler(BaseHTTPRequestHandler):
+    """
+    a minimal fake of the Docker Engine API
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def send(self, status: int, body: bytes, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def sendJson(self, status: int, data):
+        self.send(status, json.dumps(data).encode("utf-8"))
+
+    def matches(self, info: dict, label_filters: list) -> bool:
+        labels = info["Config"]["Labels"]
+        for label_filter in label_filters:
+            key, _, value = label_filter.partition("=")
+            if key not in labels or (value and labels[key] != value):
+                return False
+        return True
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        path = url.path
+        query = urllib.parse.parse_qs(url.query)
+        containers = self.server.containers
+        if path == "/_ping":
+            self.send(200, b"OK", "text/plain")
+        elif path == "/containers/json":
+            self.server.listings += 1
+            filters = json.loads(query.get("filters", ["{}"])[0])
+            running = [
+                {"Id": cid, "Names": [info["Name"]]}
+                for cid, info in containers.items()
+                if info["State"]["Running"]
+                and self.matches(info, filters.get("label", []))
+            ]
+            self.sendJson(200, running)
+        elif path.startswith("/containers/") and path.endswith("/json"):
+            self.server.inspections += 1
+            cid = path.split("/")[2]
+            for container_id, info in containers.items():
+                if info["Name"] == f"/{cid}":
+                    cid = container_id
+            if cid in containers:
+                self.sendJson(200, {"Id": cid, **containers[cid]})
+            else:
+                self.sendJson(404, {"message": f"No such container: {cid}"})
+        elif path.endswith("/logs"):
+            self.server.log_queries.append(query)
+            log = b"server started\n"
+            frame = struct.pack(">BxxxL", 1, len(log)) + log
+            self.send(200, frame, "application/vnd.docker.raw-stream")
+        elif path.startswith("/volumes/"):
+            self.sendJson(404, {"message": "no such volume"})
+        elif path.startswith("/exec/") and path.endswith("/json"):
+            command = self.server.execs[path.split("/")[2]]
+            self.sendJson(200, {"ExitCode": 1 if command[-1] == "fail" else 0})
+        elif path == "/networks":
+            self.sendJson(200, [{"Name": name} for name in self.server.networks])
+        else:
+            self.sendJson(404, {"message": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length)) if length else {}
+        parts = self.path.split("/")
+        if self.path.endswith("/stop"):
+            self.server.containers[parts[2]]["State"]["Running"] = False
+            self.send(204, b"")
+        elif self.path.endswith("/exec"):
+            exec_id = f"exec{len(self.server.execs)}"
+            self.server.execs[exec_id] = body["Cmd"]
+            self.sendJson(201, {"Id": exec_id})
+        elif self.path.startswith("/exec/") and self.path.endswith("/start"):
+            # the output is streamed until the connection is closed
+            self.send_response(200)
+            self.send_header("Content-Type", "application/vnd.docker.raw-stream")
+            self.end_headers()
+            for stream_type, text in [(1, b"hello\n"), (2, b"warning\n")]:
+                self.wfile.write(struct.pack(">BxxxL", stream_type, len(text)) + text)
+            self.close_connection = True
+        elif self.path == "/networks/create":
+            self.server.networks[body["Name"]] = []
+            self.sendJson(201, {"Id": body["Name"]})
+        elif self.path.endswith("/connect"):
+            connected = self.server.networks[parts[2]]
+            if body["Container"] in connected:
+                message = f"endpoint with name {body['Container']} already exists in network {parts[2]}"
+                self.sendJson(403, {"message": message})
+            else:
+                connected.append(body["Container"])
+                self.send(200, b"")
+        else:
+            self.sendJson(404, {"message": "not found"})
+
+    def do_DELETE(self):
+        cid = self.path.split("/")[2]
+        del self.server.containers[cid]
+        self.send(204, b"")
+
+
+class FakeDockerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    a fake docker daemon listening on a unix socket
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str):
+        super().__init__(socket_path, FakeDockerHandler)
+        self.connections = 0
+        self.listings = 0
+        self.inspections = 0
+        self.execs = {}
+        self.networks = {"bridge": []}
+        self.log_queries = []
+        labels = DockerMap.getLabels(cluster="mw", app="mw-139")
+        self.containers = {
+            "abc123": {
+                "Name": "/mw-139-mw",
+                "State": {"Running": True, "Status": "running", "ExitCode": 0},
+                "HostConfig": {
+                    "PortBindings": {"80/tcp": [{"HostIp": "", "HostPort": "9080"}]}
+                },
+                "Config": {"Env": ["MYSQL_USER=mw-9080_user"], "Labels": labels},
+            },
+            # a container created before labeling
+            "def456": {
+                "Name": "/mw-139-db",
+                "State": {"Running": True, "Status": "running", "ExitCode": 0},
+                "HostConfig": {"PortBindings": {}},
+                "Config": {"Env": ["MYSQL_ROOT_PASSWORD=root"], "Labels": {}},
+            },
+        }
+
+
+class TestDockerBackend(Basetest):
+    """
+    test the Docker Engine API backend against a fake socket server
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, "docker.sock")
+        self.server = FakeDockerServer(self.socket_path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.backend = ApiDockerBackend(self.socket_path, timeout=5.0)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+        Basetest.tearDown(self)
+
+    def testContainers(self):
+        """
+        test listing, inspecting and removing containers
+        """
+        self.assertTrue(self.backend.ping())
+        containers = self.backend.listContainers(labels={"pymediawikidocker.app": None})
+        self.assertEqual(["mw-139-mw"], [container.name for container in containers])
+        container = containers[0]
+        self.assertTrue(container.state.running)
+        self.assertEqual(
+            "9080", container.host_config.port_bindings["80/tcp"][0].host_port
+        )
+        self.assertEqual(["MYSQL_USER=mw-9080_user"], container.config.env)
+        # the state, host config and config come from a single inspect
+        self.assertEqual(1, self.server.inspections)
+        self.assertEqual("server started\n", self.backend.logs("mw-139-mw"))
+        self.backend.logs("mw-139-mw", tail=100, since=1700000000.5)
+        self.assertEqual(["100"], self.server.log_queries[-1]["tail"])
+        self.assertEqual(["1700000000"], self.server.log_queries[-1]["since"])
+        log_stream = self.backend.followLogs("mw-139-mw")
+        self.assertEqual([("stdout", b"server started\n")], list(log_stream))
+        self.assertEqual(["1"], self.server.log_queries[-1]["follow"])
+        self.assertFalse(self.backend.volumeExists("mw-139_wiki-html"))
+        container.stop()
+        self.assertTrue(container.state.running)
+        container.reload()
+        self.assertFalse(container.state.running)
+        container.remove()
+        with self.assertRaises(DockerApiError):
+            container.inspect()
+        # all requests of this thread share a single kept alive connection
+        # the followed log stream needs a connection of its own
+        self.assertEqual(2, self.server.connections)
+
+    def testExecute(self):
+        """
+        test executing commands in a container
+        """
+        chunks = list(self.backend.execute("mw-139-mw", ["echo", "hello"]))
+        self.assertEqual([("stdout", b"hello\n"), ("stderr", b"warning\n")], chunks)
+        self.assertEqual(["echo", "hello"], self.server.execs["exec0"])
+        with self.assertRaises(DockerExecError) as context:
+            list(self.backend.execute("mw-139-mw", ["false", "fail"]))
+        self.assertEqual(1, context.exception.exit_code)
+
+    def testNetworks(self):
+        """
+        test listing, creating and connecting networks
+        """
+        self.assertEqual(["bridge"], self.backend.listNetworks())
+        self.backend.createNetwork("db")
+        self.assertEqual(["bridge", "db"], self.backend.listNetworks())
+        self.backend.connectNetwork("db", "mw-139-db", alias="db")
+        self.assertEqual(["mw-139-db"], self.server.networks["db"])
+        with self.assertRaises(DockerApiError) as context:
+            self.backend.connectNetwork("db", "mw-139-db", alias="db")
+        self.assertIn("already exists", str(context.exception))
+
+    def testBackendSelection(self):
+        """
+        test selecting the backend
+        """
+        os.environ["DOCKER_HOST"] = f"unix://{self.socket_path}"
+        try:
+            DockerBackend.setBackend(None)
+            self.assertEqual("api", DockerBackend.getBackend().name)
+            os.environ["DOCKER_HOST"] = f"unix://{self.tmpdir.name}/missing.sock"
+            DockerBackend.setBackend(None)
+            self.assertEqual("cli", DockerBackend.getBackend().name)
+        finally:
+            del os.environ["DOCKER_HOST"]
+            DockerBackend.setBackend(None)
+
+    def testDockerMap(self):
+        """
+        test the labeled, cached container snapshot
+        """
+        DockerBackend.setBackend(self.backend)
+        try:
+            container_map = DockerMap.refresh(DockerMap.getLabels(cluster="mw"))
+            self.assertEqual(["mw-139-mw"], list(container_map))
+            for _i in range(3):
+                DockerMap.getContainerMap()
+            self.assertEqual(1, self.server.listings)
+            # unlabeled containers are inspected directly
+            self.assertEqual(
+                "mw-139-db", DockerMap.findRunningContainer("mw-139-db").name
+            )
+            self.assertEqual(
+                "root", DockerMap.getEnv("mw-139-db")["MYSQL_ROOT_PASSWORD"]
+            )
+            self.assertIsNone(DockerMap.findRunningContainer("mw-145-db"))
+            self.assertEqual(1, self.server.listings)
+            DockerMap.invalidate()
+            DockerMap.getContainerMap()
+            self.assertEqual(2, self.server.listings)
+        finally:
+            DockerMap.invalidate()
+            DockerBackend.setBackend(None)
@@ -0,0 +1,144 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import queue
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+from basemkit.basetest import Basetest
+
+from mwdocker.docker import DockerContainer
+from mwdocker.docker_backend import DockerBackend, EventStream, ProcessEventStream
+from mwdocker.docker_events import DockerEventWaiter
+
+
+class FakeEventBackend(DockerBackend):
+    """
+    a backend with a queue based events stream
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.filters = None
+
+    def openEvents(self, filters) -> EventStream:
+        self.filters = filters
+
+        def events():
+            while True:
+                event = self.queue.get()
+                if event is None:
+                    break
+                yield event
+
+        event_stream = EventStream(events())
+        event_stream.close = lambda: self.queue.put(None)
+        return event_stream
+
+    def emit(self, name: str, action: str):
+        self.queue.put({"Action": action, "Actor": {"Attributes": {"name": name}}})
+
+
+class TestDockerEvents(Basetest):
+    """
+    test waiting for container states via docker events
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.backend = FakeEventBackend()
+        self.labels = {"pymediawikidocker.cluster": "mw"}
+
+    def tearDown(self):
+        DockerEventWaiter.deactivate()
+        Basetest.tearDown(self)
+
+    def testWaitForState(self):
+        """
+        test that a wait is resolved by the start event instead of polling
+        """
+        waiter = DockerEventWaiter.activate(self.labels, backend=self.backend)
+        self.assertEqual(
+            ["pymediawikidocker.cluster=mw"], self.backend.filters["label"]
+        )
+        inspects = []
+
+        class FakeContainer:
+            config = SimpleNamespace(labels={"pymediawikidocker.cluster": "mw"})
+
+            @property
+            def state(self):
+                inspects.append(time.time())
+                return SimpleNamespace(running=False)
+
+        dc = DockerContainer("mw-139-mw", "webserver", FakeContainer())
+        threading.Timer(0.3, self.backend.emit, ["mw-139-mw", "start"]).start()
+        secs = dc.wait_for_state(running=True, interval=0.01, timeout=5.0)
+        self.assertGreaterEqual(secs, 0.25)
+        self.assertEqual(1, len(inspects))
+        self.assertEqual({}, waiter.futures)
+
+    def testWaitForHealthy(self):
+        """
+        test the jittered polling of the health status without events
+        """
+        statuses = ["starting", "starting", "starting", "healthy"]
+
+        class FakeContainer:
+            @property
+            def state(self):
+                status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+                return SimpleNamespace(
+                    running=True, health=SimpleNamespace(status=status)
+                )
+
+        dc = DockerContainer("mw-139-db", "database", FakeContainer())
+        self.assertEqual("starting", dc.getHealth())
+        secs = dc.wait_for_healthy(timeout=5.0)
+        self.assertLess(secs, 1.0)
+        self.assertTrue(dc.isHealthy())
+        statuses[0] = "unhealthy"
+        with self.assertRaises(TimeoutError):
+            dc.wait_for_healthy(timeout=0.3)
+
+    def testStreamEnd(self):
+        """
+        test that pending waits fail when the stream ends
+        """
+        waiter = DockerEventWaiter(backend=self.backend, labels=self.labels).start()
+        future = waiter.expect("mw-139-db", "healthy")
+        self.backend.emit("mw-139-db", "health_status: healthy")
+        self.assertEqual("health_status: healthy", future.result(timeout=1)["Action"])
+        future = waiter.expect("mw-139-db", "stopped")
+        waiter.close()
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=1)
+        self.assertFalse(waiter.alive)
+
+    def testProcessStreamClose(self):
+        """
+        test that deactivating the waiter terminates a command line events process
+        """
+        event = {"Action": "start", "Actor": {"Attributes": {"name": "mw-139-mw"}}}
+        # stands in for docker events: emits one event and then blocks
+        script = f"import time; time.sleep(0.5); print({json.dumps(json.dumps(event))}, flush=True); time.sleep(60)"
+        backend = FakeEventBackend()
+        streams = []
+
+        def openEvents(filters):
+            streams.append(ProcessEventStream([sys.executable, "-c", script]))
+            return streams[0]
+
+        backend.openEvents = openEvents
+        waiter = DockerEventWaiter.activate(self.labels, backend=backend)
+        future = waiter.expect("mw-139-mw", "running")
+        self.assertEqual("start", future.result(timeout=10)["Action"])
+        DockerEventWaiter.deactivate()
+        self.assertIsNotNone(streams[0].process.returncode)
+        self.assertFalse(waiter.thread.is_alive())
@@ -0,0 +1,110 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import tempfile
+
+from basemkit.basetest import Basetest
+
+from mwdocker.docker_images import DockerImageBuilder, ImageBuild
+
+
+class TestDockerImages(Basetest):
+    """
+    test the content hash based docker image handling
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def writeFile(self, path: str, content: str):
+        with open(path, "w") as file:
+            file.write(content)
+
+    def testImageHash(self):
+        """
+        test the content hash of the build inputs
+        """
+        dockerfile = """#
+# generated at {timestamp}
+#
+FROM mediawiki:1.39.17
+COPY --chown=www-data upload.ini /usr/local/etc/php/conf.d/
+"""
+        with (
+            tempfile.TemporaryDirectory() as path_a,
+            tempfile.TemporaryDirectory() as path_b,
+        ):
+            for path, timestamp in [(path_a, "2026-10-17"), (path_b, "2026-10-18")]:
+                self.writeFile(
+                    f"{path}/Dockerfile", dockerfile.format(timestamp=timestamp)
+                )
+                self.writeFile(f"{path}/upload.ini", "upload_max_filesize = 100M\n")
+            hash_a = DockerImageBuilder.getImageHash(path_a)
+            hash_b = DockerImageBuilder.getImageHash(path_b)
+            # comments such as the generation timestamp do not count
+            self.assertEqual(hash_a, hash_b)
+            # copied files do
+            self.writeFile(f"{path_b}/upload.ini", "upload_max_filesize = 200M\n")
+            hash_b = DockerImageBuilder.getImageHash(path_b)
+            self.assertNotEqual(hash_a, hash_b)
+        self.assertEqual(["upload.ini"], DockerImageBuilder.getBuildInputs(dockerfile))
+
+    def testBaseImages(self):
+        """
+        test getting the base images of a Dockerfile
+        """
+        dockerfile = """FROM --platform=linux/amd64 mediawiki:1.39.17
+RUN echo "FROM is not an instruction here"
+"""
+        base_images = DockerImageBuilder.getBaseImages(dockerfile)
+        self.assertEqual(["mediawiki:1.39.17"], base_images)
+
+    def testFailedBuildIsRetried(self):
+        """
+        test that a failed build is not cached
+        """
+        builder = DockerImageBuilder(verbose=False)
+        attempts = []
+
+        def doBuild(tag, docker_path, force):
+            attempts.append(tag)
+            if len(attempts) == 1:
+                raise ValueError("simulated build failure")
+            return ImageBuild(tag=tag, docker_path=docker_path, built=True)
+
+        builder.doBuild = doBuild
+        with self.assertRaises(ValueError):
+            builder.build("mediawiki:test", "/tmp")
+        image_build = builder.build("mediawiki:test", "/tmp")
+        self.assertTrue(image_build.built)
+        self.assertEqual(2, len(attempts))
+        # a successful build is cached
+        image_build = builder.build("mediawiki:test", "/tmp")
+        self.assertFalse(image_build.built)
+        self.assertEqual(2, len(attempts))
+
+    def testForcedBuildIsNotCached(self):
+        """
+        test that a forced build replaces a cached build that was not forced
+        """
+        builder = DockerImageBuilder(verbose=False)
+        attempts = []
+
+        def doBuild(tag, docker_path, force):
+            attempts.append(force)
+            return ImageBuild(tag=tag, docker_path=docker_path, built=force)
+
+        builder.doBuild = doBuild
+        image_build = builder.build("mediawiki:test", "/tmp")
+        self.assertFalse(image_build.built)
+        image_build = builder.build("mediawiki:test", "/tmp", force=True)
+        self.assertTrue(image_build.built)
+        self.assertEqual([False, True], attempts)
+        # the forced build is cached for forced and unforced calls
+        builder.build("mediawiki:test", "/tmp", force=True)
+        builder.build("mediawiki:test", "/tmp")
+        self.assertEqual([False, True], attempts)
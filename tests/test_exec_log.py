@@ -0,0 +1,81 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+
+from basemkit.basetest import Basetest
+
+from mwdocker.docker import DockerContainer
+from mwdocker.docker_backend import DockerBackend
+from mwdocker.exec_log import ExecError, ExecLog
+from tests.fake_docker import FakeDockerBackend
+
+
+class TestExecLog(Basetest):
+    """
+    test the bounded capture of docker exec output
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def testExecLog(self):
+        """
+        test line splitting, the ring buffer, the log file and the console throttling
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = os.path.join(tmpdir, "logs", "exec.log")
+            exec_log = ExecLog("mw-139", log_path=log_path, max_lines=3)
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                exec_log.start("composer update")
+                lines = exec_log.feed("stdout", "line 1\nline")
+                lines += exec_log.feed("stdout", " 2\r\nline 3\n")
+                lines += exec_log.feed("stderr", "line 4\nline 5")
+                exec_log.close()
+            self.assertEqual(
+                ["line 1", "line 2", "line 3", "line 4"], [line.text for line in lines]
+            )
+            self.assertEqual("stderr", lines[-1].stream)
+            self.assertEqual("mw-139", lines[-1].app)
+            self.assertEqual(["line 3", "line 4", "line 5"], exec_log.tail())
+            self.assertEqual(["line 5"], exec_log.tail(1))
+            self.assertEqual(5, exec_log.line_count)
+            # only the first line is shown on the console within the interval
+            self.assertEqual("mw-139: line 1\n", stdout.getvalue())
+            with open(log_path) as log_file:
+                log_lines = log_file.read().splitlines()
+            self.assertEqual(6, len(log_lines))
+            self.assertTrue(log_lines[0].endswith("mw-139: composer update"))
+            self.assertTrue(log_lines[5].endswith("stderr line 5"))
+
+    def testExecute(self):
+        """
+        test that a failing execute reports the tail of the output
+        """
+
+        class FailingBackend(FakeDockerBackend):
+            def execute(self, container_name, command):
+                yield "stdout", "installing ".encode()
+                yield "stdout", "ü\n".encode()[:1]
+                yield "stdout", "ü\n".encode()[1:]
+                raise Exception("exit code 1")
+
+        container = SimpleNamespace(state=SimpleNamespace(running=True))
+        dc = DockerContainer("mw-139-mw", "webserver", container)
+        exec_log = ExecLog("mw-139", console_interval=None)
+        DockerBackend.setBackend(FailingBackend())
+        try:
+            with self.assertRaises(ExecError) as context:
+                dc.execute("bash", "setup.sh", exec_log=exec_log)
+        finally:
+            DockerBackend.setBackend(None)
+        self.assertEqual(["installing ü"], context.exception.tail)
+        self.assertIn("installing ü", str(context.exception))
@@ -130,7 +130,7 @@ class TestInstall(Basetest):
                 "LocalSettings.php",
                 "upload.ini",
                 "phpinfo.php",
-                "wiki.sql",
+                "wiki.sql.gz",
                 "composer.local.json",
                 "plantuml.sh",
             ]:
@@ -0,0 +1,110 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import glob
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+from basemkit.basetest import Basetest
+
+from mwdocker.docker_backend import DockerBackend, LogStream, ProcessLogStream
+from mwdocker.log_aggregator import LogAggregator
+
+
+class FakeLogBackend(DockerBackend):
+    """
+    a backend with canned container logs
+    """
+
+    def __init__(self, logs: dict):
+        self.logs_by_container = logs
+        self.since = {}
+
+    def followLogs(self, container_name: str, since: float = None) -> LogStream:
+        self.since[container_name] = since
+        return LogStream(iter(self.logs_by_container[container_name]))
+
+
+class TestLogAggregator(Basetest):
+    """
+    test following the container logs of a cluster
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def testAggregation(self):
+        """
+        test following several containers concurrently into rotating gzip files
+        """
+        mw_chunks = [("stdout", f"request {i}\n".encode()) for i in range(200)]
+        db_chunks = [("stderr", b"ready for conn"), ("stderr", b"ections\n")]
+        backend = FakeLogBackend(
+            {"mw-139-mw": mw_chunks, "mw-139-db": db_chunks, "mw-143-mw": []}
+        )
+        lines = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            aggregator = LogAggregator(
+                backend=backend,
+                max_bytes=1024,
+                backup_count=2,
+                listener=lambda source, stream_type, line: lines.append(line),
+            )
+            log_139 = os.path.join(tmpdir, "mw-139", "logs", "containers.log")
+            log_143 = os.path.join(tmpdir, "mw-143", "logs", "containers.log")
+            aggregator.add("mw-139", "mw", "mw-139-mw", log_139)
+            aggregator.add("mw-139", "db", "mw-139-db", log_139)
+            aggregator.add("mw-143", "mw", "mw-143-mw", log_143)
+            aggregator.start(since=1700000000.0)
+            aggregator.wait(timeout=5.0)
+            aggregator.stop()
+            self.assertEqual(201, len(lines))
+            self.assertIn("ready for connections", lines)
+            self.assertEqual(1700000000.0, backend.since["mw-139-db"])
+            rotated = sorted(glob.glob(f"{log_139}.*.gz"))
+            self.assertEqual([f"{log_139}.1.gz", f"{log_139}.2.gz"], rotated)
+            with gzip.open(rotated[0], "rt") as gz_file:
+                self.assertTrue(
+                    gz_file.readline().startswith(("mw stdout", "db stderr"))
+                )
+            self.assertLessEqual(os.path.getsize(log_139), 1024)
+
+    def testStop(self):
+        """
+        test that stop ends the followers of command line log processes
+        """
+        # stands in for docker logs --follow: logs a line and then blocks
+        script = "import sys, time; print('started', file=sys.stderr, flush=True); time.sleep(60)"
+        backend = FakeLogBackend({})
+        streams = []
+
+        def followLogs(container_name: str, since: float = None) -> LogStream:
+            log_stream = ProcessLogStream([sys.executable, "-c", script])
+            streams.append(log_stream)
+            return log_stream
+
+        backend.followLogs = followLogs
+        lines = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            aggregator = LogAggregator(
+                backend=backend,
+                listener=lambda source, stream_type, line: lines.append(line),
+            )
+            log_path = os.path.join(tmpdir, "mw-139", "logs", "containers.log")
+            aggregator.add("mw-139", "mw", "mw-139-mw", log_path)
+            aggregator.add("mw-139", "db", "mw-139-db", log_path)
+            aggregator.start()
+            deadline = time.monotonic() + 10.0
+            while len(lines) < 2 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertEqual(["started", "started"], lines)
+            aggregator.stop()
+            self.assertFalse(any(thread.is_alive() for thread in aggregator.threads))
+            for log_stream in streams:
+                self.assertIsNotNone(log_stream.process.returncode)
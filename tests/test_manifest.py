@@ -0,0 +1,120 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import gzip
+import os
+import tempfile
+from types import SimpleNamespace
+
+from basemkit.basetest import Basetest
+
+from mwdocker.config import MwClusterConfig
+from mwdocker.docker import DockerApplication
+from mwdocker.manifest import GenerationManifest
+
+
+class TestManifest(Basetest):
+    """
+    test the incremental generation based on the manifest
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.docker_path = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        Basetest.tearDown(self)
+
+    def getApp(self, config: MwClusterConfig) -> DockerApplication:
+        """
+        get a docker application for the given config in my docker path
+        """
+        config.docker_path = self.docker_path
+        mwApp = DockerApplication(config)
+        os.makedirs(mwApp.docker_path, exist_ok=True)
+        return mwApp
+
+    def testIncrementalGenerate(self):
+        """
+        test that unchanged files are neither rendered nor rewritten
+        """
+        config = MwClusterConfig(verbose=False)
+        mwApp = self.getApp(config)
+        target_path = f"{mwApp.docker_path}/upload.ini"
+        dockerfile_path = f"{mwApp.docker_path}/Dockerfile"
+        mwApp.generate("upload.ini", target_path, overwrite=True)
+        mwApp.manifest.save()
+        mtime = os.stat(target_path).st_mtime_ns
+        with open(target_path) as target_file:
+            content = target_file.read()
+        # a new app instance with the same inputs reuses the manifest
+        mwApp = self.getApp(config)
+        # the environment is shared - use an overlay to detect rendering
+        mwApp.env = mwApp.env.overlay()
+
+        def fail(name):
+            raise ValueError(f"{name} should not be rendered again")
+
+        mwApp.env.get_template = fail
+        mwApp.generate("upload.ini", target_path, overwrite=True)
+        self.assertEqual(mtime, os.stat(target_path).st_mtime_ns)
+        # volatile fields do not count as changed inputs
+        mwApp = self.getApp(config)
+        config.forceRebuild = True
+        mwApp.generate("mwDockerfile", dockerfile_path, overwrite=True)
+        entry = mwApp.manifest.files["Dockerfile"]
+        config.forceRebuild = False
+        mwApp.generate("mwDockerfile", dockerfile_path, overwrite=True)
+        self.assertEqual(entry, mwApp.manifest.files["Dockerfile"])
+        # a modified file is regenerated with a single rendering
+        with open(target_path, "w") as target_file:
+            target_file.write("modified")
+        renders = []
+        mwApp.env = mwApp.env.overlay()
+        get_template = mwApp.env.get_template
+
+        def get_counting_template(name):
+            template = get_template(name)
+
+            def render(**params):
+                renders.append(name)
+                return template.render(**params)
+
+            return SimpleNamespace(render=render)
+
+        mwApp.env.get_template = get_counting_template
+        mwApp.generate("upload.ini", target_path, overwrite=True)
+        self.assertEqual(["upload.ini"], renders)
+        with open(target_path) as target_file:
+            self.assertEqual(content, target_file.read())
+
+    def testStableSecrets(self):
+        """
+        test that generated secrets survive a reload of the manifest
+        """
+        manifest = GenerationManifest(f"{self.docker_path}/manifest.json")
+        secret = manifest.getSecret("secretKey", lambda: "first")
+        manifest.save()
+        self.assertEqual(0o600, os.stat(manifest.path).st_mode & 0o777)
+        manifest = GenerationManifest(f"{self.docker_path}/manifest.json")
+        self.assertEqual(secret, manifest.getSecret("secretKey", lambda: "second"))
+
+    def testCopyResource(self):
+        """
+        test the passthrough of the compressed SQL seed
+        """
+        mwApp = self.getApp(MwClusterConfig(verbose=False))
+        sql_path = DockerApplication.getResourcePath("sql", "mwWiki139.sql.gz")
+        target_path = f"{mwApp.docker_path}/wiki.sql.gz"
+        mwApp.copyResource(sql_path, target_path, overwrite=True)
+        mtime = os.stat(target_path).st_mtime_ns
+        mwApp.copyResource(sql_path, target_path, overwrite=True)
+        self.assertEqual(mtime, os.stat(target_path).st_mtime_ns)
+        with gzip.open(target_path, "rt") as sql_file:
+            sql = sql_file.read()
+        self.assertIn("CREATE TABLE", sql)
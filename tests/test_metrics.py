@@ -0,0 +1,52 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import os
+import tempfile
+
+from basemkit.basetest import Basetest
+
+from mwdocker.metrics import RunMetrics
+
+
+class TestMetrics(Basetest):
+    """
+    test the per phase timing instrumentation
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def testRunMetrics(self):
+        """
+        test timing phases and exporting them as JSON and OpenMetrics
+        """
+        metrics = RunMetrics()
+        for attempt in range(3):
+            with metrics.timed("db_connect", "mw-139", "1.39.17", f"attempt {attempt}"):
+                pass
+        with self.assertRaises(ValueError):
+            with metrics.timed("generate", "mw-139", "1.39.17", "mwDockerfile"):
+                raise ValueError("template failure")
+        summary = metrics.summarize()
+        self.assertEqual(3, summary[("db_connect", "mw-139", "1.39.17")]["count"])
+        self.assertEqual(1, summary[("generate", "mw-139", "1.39.17")]["failed"])
+        text = metrics.as_openmetrics()
+        if self.debug:
+            print(text)
+        self.assertIn(
+            'mwdocker_phase_seconds_count{phase="db_connect",app="mw-139",version="1.39.17"} 3',
+            text,
+        )
+        self.assertTrue(text.endswith("# EOF\n"))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path = metrics.save(os.path.join(tmpdir, "metrics.json"))
+            with open(json_path) as json_file:
+                timings = json.load(json_file)["timings"]
+            self.assertEqual(4, len(timings))
+            self.assertFalse(timings[3]["ok"])
+            self.assertEqual("mwDockerfile", timings[3]["detail"])
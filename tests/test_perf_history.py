@@ -0,0 +1,106 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import tempfile
+
+from basemkit.basetest import Basetest
+
+from mwdocker.metrics import PhaseTiming
+from mwdocker.perf_history import PerfHistory, RunProgress
+from tests.fake_docker import getTestCluster
+
+
+class TestPerfHistory(Basetest):
+    """
+    test the persistent timing history
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def getTimings(self, composer: float) -> list:
+        """
+        get the timings of a simulated run with the given composer duration
+        """
+        timings = [
+            PhaseTiming(
+                "setup_step", "mw-139", "1.39.17", 0.0, composer, True, "composer"
+            ),
+            PhaseTiming("setup_step", "mw-139", "1.39.17", 0.0, 5.0, True, "update"),
+            PhaseTiming(
+                "db_connect", "mw-139", "1.39.17", 0.0, 0.5, False, "attempt 1"
+            ),
+            PhaseTiming("db_connect", "mw-139", "1.39.17", 0.0, 0.5, True, "attempt 2"),
+        ]
+        return timings
+
+    def testHistory(self):
+        """
+        test recording runs, estimating and detecting regressions
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "perf_history.jsonl")
+            history = PerfHistory(path)
+            for composer in [40.0, 45.0, 42.0]:
+                # attempts of a phase are summed up per run
+                self.assertEqual(3, history.record(self.getTimings(composer)))
+            self.assertEqual(42.0, history.median("setup_step", "mw-139", "composer"))
+            # runs with failed attempts are not used as samples
+            self.assertIsNone(history.median("db_connect", "mw-139"))
+            regressions = history.findRegressions(self.getTimings(90.0))
+            if self.debug:
+                history.showRegressions(regressions)
+            self.assertEqual(1, len(regressions))
+            self.assertEqual("composer", regressions[0].record.detail)
+            self.assertAlmostEqual(90.0 / 42.0, regressions[0].ratio)
+            # a reloaded history sees the same samples
+            reloaded = PerfHistory(path)
+            self.assertEqual(3, reloaded.sampleCount("setup_step", "mw-139", "update"))
+
+    def testCompact(self):
+        """
+        test that the history file is bounded
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            history = PerfHistory(os.path.join(tmpdir, "h.jsonl"), max_records=10)
+            for _i in range(6):
+                history.record(self.getTimings(40.0))
+            with open(history.path) as history_file:
+                self.assertLessEqual(len(history_file.readlines()), 10)
+            self.assertEqual(40.0, history.median("setup_step", "mw-139", "composer"))
+
+    def testRunProgress(self):
+        """
+        test the progress with ETA of a cluster action
+        """
+        progress = RunProgress("start", {"mw-1": 10.0, "mw-2": 30.0}, workers=1)
+        self.assertTrue(progress.known)
+        self.assertIn("expected 40s", progress.getStartMessage())
+        self.assertAlmostEqual(40.0, progress.eta(), delta=1.0)
+        msg = progress.finish("mw-1", 10.0)
+        self.assertIn("start 1/2 mw-1", msg)
+        self.assertIn("ETA", msg)
+        self.assertEqual("2m05s", RunProgress.formatSeconds(125.4))
+        unknown = RunProgress("down", {"mw-1": None})
+        self.assertIsNone(unknown.getStartMessage())
+        self.assertIsNone(unknown.eta())
+
+    def testClusterHistory(self):
+        """
+        test recording the per app durations of a cluster action
+        """
+        with tempfile.TemporaryDirectory() as docker_path:
+            versions = ["1.39.17", "1.43.9"]
+            for _run in range(2):
+                cluster = getTestCluster(versions, docker_path, verbose=self.debug)
+                cluster.runForApps(lambda mwApp: 0, max_workers=2, phase="start")
+                self.assertEqual(2, len(cluster.metrics.getTimings()))
+                self.assertEqual([], cluster.recordHistory(show=False))
+            estimates = cluster.history.estimate("start", ["mw-139", "mw-144"])
+            self.assertIsNotNone(estimates["mw-139"])
+            self.assertEqual(estimates["mw-139"], estimates["mw-144"])
+            self.assertTrue(os.path.isfile(f"{docker_path}/perf_history.jsonl"))
@@ -0,0 +1,91 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import dataclasses
+import tempfile
+
+from basemkit.basetest import Basetest
+
+from mwdocker.config import MwClusterConfig
+from mwdocker.docker import DockerApplication
+from mwdocker.docker_backend import DockerBackend
+from mwdocker.docker_map import DockerMap
+from mwdocker.reconcile import ChangeClass, Reconciler
+from tests.fake_docker import FakeDockerBackend
+
+
+class TestReconcile(Basetest):
+    """
+    test planning the reconciliation of docker applications
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config = MwClusterConfig(
+            docker_path=self.tmpdir.name,
+            mySQLPassword="saved-secret",
+            mySQLRootPassword="saved-root-secret",
+        )
+        self.config.save()
+
+    def tearDown(self):
+        DockerBackend.setBackend(None)
+        DockerMap.invalidate()
+        self.tmpdir.cleanup()
+        Basetest.tearDown(self)
+
+    def getApp(self, running: bool = True, **changes) -> DockerApplication:
+        """
+        get a docker application with the given configuration changes
+        whose containers are served by a fake docker backend
+        """
+        desired = dataclasses.replace(self.config, **changes)
+        mwApp = DockerApplication(desired)
+        backend = FakeDockerBackend()
+        backend.addApp(desired.container_base_name, desired.version)
+        if not running:
+            for container in backend.containers.values():
+                container.stop()
+        DockerBackend.setBackend(backend)
+        DockerMap.invalidate()
+        return mwApp
+
+    def testPlan(self):
+        """
+        test classifying the changes
+        """
+        extensions = self.config.extensionNameList + ["Variables"]
+        test_cases = [
+            ({}, True, ChangeClass.NONE),
+            ({}, False, ChangeClass.COMPOSE),
+            ({"extensionNameList": extensions}, True, ChangeClass.LOCAL_SETTINGS),
+            ({"sql_port": 9307}, True, ChangeClass.COMPOSE),
+            ({"version": "1.44.6"}, True, ChangeClass.IMAGE),
+            # the default wiki id and therefore the database name depend on the port
+            ({"port": 9081}, True, ChangeClass.DATA_RESET),
+            ({"port": 9081, "wikiId": "mw-9080"}, True, ChangeClass.COMPOSE),
+            ({"container_base_name": "mw-other"}, True, ChangeClass.DATA_RESET),
+        ]
+        for changes, running, expected in test_cases:
+            mwApp = self.getApp(running=running, **changes)
+            app_plan = Reconciler.plan(mwApp)
+            if self.debug:
+                print(app_plan.as_dict())
+            self.assertEqual(expected, app_plan.change, str(changes))
+
+    def testAdoptSecrets(self):
+        """
+        test that generated secrets are kept unless given explicitly
+        """
+        mwApp = self.getApp(mySQLPassword="new-random", mySQLRootPassword="new-root")
+        app_plan = Reconciler.plan(mwApp)
+        self.assertEqual(ChangeClass.NONE, app_plan.change)
+        self.assertEqual("saved-secret", mwApp.config.mySQLPassword)
+        mwApp = self.getApp(mySQLPassword="explicit")
+        app_plan = Reconciler.plan(mwApp, explicit={"mySQLPassword"})
+        self.assertEqual(ChangeClass.DATA_RESET, app_plan.change)
+        self.assertEqual(["mySQLPassword changed"], app_plan.reasons)
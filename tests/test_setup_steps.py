@@ -0,0 +1,53 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+from basemkit.basetest import Basetest
+
+from mwdocker.exec_log import ExecLog
+from mwdocker.setup_steps import SetupStepReport
+
+
+class TestSetupSteps(Basetest):
+    """
+    test the per step report of setup-mediawiki.sh
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def testReport(self):
+        """
+        test parsing the step markers from the exec output
+        """
+        output = """Setting up MediaWiki using scripts from: /scripts
+##pmwd-step start name=install-files ts=1760000000.000000000
+##pmwd-step end name=install-files ts=1760000000.500000000 status=0
+##pmwd-step start name=permissions ts=1760000001.000000000
+##pmwd-step end name=permissions ts=1760000001.250000000 status=0
+##pmwd-step start name=composer ts=1760000002.000000000
+Loading composer repositories with package information
+##pmwd-step end name=composer ts=1760000047.000000000 status=0
+##pmwd-step start name=permissions ts=1760000048.000000000
+##pmwd-step end name=permissions ts=1760000048.250000000 status=0
+##pmwd-step start name=update ts=1760000049.000000000
+\x1b[0;31mError:\x1b[0m
+##pmwd-step end name=update ts=1760000052.000000000 status=1
+"""
+        report = SetupStepReport(app="mw-139")
+        exec_log = ExecLog("mw-139", console_interval=None, listener=report.onLogLine)
+        exec_log.feed("stdout", output)
+        exec_log.close()
+        durations = report.getDurations()
+        self.assertEqual(
+            ["install-files", "permissions", "composer", "update"], list(durations)
+        )
+        self.assertAlmostEqual(45.0, durations["composer"], places=3)
+        self.assertAlmostEqual(0.5, durations["permissions"], places=3)
+        self.assertEqual(5, len(report.steps))
+        self.assertFalse(report.steps[-1].ok)
+        self.assertEqual(1, report.steps[-1].status)
+        if self.debug:
+            report.show()
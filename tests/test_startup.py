@@ -0,0 +1,117 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+from basemkit.basetest import Basetest
+
+from mwdocker.config import Host
+
+
+class TestStartup(Basetest):
+    """
+    test and benchmark the command line startup
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def runPython(self, code: str) -> str:
+        """
+        run the given python code in a fresh interpreter
+
+        Returns:
+            str: the stdout of the interpreter
+        """
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout
+
+    def getImportStats(self, module: str) -> dict:
+        """
+        import the given module in a fresh interpreter
+
+        Args:
+            module(str): the name of the module
+
+        Returns:
+            dict: the elapsed seconds and the heavy modules that got loaded
+        """
+        code = f"""
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = ["mysql.connector", "python_on_whales", "bs4", "jinja2", "tabulate", "wikibot3rd", "mwdocker.docker"]
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in heavy if m in sys.modules]}}))
+"""
+        stats = json.loads(self.runPython(code))
+        if self.debug:
+            print(f"import of {module} took {stats['elapsed']:.3f} s")
+        return stats
+
+    def testDeferredImports(self):
+        """
+        test that importing the command line does not import
+        the docker, database, scraping and template modules
+        and benchmark the import time
+        """
+        stats = self.getImportStats("mwdocker.mwdocker_cmd")
+        self.assertEqual([], stats["loaded"])
+
+    def testDeferredDockerImports(self):
+        """
+        test that importing the docker application and the cluster
+        e.g. for --list and --check does not import the docker client,
+        database, scraping and template libraries
+        """
+        for module in ["mwdocker.docker", "mwdocker.mwcluster"]:
+            stats = self.getImportStats(module)
+            loaded = [m for m in stats["loaded"] if m != "mwdocker.docker"]
+            self.assertEqual([], loaded, module)
+
+    def testVersion(self):
+        """
+        benchmark mwcluster --version
+        """
+        start = time.perf_counter()
+        stdout = self.runPython(
+            "import mwdocker.mwdocker_cmd as cmd; cmd.main(['--version'])"
+        )
+        elapsed = time.perf_counter() - start
+        if self.debug:
+            print(f"mwcluster --version took {elapsed:.3f} s")
+        self.assertIn("pymediawikidocker", stdout)
+
+    def testDefaultHost(self):
+        """
+        test that a hanging reverse DNS lookup falls back to the hostname
+        and that the default host is cached
+        """
+
+        def hanging_getfqdn():
+            time.sleep(5)
+            return "never.example.org"
+
+        with (
+            patch("mwdocker.config.socket.getfqdn", hanging_getfqdn),
+            patch("mwdocker.config.socket.gethostname", lambda: "example.org"),
+            patch.object(Host, "_default_host", None),
+        ):
+            start = time.perf_counter()
+            host = Host.get_fqdn(timeout=0.1)
+            self.assertLess(time.perf_counter() - start, 1.0)
+            self.assertEqual("example.org", host)
+            Host._default_host = "cached.example.org"
+            self.assertEqual("cached.example.org", Host.get_default_host())
@@ -0,0 +1,152 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+
+from basemkit.basetest import Basetest
+
+from mwdocker.config import MwClusterConfig
+from mwdocker.docker_backend import DockerBackend
+from mwdocker.docker_map import DockerMap
+from mwdocker.mwcluster import AppResult, MediaWikiCluster
+from mwdocker.state_store import AppState, StateStore
+from tests.fake_docker import FakeDockerBackend, getTestCluster
+
+
+class TestStateStore(Basetest):
+    """
+    test the indexed state store of the cluster apps
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def tearDown(self):
+        DockerBackend.setBackend(None)
+        DockerMap.invalidate()
+        Basetest.tearDown(self)
+
+    def testStore(self):
+        """
+        test storing, updating and querying app states
+        """
+        store = StateStore(":memory:")
+        for i in range(300):
+            version = ["1.39.17", "1.43.9"][i % 2]
+            store.upsert(
+                AppState(
+                    app=f"wiki{i}-mw",
+                    cluster=f"cluster{i % 3}",
+                    version=version,
+                    port=9080 + i,
+                    extensions=["Variables"],
+                    status="generated",
+                )
+            )
+        self.assertEqual(100, len(store.query(cluster="cluster1")))
+        self.assertEqual(50, len(store.query(cluster="cluster1", version="1.43.9")))
+        self.assertTrue(
+            store.update("cluster1", "wiki4-mw", status="started", healthy=True)
+        )
+        self.assertFalse(store.update("cluster1", "unknown", status="started"))
+        # the same app name may be used by different clusters
+        store.upsert(AppState(app="wiki4-mw", cluster="cluster2", version="1.39.17"))
+        self.assertEqual(101, len(store.query(cluster="cluster2")))
+        self.assertIsNone(store.get("cluster2", "wiki4-mw").status)
+        # an upsert of the configuration keeps the results
+        store.upsert(
+            AppState(
+                app="wiki4-mw",
+                cluster="cluster1",
+                version="1.43.9",
+                extensions=["Variables", "Header Tabs"],
+            )
+        )
+        app_state = store.get("cluster1", "wiki4-mw")
+        self.assertEqual("started", app_state.status)
+        self.assertTrue(app_state.healthy)
+        self.assertEqual(9084, app_state.port)
+        self.assertEqual(["Variables", "Header Tabs"], app_state.extensions)
+        self.assertEqual(1, len(store.query(status="started")))
+        with self.assertRaises(ValueError):
+            store.update("cluster1", "wiki4-mw", color="green")
+        self.assertTrue(store.remove("cluster1", "wiki4-mw"))
+        self.assertIsNone(store.get("cluster1", "wiki4-mw"))
+        self.assertIsNotNone(store.get("cluster2", "wiki4-mw"))
+        store.close()
+
+    def testClusterStates(self):
+        """
+        test recording the states of a cluster and listing them
+        """
+        versions = ["1.39.17", "1.43.9"]
+        with tempfile.TemporaryDirectory() as docker_path:
+            config = MwClusterConfig(
+                versions=versions, docker_path=docker_path, host="localhost"
+            )
+            config.extensionMap = {}
+            cluster = MediaWikiCluster(config)
+            for i, version in enumerate(versions):
+                mwApp = cluster.getDockerApplication(i, len(versions), version)
+                cluster.apps[version] = mwApp
+            backend = FakeDockerBackend()
+            backend.addApp("mw-139", "1.39.17", cluster=config.prefix)
+            DockerBackend.setBackend(backend)
+            cluster.recordStates("generate")
+            results = {
+                "1.39.17": AppResult("1.39.17", "mw-139", duration=12.5),
+                "1.43.9": AppResult("1.43.9", "mw-143", exitCode=1),
+            }
+            cluster.recordStates("start", results)
+            state_store = cluster.state_store
+            mw_139 = state_store.get(config.prefix, "mw-139")
+            self.assertEqual("started", mw_139.status)
+            self.assertEqual(12.5, mw_139.last_duration)
+            self.assertEqual(backend.containers["mw-139-mw"].id, mw_139.mw_container_id)
+            self.assertEqual("failed", state_store.get(config.prefix, "mw-143").status)
+            # the listing needs neither the apps nor per wiki queries
+            reader = MediaWikiCluster(config)
+            reader.checkDocker = lambda: 0
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                self.assertEqual(0, reader.listWikis(as_json=True))
+            records = json.loads(stdout.getvalue())
+            if self.debug:
+                print(json.dumps(records, indent=2))
+            self.assertEqual(["mw-139", "mw-143"], [r["wiki"] for r in records])
+            self.assertTrue(records[0]["mw"] and records[0]["db"])
+            self.assertFalse(records[1]["mw"])
+            self.assertEqual({}, reader.apps)
+            cluster.recordStates("down", {"1.39.17": results["1.39.17"]})
+            mw_139 = state_store.get(config.prefix, "mw-139")
+            self.assertEqual("down", mw_139.status)
+            self.assertIsNone(mw_139.mw_container_id)
+            # removing the volumes removes the wiki from the store
+            cluster.recordStates("remove", results)
+            self.assertIsNone(state_store.get(config.prefix, "mw-139"))
+            self.assertEqual("failed", state_store.get(config.prefix, "mw-143").status)
+            cluster.close()
+            reader.close()
+
+    def testListReadOnly(self):
+        """
+        test that listing a cluster unknown to the store does not record states
+        """
+        versions = ["1.39.17", "1.43.9"]
+        with tempfile.TemporaryDirectory() as docker_path:
+            cluster = getTestCluster(versions, docker_path)
+            DockerBackend.setBackend(FakeDockerBackend())
+            cluster.checkDocker = lambda: 0
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                self.assertEqual(0, cluster.listWikis(as_json=True))
+            records = json.loads(stdout.getvalue())
+            self.assertEqual(["mw-139", "mw-143"], [r["wiki"] for r in records])
+            self.assertEqual([], cluster.state_store.query())
+            cluster.close()